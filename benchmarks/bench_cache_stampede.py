@@ -0,0 +1,117 @@
+"""
+Benchmark: upstream requests caused by many concurrent readers of one key.
+
+Simulates thousands of coroutines reading the same cached endpoint from a
+slow upstream and counts the requests that reach it, with and without the
+response cache's stampede protection (the per-key refill lock and XFetch
+early refresh):
+
+- cold: every reader misses an empty cache at the same moment.
+- expiring: readers keep reading a short-lived entry for a while, so it
+  expires several times under load.
+
+Usage:
+    python benchmarks/bench_cache_stampede.py [--readers 10000] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from ravexclient import BaseClient, ResponseCache
+
+
+class BenchClient(BaseClient):
+    BASE_URL = "http://upstream.test"
+
+
+class Upstream:
+    """Slow mock upstream counting the requests it receives."""
+
+    def __init__(self, latency: float, max_age: float):
+        self.latency = latency
+        self.max_age = max_age
+        self.requests = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return httpx.Response(
+            200,
+            json={"version": self.requests},
+            headers={"Cache-Control": f"max-age={self.max_age}"},
+        )
+
+
+def make_cache(protected: bool) -> ResponseCache:
+    if protected:
+        return ResponseCache()
+    return ResponseCache(early_refresh_beta=0, lock_timeout=0)
+
+
+async def cold(readers: int, latency: float, protected: bool) -> tuple[int, float]:
+    """All readers miss an empty cache at once."""
+    upstream = Upstream(latency, max_age=60)
+    client = BenchClient(
+        transport=httpx.MockTransport(upstream.handle), cache=make_cache(protected)
+    )
+    started = time.perf_counter()
+    await asyncio.gather(*(client._get("/hot") for _ in range(readers)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    return upstream.requests, elapsed
+
+
+async def expiring(
+    readers: int, latency: float, protected: bool, duration: float, max_age: float
+) -> tuple[int, float]:
+    """Readers keep reading an entry that expires every ``max_age`` seconds."""
+    upstream = Upstream(latency, max_age=max_age)
+    client = BenchClient(
+        transport=httpx.MockTransport(upstream.handle), cache=make_cache(protected)
+    )
+    await client._get("/hot")
+    deadline = time.perf_counter() + duration
+    slowest = 0.0
+
+    async def reader() -> None:
+        nonlocal slowest
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(random.uniform(0.05, 0.15))
+            started = time.perf_counter()
+            await client._get("/hot")
+            slowest = max(slowest, time.perf_counter() - started)
+
+    await asyncio.gather(*(reader() for _ in range(readers)))
+    await client.close()
+    return upstream.requests - 1, slowest
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--max-age", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, upstream latency {args.latency * 1000:.0f} ms\n")
+    print(f"{'scenario':10} {'protection':>11} {'upstream requests':>18} {'ms':>9}")
+    for protected in (False, True):
+        requests, elapsed = await cold(args.readers, args.latency, protected)
+        label = "on" if protected else "off"
+        print(f"{'cold':10} {label:>11} {requests:>18} {elapsed * 1000:>9.1f}")
+    for protected in (False, True):
+        requests, slowest = await expiring(
+            args.readers, args.latency, protected, args.duration, args.max_age
+        )
+        label = "on" if protected else "off"
+        print(f"{'expiring':10} {label:>11} {requests:>18} {slowest * 1000:>9.1f}")
+    print("\nms: total time (cold) / slowest read (expiring)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Benchmark: client construction time versus instance count.
+
+Compares building one plain ``httpx.AsyncClient`` per instance (what
+BaseClient did before SSL contexts were cached) with building BaseClient
+instances that reuse a cached SSL context, and optionally a shared
+transport.
+
+Usage:
+    python benchmarks/bench_client_startup.py [--counts 1 10 100 500]
+"""
+
+import argparse
+import gc
+import time
+from collections.abc import Callable
+
+import httpx
+
+from ravexclient import BaseClient, TransportRegistry
+from ravexclient.transport import clear_ssl_context_cache
+
+
+class BenchClient(BaseClient):
+    BASE_URL = "https://api.example.com"
+
+
+def measure(factory: Callable[[], object], count: int) -> float:
+    """Build ``count`` clients and return the elapsed seconds."""
+    gc.collect()
+    started = time.perf_counter()
+    clients = [factory() for _ in range(count)]
+    elapsed = time.perf_counter() - started
+    del clients
+    return elapsed
+
+
+def shared_transport_factory() -> Callable[[], object]:
+    """Return a factory whose clients share one fresh TransportRegistry."""
+    registry = TransportRegistry()
+    return lambda: BenchClient(share_transport=registry)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 500])
+    args = parser.parse_args()
+
+    scenarios: list[tuple[str, Callable[[], Callable[[], object]]]] = [
+        ("httpx.AsyncClient (uncached)", lambda: httpx.AsyncClient),
+        ("BaseClient (cached SSL)", lambda: BenchClient),
+        ("BaseClient (shared transport)", shared_transport_factory),
+    ]
+
+    print(f"{'scenario':32} {'count':>6} {'total ms':>10} {'ms/client':>10}")
+    for name, make_factory in scenarios:
+        for count in args.counts:
+            clear_ssl_context_cache()
+            elapsed = measure(make_factory(), count)
+            print(
+                f"{name:32} {count:>6} {elapsed * 1000:>10.1f} "
+                f"{elapsed * 1000 / count:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
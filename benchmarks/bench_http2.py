@@ -0,0 +1,165 @@
+"""
+Benchmark: HTTP/2 multiplexing versus HTTP/1.1 on a loopback server.
+
+Starts a local server that speaks HTTP/1.1 and cleartext HTTP/2 (prior
+knowledge) on separate ports, then sends the same fan-out of concurrent
+requests through BaseClient in each mode. Reports throughput and how many
+TCP connections the server had to accept.
+
+Requires the optional ``h2`` package (``pip install ravexclient[http2]``).
+
+Usage:
+    python benchmarks/bench_http2.py [--requests 2000] [--concurrency 200]
+                                     [--delay 0.01] [--streams 100]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.settings
+
+from ravexclient import BaseClient
+
+
+class BenchClient(BaseClient):
+    BASE_URL = "http://127.0.0.1"
+
+
+class Server:
+    """Loopback server answering every request with a small JSON body."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections = 0
+        self.body = json.dumps({"ok": True}).encode()
+
+    async def handle_http1(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(self.body), self.body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_http2(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        conn.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 1000})
+        writer.write(conn.data_to_send())
+        tasks: set[asyncio.Task] = set()
+
+        async def respond(stream_id: int) -> None:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            conn.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(self.body))),
+                ],
+            )
+            conn.send_data(stream_id, self.body, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        try:
+            while data := await reader.read(65536):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.StreamEnded):
+                        task = asyncio.create_task(respond(event.stream_id))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+async def run(client: BaseClient, requests: int, concurrency: int) -> float:
+    """Send ``requests`` GETs with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await client._fetch("GET", f"/items/{i}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.01)
+    parser.add_argument("--streams", type=int, default=100)
+    args = parser.parse_args()
+
+    http1_server = Server(args.delay)
+    http2_server = Server(args.delay)
+    http1 = await asyncio.start_server(http1_server.handle_http1, "127.0.0.1", 0)
+    http2 = await asyncio.start_server(http2_server.handle_http2, "127.0.0.1", 0)
+    http1_url = f"http://127.0.0.1:{http1.sockets[0].getsockname()[1]}"
+    http2_url = f"http://127.0.0.1:{http2.sockets[0].getsockname()[1]}"
+
+    scenarios = [
+        ("HTTP/1.1", http1_server, BenchClient(base_url=http1_url)),
+        (
+            f"HTTP/2 ({args.streams} streams)",
+            http2_server,
+            BenchClient(
+                base_url=http2_url,
+                http2=True,
+                http1=False,
+                max_concurrent_streams=args.streams,
+            ),
+        ),
+    ]
+
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"server delay {args.delay * 1000:.0f} ms"
+    )
+    print(f"{'protocol':24} {'req/s':>10} {'elapsed s':>10} {'connections':>12}")
+    for name, server, client in scenarios:
+        elapsed = await run(client, args.requests, args.concurrency)
+        print(
+            f"{name:24} {args.requests / elapsed:>10.0f} "
+            f"{elapsed:>10.2f} {server.connections:>12}"
+        )
+
+    for server in (http1, http2):
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Benchmark: peak memory of reading a large JSON array.
+
+Serves a JSON array of many objects from a mock upstream that generates the
+body chunk by chunk, and compares the peak Python memory (tracemalloc) and
+time of reading it with ``_fetch``, which holds the raw body and the parsed
+list together, and with ``_iter_json``, which yields one item at a time.
+
+Usage:
+    python benchmarks/bench_json_stream.py [--items 200000] [--chunk-size 65536]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+import httpx
+
+from ravexclient import BaseClient
+
+
+class BenchClient(BaseClient):
+    BASE_URL = "http://upstream.test"
+
+
+class ArrayBody(httpx.AsyncByteStream):
+    """JSON array body generated lazily, so it isn't counted up front."""
+
+    def __init__(self, items: int, chunk_size: int):
+        self.items = items
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        buffer = bytearray(b"[")
+        for i in range(self.items):
+            item = {"id": i, "name": f"item {i}", "tags": ["a", "b"], "price": i / 3}
+            if i:
+                buffer += b", "
+            buffer += json.dumps(item).encode()
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        yield bytes(buffer + b"]")
+
+
+def make_client(items: int, chunk_size: int) -> BenchClient:
+    def respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=ArrayBody(items, chunk_size))
+
+    return BenchClient(transport=httpx.MockTransport(respond))
+
+
+async def with_fetch(client: BenchClient) -> int:
+    """Read the array with _fetch and walk it."""
+    total = 0
+    for item in await client._get("/items"):
+        total += item["id"]
+    return total
+
+
+async def with_iter_json(client: BenchClient) -> int:
+    """Read the array item by item with _iter_json."""
+    total = 0
+    async for item in client._iter_json("GET", "/items"):
+        total += item["id"]
+    return total
+
+
+async def measure(read, items: int, chunk_size: int) -> tuple[float, float]:
+    """
+    Return the peak traced memory in MiB and the elapsed seconds.
+
+    Time is measured on a separate run, as tracing slows allocation down.
+    """
+    client = make_client(items, chunk_size)
+    started = time.perf_counter()
+    await read(client)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    await read(client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await client.close()
+    return peak / 2**20, elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=65_536)
+    args = parser.parse_args()
+
+    print(f"{args.items} items, {args.chunk_size} byte chunks\n")
+    print(f"{'method':12} {'peak MiB':>10} {'seconds':>9}")
+    for name, read in (("_fetch", with_fetch), ("_iter_json", with_iter_json)):
+        peak, elapsed = await measure(read, args.items, args.chunk_size)
+        print(f"{name:12} {peak:>10.1f} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,15 +5,14 @@ Este ejemplo muestra características avanzadas como:
 - Autenticación personalizada
 - Manejo de rate limiting
 - Reintentos automáticos
+- Pool de proxies rotativos
 - Logging detallado
 """
 
 import asyncio
-import httpx
 import logging
-from typing import Any
-from ravexclient import BaseClient, HTTPError, TimeoutError
 
+from ravexclient import BaseClient, HTTPError, ProxyPool, RetryPolicy
 
 # Configurar logging
 logging.basicConfig(
@@ -36,85 +35,24 @@ class AdvancedAPIClient(BaseClient):
             max_retries: Número máximo de reintentos en caso de error.
             **kwargs: Argumentos adicionales para BaseClient.
         """
+        # Reintentos con backoff exponencial, jitter y soporte de Retry-After
+        kwargs.setdefault(
+            "retry_policy",
+            RetryPolicy(max_retries=max_retries, base_delay=0.5, max_delay=20.0),
+        )
         super().__init__(**kwargs)
         self.api_key = api_key
-        self.max_retries = max_retries
 
         # Agregar header de autenticación
         self.client.headers["X-API-Key"] = api_key
 
-    async def _fetch_with_retry(
-        self,
-        method: str,
-        endpoint: str,
-        max_retries: int | None = None,
-        **kwargs: Any,
-    ) -> dict[str, Any]:
-        """
-        Realizar request con reintentos automáticos.
-
-        Args:
-            method: Método HTTP.
-            endpoint: Endpoint de la API.
-            max_retries: Número de reintentos (usa self.max_retries si es None).
-            **kwargs: Argumentos adicionales para _fetch.
-
-        Returns:
-            Respuesta JSON.
-
-        Raises:
-            HTTPError: Si todos los reintentos fallan.
-        """
-        retries = max_retries if max_retries is not None else self.max_retries
-        last_error = None
-
-        for attempt in range(retries + 1):
-            try:
-                logger.info(
-                    f"Intento {attempt + 1}/{retries + 1} para {method} {endpoint}"
-                )
-                return await self._fetch(method, endpoint, **kwargs)
-
-            except HTTPError as e:
-                last_error = e
-
-                # No reintentar en ciertos códigos de error
-                if e.status_code in [400, 401, 403, 404]:
-                    logger.error(f"Error no recuperable: {e.status_code}")
-                    raise
-
-                # Reintentar en errores 5xx o rate limiting
-                if e.status_code in [429, 500, 502, 503, 504]:
-                    if attempt < retries:
-                        wait_time = 2**attempt  # Backoff exponencial
-                        logger.warning(
-                            f"Error {e.status_code}, reintentando en {wait_time}s..."
-                        )
-                        await asyncio.sleep(wait_time)
-                        continue
-
-                raise
-
-            except TimeoutError as e:
-                last_error = e
-                if attempt < retries:
-                    wait_time = 2**attempt
-                    logger.warning(f"Timeout, reintentando en {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                    continue
-                raise
-
-        # Si llegamos aquí, todos los reintentos fallaron
-        if last_error:
-            raise last_error
-
     async def get_data(self, resource_id: int) -> dict:
         """Obtener datos con reintentos automáticos."""
-        return await self._fetch_with_retry("GET", f"/data/{resource_id}")
+        return await self._get(f"/data/{resource_id}")
 
     async def create_data(self, data: dict) -> dict:
-        """Crear datos con reintentos automáticos."""
-        return await self._fetch_with_retry("POST", "/data", payload=data)
+        """Crear datos; POST solo se reintenta si se indica explícitamente."""
+        return await self._post("/data", payload=data, retry=True)
 
     async def batch_get(self, resource_ids: list[int]) -> list[dict]:
         """
@@ -141,52 +79,31 @@ class AdvancedAPIClient(BaseClient):
 
 
 class ProxyRotatingClient(BaseClient):
-    """Cliente que rota entre múltiples proxies."""
+    """Cliente que reparte las requests entre múltiples proxies."""
 
     BASE_URL = "https://api.example.com"
 
     def __init__(self, proxies: list[str], **kwargs):
         """
-        Inicializar cliente con rotación de proxies.
+        Inicializar cliente con un pool de proxies.
+
+        Cada proxy mantiene su propio pool de conexiones, así que cambiar de
+        proxy no cierra conexiones abiertas.
 
         Args:
             proxies: Lista de proxies en formato "host:port".
             **kwargs: Argumentos adicionales para BaseClient.
         """
-        self.proxies = proxies
-        self.current_proxy_index = 0
-        super().__init__(proxy=self._get_next_proxy(), **kwargs)
-
-    def _get_next_proxy(self) -> str:
-        """Obtener el siguiente proxy en la rotación."""
-        proxy = self.proxies[self.current_proxy_index]
-        self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxies)
-        return proxy
-
-    async def rotate_proxy(self):
-        """Cambiar al siguiente proxy."""
-        next_proxy = self._get_next_proxy()
-        logger.info(f"Rotando a proxy: {next_proxy}")
-
-        # Cerrar cliente actual
-        await self.client.aclose()
-
-        # Crear nuevo cliente con nuevo proxy
-        self.proxy = next_proxy
-        proxy_url = (
-            next_proxy if next_proxy.startswith("http") else f"http://{next_proxy}"
-        )
-        self.client = httpx.AsyncClient(
-            cookies=self.cookies,
-            proxy=proxy_url,
-        )
-        self.client.headers.update(
-            {
-                "Accept": "application/json",
-                "User-Agent": "RavexClient/0.1.0",
-            }
+        super().__init__(
+            proxy_pool=ProxyPool(proxies, strategy="least_in_flight"), **kwargs
         )
 
+    async def replace_proxy(self, old_proxy: str, new_proxy: str):
+        """Reemplazar un proxy esperando a que terminen sus requests en curso."""
+        logger.info(f"Reemplazando proxy {old_proxy} por {new_proxy}")
+        self.proxy_pool.add(new_proxy)
+        await self.proxy_pool.remove(old_proxy)
+
 
 async def example_advanced_features():
     """Ejemplo de características avanzadas."""
@@ -219,16 +136,14 @@ async def example_advanced_features():
     ]
 
     async with ProxyRotatingClient(proxies=proxies) as client:
-        # Verificar IP inicial
-        ip_info = await client._check_ip()
-        logger.info(f"IP actual: {ip_info['ip']}")
-
-        # Rotar proxy
-        await client.rotate_proxy()
-
-        # Verificar nueva IP
-        ip_info = await client._check_ip()
-        logger.info(f"Nueva IP: {ip_info['ip']}")
+        # Cada request sale por el proxy con menos requests en curso
+        for _ in range(3):
+            ip_info = await client._check_ip()
+            logger.info(f"IP actual: {ip_info['ip']}")
+
+        # Reemplazar un proxy sin cortar requests en curso
+        await client.replace_proxy("proxy1.example.com:8080", "proxy4.example.com:8080")
+        logger.info(f"Estadísticas por proxy: {client.proxy_pool.stats()}")
 
 
 async def example_with_authentication():
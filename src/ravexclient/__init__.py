@@ -7,24 +7,81 @@ and error handling.
 """
 
 from .base import BaseClient
+from .cache import (
+    CacheBackend,
+    MemoryCache,
+    NegativeCache,
+    ResponseCache,
+    SQLiteCache,
+)
+from .circuit import CircuitBreaker, CircuitBreakerRegistry, CircuitEvent
+from .concurrency import AIMDLimit, ConcurrencyLimiter, GradientLimit
 from .exceptions import (
-    RavexClientError,
-    HTTPError,
-    ProxyError,
     AuthenticationError,
+    CircuitOpenError,
     ConfigurationError,
+    HTTPError,
+    PoolTimeoutError,
+    ProxyError,
+    RateLimitError,
+    RavexClientError,
+    ResponseTooLargeError,
     TimeoutError,
 )
+from .hedge import HedgePolicy
+from .proxypool import HealthCheck, ProxyPool
+from .ratelimit import RateLimit, RateLimiter
+from .refresh import RefreshAhead
+from .resolver import CachingResolver, DNSResult, Resolver, SystemResolver
+from .response import ResponseInfo, last_response_info
+from .retry import RetryBudget, RetryPolicy
+from .singleflight import SingleFlight
+from .stream import JSONArrayParser, ResponseStream
+from .transport import InstrumentedTransport, TransportRegistry
 
 __version__ = "0.1.0"
 __all__ = [
+    "AIMDLimit",
+    "AuthenticationError",
     "BaseClient",
-    "RavexClientError",
+    "CacheBackend",
+    "CachingResolver",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitEvent",
+    "CircuitOpenError",
+    "ConcurrencyLimiter",
+    "ConfigurationError",
+    "DNSResult",
+    "GradientLimit",
     "HTTPError",
+    "HealthCheck",
+    "HedgePolicy",
+    "InstrumentedTransport",
+    "JSONArrayParser",
+    "MemoryCache",
+    "NegativeCache",
+    "PoolTimeoutError",
     "ProxyError",
-    "AuthenticationError",
-    "ConfigurationError",
+    "ProxyPool",
+    "RateLimit",
+    "RateLimitError",
+    "RateLimiter",
+    "RavexClientError",
+    "RefreshAhead",
+    "Resolver",
+    "ResponseCache",
+    "ResponseInfo",
+    "ResponseStream",
+    "ResponseTooLargeError",
+    "RetryBudget",
+    "RetryPolicy",
+    "SQLiteCache",
+    "SingleFlight",
+    "SystemResolver",
     "TimeoutError",
+    "TransportRegistry",
+    "last_response_info",
 ]
 
 
@@ -6,17 +6,97 @@ using httpx. It includes support for proxies, custom headers, cookies, and
 Cloudflare clearance handling.
 """
 
+import asyncio
+import functools
+import logging
+import time
+import urllib.request
 from abc import ABC
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import replace
 from typing import Any
-import logging
 
 import httpx
 
-from .exceptions import HTTPError, ProxyError, ConfigurationError
-
+from .cache import CacheEntry, NegativeCache, ResponseCache
+from .circuit import CircuitBreaker, CircuitBreakerRegistry, host_key, proxy_key
+from .concurrency import ConcurrencyLimiter
+from .exceptions import (
+    CircuitOpenError,
+    ConfigurationError,
+    HTTPError,
+    PoolTimeoutError,
+    ProxyError,
+    RavexClientError,
+)
+from .hedge import HedgePolicy
+from .proxypool import PROXY_EXTENSION, ProxyPool, normalize_proxy_url
+from .ratelimit import RateLimiter
+from .refresh import RefreshAhead
+from .resolver import Resolver
+from .response import ResponseInfo, last_response_info, record_response
+from .retry import RetryBudget, RetryPolicy
+from .singleflight import SingleFlight
+from .stream import JSONArrayParser, ResponseStream
+from .transport import (
+    InstrumentedTransport,
+    SharedTransport,
+    TransportRegistry,
+    default_registry,
+    get_ssl_context,
+)
 
 logger = logging.getLogger(__name__)
 
+# AsyncClient options that configure the transport rather than the client.
+_TRANSPORT_OPTIONS = ("verify", "cert", "http1", "http2", "limits")
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert a transport option into a hashable registry key component."""
+    if isinstance(value, httpx.Limits):
+        return (
+            value.max_connections,
+            value.max_keepalive_connections,
+            value.keepalive_expiry,
+        )
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _environment_proxies(host: str) -> dict[str, str | None]:
+    """
+    Proxy mounts configured by the environment, for httpx.AsyncClient.
+
+    Proxies come from ``HTTP_PROXY``, ``HTTPS_PROXY`` and ``ALL_PROXY`` (or
+    the platform's settings) as read by urllib. Each ``NO_PROXY`` entry maps
+    to a mount without a proxy, and ``host`` is also checked with urllib's
+    proxy_bypass, which understands entries a pattern can't express.
+    """
+    proxies = urllib.request.getproxies()
+    mounts: dict[str, str | None] = {}
+    for scheme in ("http", "https", "all"):
+        proxy = proxies.get(scheme)
+        if proxy:
+            mounts[f"{scheme}://"] = proxy if "://" in proxy else f"http://{proxy}"
+    if not mounts:
+        return mounts
+    for entry in proxies.get("no", "").split(","):
+        entry = entry.strip()
+        if entry == "*":
+            return {}
+        if "://" in entry:
+            mounts[entry] = None
+        elif ":" in entry:
+            mounts[f"all://[{entry}]"] = None
+        elif entry:
+            mounts[f"all://*{entry}"] = None
+    if host and urllib.request.proxy_bypass(host):
+        mounts[f"all://[{host}]" if ":" in host else f"all://{host}"] = None
+    return mounts
+
 
 class BaseClient(ABC):
     """
@@ -24,16 +104,24 @@ class BaseClient(ABC):
 
     This class provides a foundation for creating async HTTP clients with
     built-in support for:
-    - Proxy configuration
+    - Proxy configuration, including pools of rotating proxies
     - Cookie management (including Cloudflare clearance)
     - Custom headers
     - Automatic JSON response parsing
+    - Configurable retries with jittered backoff
+    - Client-side rate limiting per endpoint pattern
+    - Adaptive limit on requests in flight
+    - Connection pool sizing, telemetry and pre-warming
+    - Optional HTTP/2 multiplexing
+    - Pluggable, cacheable DNS resolution
+    - Optional transport sharing between instances
     - Proper resource cleanup
 
     Attributes:
         BASE_URL (str): Default base URL for API requests. Should be overridden
                        by subclasses or via constructor.
         client (httpx.AsyncClient): The underlying httpx async client.
+        transport (httpx.AsyncBaseTransport): Transport used by the client.
 
     Example:
         >>> class MyAPIClient(BaseClient):
@@ -54,6 +142,25 @@ class BaseClient(ABC):
         proxy: str | None = None,
         cf_clearance: str | None = None,
         timeout: float = 30.0,
+        retry_policy: RetryPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
+        rate_limiter: RateLimiter | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        pool_timeout: float | None = None,
+        share_transport: bool | TransportRegistry = False,
+        http2: bool = False,
+        max_concurrent_streams: int | None = None,
+        resolver: Resolver | None = None,
+        proxy_pool: ProxyPool | None = None,
+        circuit_breakers: CircuitBreakerRegistry | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        single_flight: SingleFlight | None = None,
+        cache: ResponseCache | None = None,
+        refresh_ahead: RefreshAhead | None = None,
+        negative_cache: NegativeCache | None = None,
         **kwargs: Any,
     ):
         """
@@ -65,20 +172,99 @@ class BaseClient(ABC):
             cf_clearance: Cloudflare clearance cookie value for bypassing
                          Cloudflare protection.
             timeout: Request timeout in seconds. Defaults to 30.0.
+            retry_policy: Retry policy applied by _fetch. Defaults to None,
+                         which disables automatic retries.
+            retry_budget: Client-wide retry budget shared by all requests.
+                         When exhausted, failures are raised immediately
+                         instead of being retried.
+            rate_limiter: Rate limiter that paces requests per endpoint
+                         pattern before they are sent.
+            concurrency_limiter: Adaptive limiter that caps the number of
+                                requests in flight and queues the rest.
+            max_connections: Maximum number of pooled connections. None
+                            means unlimited.
+            max_keepalive_connections: Maximum number of idle connections
+                                      kept alive. None means unlimited.
+            keepalive_expiry: Seconds an idle connection is kept alive.
+            pool_timeout: Seconds to wait for a free pooled connection
+                         before raising PoolTimeoutError. Defaults to the
+                         request timeout.
+            share_transport: Share the transport (connection pool, SSL
+                            context and sockets) with other instances that
+                            use the same host, proxy and TLS settings. True
+                            uses the process-wide registry; a
+                            TransportRegistry instance scopes sharing to it.
+            http2: Negotiate HTTP/2 so concurrent requests to an origin are
+                  multiplexed over one connection. Origins that don't offer
+                  h2 are served over HTTP/1.1. Requires the optional ``h2``
+                  package (``pip install ravexclient[http2]``).
+            max_concurrent_streams: Maximum concurrent HTTP/2 streams per
+                                   origin connection. Defaults to the limit
+                                   advertised by the server.
+            resolver: Resolver for the host names of new connections, e.g.
+                     a CachingResolver shared by several clients. The
+                     client does not close it. Defaults to httpcore's
+                     system lookup.
+            proxy_pool: Pool of proxies to spread requests over, each with
+                       its own connection pool. Replaces ``proxy``; the
+                       pool is closed together with the client.
+            circuit_breakers: Registry of circuit breakers keyed by host and
+                             by proxy. Requests to a host or proxy whose
+                             circuit is open fail immediately with
+                             CircuitOpenError.
+            hedge_policy: Hedge slow GET requests: when the first attempt
+                         is slower than the policy's latency percentile, a
+                         backup attempt is sent (through another proxy with
+                         a proxy pool) and the first answer wins.
+            single_flight: Coalesce identical concurrent GET requests so
+                          they share one in-flight request.
+            cache: Response cache consulted by _fetch before sending GET
+                  requests, honoring Cache-Control, Expires and Vary. Stale
+                  entries with an ETag or Last-Modified are revalidated
+                  with a conditional request, and stale entries are served
+                  within the cache's stale-while-revalidate and
+                  stale-if-error windows.
+            refresh_ahead: Scheduler refreshing the most read cache
+                          entries in the background before they expire.
+                          Requires ``cache``; stopped when the client is
+                          closed.
+            negative_cache: Remember 404/410 errors of GET requests for a
+                           short time and raise them again without sending
+                           the request.
             **kwargs: Additional arguments passed to httpx.AsyncClient.
                      Common options include:
                      - headers: Custom headers dict
                      - cookies: Additional cookies dict
                      - verify: SSL verification (bool or path to cert)
                      - follow_redirects: Whether to follow redirects (bool)
+                     - limits: httpx.Limits, overriding the pool arguments
+                     - transport: Custom transport; disables pool telemetry
 
         Raises:
-            ConfigurationError: If proxy format is invalid.
+            ConfigurationError: If proxy format is invalid, ``proxy_pool`` is
+                combined with ``proxy``, ``share_transport`` or a custom
+                transport, HTTP/2 is requested without the ``h2``
+                package installed, ``refresh_ahead`` is given without
+                a ``cache``, or a custom transport is combined with
+                ``resolver``, ``max_concurrent_streams`` or
+                ``share_transport``.
         """
         # Store configuration
         self.proxy = proxy
         self.clearance = cf_clearance
         self.base_url = base_url or self.BASE_URL
+        self.retry_policy = retry_policy
+        self.retry_budget = retry_budget
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.proxy_pool = proxy_pool
+        self.circuit_breakers = circuit_breakers
+        self.hedge_policy = hedge_policy
+        self.single_flight = single_flight
+        self.cache = cache
+        self.refresh_ahead = refresh_ahead
+        self.negative_cache = negative_cache
+        self._refreshes: dict[str, asyncio.Task[None]] = {}
 
         # Initialize cookies
         self.cookies: dict[str, str] = {}
@@ -87,22 +273,91 @@ class BaseClient(ABC):
             logger.debug("Cloudflare clearance cookie configured")
 
         # Configure proxy if provided
+        proxy_url = None
         if self.proxy is not None:
             try:
                 # Handle proxy format
-                proxy_url = (
-                    self.proxy
-                    if self.proxy.startswith("http")
-                    else f"http://{self.proxy}"
-                )
-                kwargs["proxy"] = proxy_url
+                proxy_url = normalize_proxy_url(self.proxy)
                 logger.debug(f"Proxy configured: {proxy_url}")
             except Exception as e:
                 raise ConfigurationError(f"Invalid proxy configuration: {e}") from e
+        self._proxy_url = proxy_url
+
+        if proxy_pool is not None and (
+            proxy is not None
+            or share_transport is not False
+            or "transport" in kwargs
+            or "mounts" in kwargs
+        ):
+            raise ConfigurationError(
+                "proxy_pool cannot be combined with proxy, share_transport "
+                "or a custom transport"
+            )
+
+        if proxy_pool is not None and proxy_pool.circuit_breakers is None:
+            proxy_pool.circuit_breakers = circuit_breakers
+
+        if refresh_ahead is not None:
+            if cache is None:
+                raise ConfigurationError("refresh_ahead requires a cache")
+            refresh_ahead.bind(cache)
+
+        # Configure HTTP/2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as e:
+                raise ConfigurationError(
+                    "HTTP/2 support requires the 'h2' package. "
+                    "Install it with: pip install ravexclient[http2]"
+                ) from e
+            kwargs["http2"] = True
+        if max_concurrent_streams is not None:
+            if not http2:
+                raise ConfigurationError("max_concurrent_streams requires http2=True")
+            if max_concurrent_streams < 1:
+                raise ConfigurationError("max_concurrent_streams must be >= 1")
+
+        # Configure connection pool
+        if "limits" not in kwargs:
+            kwargs["limits"] = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        self._limits: httpx.Limits = kwargs["limits"]
 
         # Set default timeout
         if "timeout" not in kwargs:
-            kwargs["timeout"] = timeout
+            kwargs["timeout"] = (
+                timeout
+                if pool_timeout is None
+                else httpx.Timeout(timeout, pool=pool_timeout)
+            )
+
+        # Build the transport unless the caller supplied their own
+        if "transport" in kwargs or "mounts" in kwargs:
+            if (
+                resolver is not None
+                or max_concurrent_streams is not None
+                or share_transport is not False
+            ):
+                raise ConfigurationError(
+                    "resolver, max_concurrent_streams and share_transport "
+                    "cannot be combined with a custom transport"
+                )
+            if proxy_url is not None:
+                kwargs["proxy"] = proxy_url
+        else:
+            kwargs["transport"] = self._build_transport(
+                proxy_url,
+                kwargs,
+                share_transport,
+                max_concurrent_streams=max_concurrent_streams,
+                resolver=resolver,
+                proxy_pool=proxy_pool,
+            )
+        self.transport = kwargs.get("transport")
 
         # Initialize httpx client
         self.client = httpx.AsyncClient(cookies=self.cookies, **kwargs)
@@ -116,6 +371,226 @@ class BaseClient(ABC):
 
         logger.info(f"Client initialized with base URL: {self.base_url}")
 
+    def _build_transport(
+        self,
+        proxy: str | None,
+        options: dict[str, Any],
+        share_transport: bool | TransportRegistry = False,
+        proxy_pool: ProxyPool | None = None,
+        **transport_kwargs: Any,
+    ) -> httpx.AsyncBaseTransport:
+        """
+        Create the transport used by the underlying httpx client.
+
+        Transport-level options (verify, cert, http1, http2, limits) are
+        removed from ``options`` so they are not applied twice. The SSL
+        context is taken from a process-wide cache, so the CA bundle is only
+        loaded once per distinct TLS configuration.
+
+        httpx ignores proxy environment variables (``HTTP_PROXY``,
+        ``HTTPS_PROXY``, ``ALL_PROXY``, ``NO_PROXY``) for clients given a
+        transport, so without an explicit proxy and with ``trust_env``
+        on, the environment proxies are added to ``options`` as
+        ``mounts`` of their own instrumented transports.
+
+        Args:
+            proxy: Normalized proxy URL, if any.
+            options: Keyword arguments destined for httpx.AsyncClient.
+            share_transport: Registry to share the transport through, True
+                            for the process-wide registry, or False.
+            proxy_pool: Proxy pool to build one transport per proxy for.
+            **transport_kwargs: Extra InstrumentedTransport arguments, such
+                               as max_concurrent_streams and resolver.
+
+        Returns:
+            An instrumented transport, a handle onto a shared one, or the
+            bound proxy pool.
+        """
+        transport_options = {
+            name: options.pop(name) for name in _TRANSPORT_OPTIONS if name in options
+        }
+        trust_env = options.get("trust_env", True)
+
+        def factory(proxy: str | None = proxy) -> InstrumentedTransport:
+            tls_options = dict(transport_options)
+            tls_options["verify"] = get_ssl_context(
+                tls_options.get("verify", True),
+                tls_options.pop("cert", None),
+                trust_env,
+                tls_options.get("http2", False),
+            )
+            return InstrumentedTransport(
+                proxy=proxy,
+                trust_env=trust_env,
+                **transport_kwargs,
+                **tls_options,
+            )
+
+        if proxy_pool is not None:
+            proxy_pool.bind(factory)
+            return proxy_pool
+
+        def build(proxy: str | None = proxy) -> httpx.AsyncBaseTransport:
+            if share_transport is False:
+                return factory(proxy)
+            registry = default_registry if share_transport is True else share_transport
+            url = httpx.URL(self.base_url)
+            key = (
+                url.scheme,
+                url.host,
+                url.port,
+                proxy,
+                trust_env,
+                tuple(
+                    (name, _freeze(value))
+                    for name, value in sorted(
+                        {**transport_options, **transport_kwargs}.items()
+                    )
+                ),
+            )
+            return registry.acquire(key, functools.partial(factory, proxy))
+
+        if proxy is None and trust_env:
+            mounts = {
+                pattern: None if env_proxy is None else build(env_proxy)
+                for pattern, env_proxy in _environment_proxies(
+                    httpx.URL(self.base_url).host
+                ).items()
+            }
+            if mounts:
+                logger.debug(f"Environment proxies configured: {list(mounts)}")
+                options["mounts"] = mounts
+        return build()
+
+    def _instrumented_transport(self) -> InstrumentedTransport | None:
+        """Return the client's InstrumentedTransport, unwrapping shared ones."""
+        transport = self.transport
+        if isinstance(transport, SharedTransport):
+            transport = transport.transport
+        if isinstance(transport, InstrumentedTransport):
+            return transport
+        return None
+
+    def pool_stats(self) -> dict[str, float]:
+        """
+        Return connection pool statistics for this client.
+
+        Returns:
+            Dictionary with idle/active connections, waiters, pool wait
+            times and connection open/reuse counts. Empty if the client
+            uses a custom transport or a proxy pool (see
+            ``ProxyPool.stats()`` for per-proxy statistics).
+
+        Example:
+            >>> stats = client.pool_stats()
+            >>> stats["idle_connections"], stats["pool_wait_max"]
+        """
+        transport = self._instrumented_transport()
+        return {} if transport is None else transport.stats()
+
+    async def warmup(
+        self,
+        connections: int = 1,
+        endpoint: str = "",
+        method: str = "HEAD",
+    ) -> dict[str, float]:
+        """
+        Open keep-alive connections to ``base_url`` ahead of traffic.
+
+        Sends ``connections`` concurrent requests and keeps every response
+        open until all of them have arrived, which forces the pool to
+        establish that many distinct connections (DNS, TCP, TLS and proxy
+        handshakes included). The responses are then closed, leaving the
+        connections idle in the pool. Any response counts as success,
+        whatever its status code. Warmup requests bypass the rate and
+        concurrency limiters. With a proxy pool, every healthy proxy is warmed
+        up.
+
+        The count is capped at the pool's keep-alive limit, since extra
+        connections would be closed as soon as they went idle. Over HTTP/2
+        all requests share one connection per origin.
+
+        Args:
+            connections: Number of connections to open (per proxy).
+            endpoint: Cheap endpoint to request. Defaults to the base URL.
+            method: HTTP method to use.
+
+        Returns:
+            Dictionary with the number of connections requested, how many
+            succeeded and failed, and the elapsed time in seconds. With a
+            proxy pool it also has ``succeeded[<proxy>]`` per proxy.
+
+        Example:
+            >>> async with MyAPIClient() as client:
+            ...     result = await client.warmup(connections=20)
+            ...     result["succeeded"], result["elapsed"]
+        """
+        limits = self._limits
+        for limit in (limits.max_keepalive_connections, limits.max_connections):
+            if limit is not None and connections > limit:
+                logger.warning(f"Warmup capped at {limit} connections per pool")
+                connections = limit
+
+        url = f"{self.base_url}{endpoint}"
+        targets = [None] if self.proxy_pool is None else self.proxy_pool.healthy
+
+        async def warm(proxy: str | None) -> int:
+            extensions = {} if proxy is None else {PROXY_EXTENSION: proxy}
+            pending = connections
+            all_open = asyncio.Event()
+
+            def opened() -> None:
+                nonlocal pending
+                pending -= 1
+                if pending == 0:
+                    all_open.set()
+
+            async def open_connection() -> bool:
+                counted = False
+                try:
+                    async with self.client.stream(
+                        method, url, extensions=extensions
+                    ) as response:
+                        # Drain without closing: the connection stays
+                        # assigned to this response, but is reusable once
+                        # it is closed.
+                        async for _ in response.stream:
+                            pass
+                        counted = True
+                        opened()
+                        await all_open.wait()
+                    return True
+                except (httpx.HTTPError, RavexClientError) as e:
+                    via = "" if proxy is None else f" via {proxy}"
+                    logger.warning(f"Warmup connection to {url}{via} failed: {e}")
+                    if not counted:
+                        opened()
+                    return False
+
+            results = await asyncio.gather(
+                *(open_connection() for _ in range(connections))
+            )
+            return sum(results)
+
+        started = time.perf_counter()
+        succeeded = await asyncio.gather(*(warm(proxy) for proxy in targets))
+        elapsed = time.perf_counter() - started
+        requested = connections * len(targets)
+        logger.info(
+            f"Warmed up {sum(succeeded)}/{requested} connections to {url} "
+            f"in {elapsed:.3f}s"
+        )
+        result: dict[str, float] = {
+            "requested": requested,
+            "succeeded": sum(succeeded),
+            "failed": requested - sum(succeeded),
+            "elapsed": elapsed,
+        }
+        if self.proxy_pool is not None:
+            for proxy, count in zip(targets, succeeded):
+                result[f"succeeded[{proxy}]"] = count
+        return result
+
     async def _fetch(
         self,
         method: str,
@@ -123,13 +598,20 @@ class BaseClient(ABC):
         params: dict[str, Any] | None = None,
         payload: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
+        *,
+        retry: bool | None = None,
+        rate_limit_blocking: bool | None = None,
+        hedge: bool | None = None,
+        coalesce: bool | None = None,
+        cache_ttl: float | None = None,
+        negative_cache: bool | None = None,
         **kwargs: Any,
     ) -> dict[str, Any]:
         """
         Perform an HTTP request and return JSON response.
 
         This is the core method for making HTTP requests. It handles URL
-        construction, error handling, and JSON parsing.
+        construction, retries, error handling, and JSON parsing.
 
         Args:
             method: HTTP method (GET, POST, PUT, DELETE, PATCH, etc.).
@@ -137,6 +619,26 @@ class BaseClient(ABC):
             params: Query parameters for the request.
             payload: JSON payload for POST/PUT/PATCH requests.
             headers: Additional headers for this specific request.
+            retry: Override the retry behavior for this call. None applies
+                  the client's retry policy as configured, True also retries
+                  non-idempotent methods, and False disables retries.
+            rate_limit_blocking: Override whether the rate limiter waits for
+                                a token (True) or raises RateLimitError
+                                immediately when none is available (False).
+            hedge: Override hedging for this call. None hedges the methods
+                  of the client's hedge policy, True also hedges other
+                  methods, and False disables hedging.
+            coalesce: Override request coalescing for this call. None
+                     coalesces the methods of the client's single-flight
+                     group, True also coalesces other methods, and False
+                     always sends a request of its own. Calls with a
+                     payload or extra httpx arguments are never coalesced.
+            cache_ttl: Seconds to cache this call's response, overriding
+                      its freshness headers. Only used with a response
+                      cache; ``no-store`` responses are never cached.
+            negative_cache: False sends the request even if the client's
+                           negative cache holds an error for it. The
+                           outcome still updates the negative cache.
             **kwargs: Additional arguments passed to httpx request method.
 
         Returns:
@@ -145,46 +647,710 @@ class BaseClient(ABC):
         Raises:
             HTTPError: If the request fails or returns an error status code.
             ProxyError: If there's a proxy-related connection issue.
+            PoolTimeoutError: If no pooled connection became available in
+                time.
+            RateLimitError: If the rate limiter refuses to send the request.
+            CircuitOpenError: If the circuit of the host or proxy is open.
 
         Example:
             >>> await self._fetch("GET", "/users", params={"page": 1})
             >>> await self._fetch("POST", "/users", payload={"name": "John"})
         """
         url = f"{self.base_url}{endpoint}"
+        fetch = functools.partial(
+            self._fetch_with_retries,
+            method,
+            url,
+            endpoint,
+            params=params,
+            payload=payload,
+            headers=headers,
+            retry=retry,
+            rate_limit_blocking=rate_limit_blocking,
+            hedge=hedge,
+            cache_ttl=cache_ttl,
+            **kwargs,
+        )
+        shareable = payload is None and not kwargs
+        negative = self.negative_cache
+        if negative is not None and shareable and negative.applies_to(method):
+            negative_key = negative.key(method, url, params)
+            if negative_cache is not False:
+                negative.check(negative_key)
+            fetch = functools.partial(fetch, negative_key=negative_key)
+        cache = self.cache
+        if cache is None or not cache.applies_to(method) or not shareable:
+            return await self._fetch_shared(
+                fetch, method, url, params, headers, coalesce, shareable
+            )
+
+        cache_key = cache.key(method, url, params)
+        fetch = functools.partial(fetch, cache_key=cache_key)
+        if self.refresh_ahead is not None:
+            self.refresh_ahead.record(cache_key, lambda entry: fetch(stale=entry))
+        # Match Vary against the headers the request is sent with, cookies
+        # included, since that is what the stored response was keyed on.
+        request_headers = self.client.build_request(
+            method, url, headers=headers
+        ).headers
+        # Callers sending their own validators handle the 304 themselves.
+        use_stale = not any(
+            name in request_headers for name in ("If-None-Match", "If-Modified-Since")
+        )
+        entry = await cache.get(cache_key, request_headers, stale=use_stale)
+        if entry is not None and cache.is_fresh(entry):
+            logger.debug(f"Cache hit for {cache_key}")
+            if cache.should_refresh_early(entry):
+                logger.debug(f"Refreshing {cache_key} ahead of expiry")
+                self._refresh_in_background(
+                    cache_key, functools.partial(fetch, stale=entry)
+                )
+            record_response(entry.info())
+            return entry.json()
+
+        stale = entry
+        fetch = functools.partial(fetch, stale=stale)
+        if stale is not None and cache.try_serve_stale(stale):
+            logger.debug(f"Serving stale {cache_key} while revalidating")
+            self._refresh_in_background(cache_key, fetch)
+            record_response(stale.info(stale=True))
+            return stale.json()
+
+        async with cache.refill_lock(cache_key) as leader:
+            if not leader:
+                # Another caller just refilled the key: read its response.
+                entry = await cache.get(cache_key, request_headers)
+                if entry is not None:
+                    record_response(entry.info())
+                    return entry.json()
+            try:
+                return await self._fetch_shared(
+                    fetch, method, url, params, headers, coalesce, shareable
+                )
+            except (HTTPError, ProxyError) as e:
+                upstream_failure = isinstance(e, ProxyError) or not (
+                    e.status_code and e.status_code < 500
+                )
+                if (
+                    stale is None
+                    or not upstream_failure
+                    or not cache.try_serve_stale(stale, on_error=True)
+                ):
+                    raise
+                logger.warning(f"Serving stale {cache_key} after error: {e}")
+                record_response(stale.info(stale=True))
+                return stale.json()
+
+    async def _fetch_shared(
+        self,
+        fetch: Callable[[], Awaitable[dict[str, Any]]],
+        method: str,
+        url: str,
+        params: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        coalesce: bool | None,
+        shareable: bool,
+    ) -> dict[str, Any]:
+        """
+        Run ``fetch``, sharing it with identical concurrent calls.
+
+        Calls are coalesced through the client's single-flight group as
+        described in ``_fetch``; ``shareable`` is False for calls with a
+        payload or extra httpx arguments, which are never coalesced.
+        """
+        flight = self.single_flight
+        if (
+            flight is None
+            or coalesce is False
+            or not (coalesce or flight.applies_to(method))
+            or not shareable
+        ):
+            return await fetch()
+
+        async def perform() -> tuple[dict[str, Any], ResponseInfo | None]:
+            return await fetch(), last_response_info()
+
+        # Key on the headers the request is sent with, client-level
+        # credentials and cookies included, not just the per-call ones.
+        request_headers = self.client.build_request(
+            method, url, headers=headers
+        ).headers
+        key = flight.key(method, url, params, request_headers)
+        data, info = await flight.do(key, perform)
+        if info is not None:
+            # The request ran in its own task; expose its metadata here.
+            record_response(info)
+        return data
+
+    def _refresh_in_background(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """
+        Run ``fetch`` in a background task to refresh cache entry ``key``.
+
+        At most one refresh per key runs at a time; failures are logged.
+        """
+        if key in self._refreshes:
+            return
+
+        async def refresh() -> None:
+            try:
+                await fetch()
+            except Exception as e:  # noqa: BLE001 - nobody awaits this task
+                logger.warning(f"Background refresh of {key} failed: {e}")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+
+    async def _fetch_with_retries(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        *,
+        params: dict[str, Any] | None,
+        payload: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        retry: bool | None,
+        rate_limit_blocking: bool | None,
+        hedge: bool | None,
+        cache_key: str | None = None,
+        cache_ttl: float | None = None,
+        stale: CacheEntry | None = None,
+        negative_key: str | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Perform a request with retries and return its JSON response.
+
+        This is the body of ``_fetch`` once the cache has been consulted
+        and coalescing has been decided; see ``_fetch`` for the arguments
+        and errors. A successful response is stored in the response cache
+        under ``cache_key``, if given. With a ``stale`` entry the request
+        is made conditional, and a 304 answer returns the entry's body.
+        With a ``negative_key``, the negative cache remembers the request's
+        HTTPError, or forgets it on success.
+        """
+        if stale is not None:
+            headers = {**self.cache.conditional_headers(stale), **(headers or {})}
+        attempt = 0
+        delay: float | None = None
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+        policy = self.hedge_policy
+        send = self._send
+        if (
+            policy is not None
+            and hedge is not False
+            and policy.applies_to(method, force=bool(hedge))
+        ):
+            send = self._send_hedged
+
+        while True:
+            try:
+                response = await send(
+                    method,
+                    url,
+                    endpoint,
+                    rate_limit_blocking=rate_limit_blocking,
+                    params=params,
+                    json=payload,
+                    headers=headers,
+                    **kwargs,
+                )
+                if stale is not None and response.status_code == 304:
+                    logger.debug(f"Revalidated {cache_key}: not modified")
+                    entry = await self.cache.revalidated(
+                        cache_key, stale, response, ttl=cache_ttl
+                    )
+                    record_response(
+                        replace(ResponseInfo.from_response(response), cached=True)
+                    )
+                    return entry.json()
+                response.raise_for_status()
+                if negative_key is not None:
+                    self.negative_cache.discard(negative_key)
+
+                logger.debug(f"Response status: {response.status_code}")
+                data = response.json()
+                if cache_key is not None:
+                    await self.cache.store(cache_key, response, ttl=cache_ttl)
+                return data
+
+            except RavexClientError:
+                raise
+            except Exception as e:
+                delay = self._retry_delay(method, attempt, e, delay, retry)
+                if delay is None:
+                    error = self._map_error(e)
+                    if negative_key is not None and isinstance(error, HTTPError):
+                        self.negative_cache.store(negative_key, error)
+                    raise error from e
+                budget = self.retry_budget
+                if budget is not None and not budget.try_acquire():
+                    raise self._budget_exhausted(attempt, e) from e
+
+            attempt += 1
+            logger.warning(
+                f"Retrying {method} {url} in {delay:.2f}s "
+                f"(retry {attempt}/{self.retry_policy.max_retries})"
+            )
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def _stream(
+        self,
+        method: str,
+        endpoint: str = "",
+        params: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        *,
+        max_bytes: int | None = None,
+        rate_limit_blocking: bool | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ResponseStream]:
+        """
+        Perform an HTTP request and stream its response body.
+
+        Unlike ``_fetch``, the body isn't read up front: the response is
+        entered once its headers arrive and the body is read incrementally
+        from the connection with the yielded stream's ``iter_bytes``,
+        ``iter_text`` or ``iter_lines``. The connection is released when the
+        block exits, even if the body was not read to the end. The request
+        goes through the rate limiter, concurrency limiter and circuit
+        breakers, but is not retried, hedged, coalesced or cached.
 
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, PATCH, etc.).
+            endpoint: API endpoint path (will be appended to BASE_URL).
+            params: Query parameters for the request.
+            payload: JSON payload for POST/PUT/PATCH requests.
+            headers: Additional headers for this specific request.
+            max_bytes: Maximum decoded body size. Larger bodies raise
+                      ResponseTooLargeError, as soon as their
+                      ``Content-Length`` is seen or when the limit is
+                      crossed while reading. None means unlimited.
+            rate_limit_blocking: Override whether the rate limiter waits for
+                                a token (True) or raises RateLimitError
+                                immediately when none is available (False).
+            **kwargs: Additional arguments passed to httpx request method.
+
+        Yields:
+            The response body stream.
+
+        Raises:
+            HTTPError: If the request fails, returns an error status code or
+                the connection fails while the body is read.
+            ResponseTooLargeError: If the body exceeds ``max_bytes``.
+            ProxyError: If there's a proxy-related connection issue.
+            PoolTimeoutError: If no pooled connection became available in
+                time.
+            RateLimitError: If the rate limiter refuses to send the request.
+            CircuitOpenError: If the circuit of the host or proxy is open.
+
+        Example:
+            >>> async with self._stream("GET", "/export", max_bytes=2**30) as body:
+            ...     async for line in body.iter_lines():
+            ...         process(line)
+        """
+        url = f"{self.base_url}{endpoint}"
         try:
-            logger.debug(f"{method} {url}")
-            response = await self.client.request(
+            response = await self._send(
                 method,
                 url,
+                endpoint,
+                rate_limit_blocking=rate_limit_blocking,
+                stream=True,
                 params=params,
                 json=payload,
                 headers=headers,
                 **kwargs,
             )
-            response.raise_for_status()
-
-            logger.debug(f"Response status: {response.status_code}")
-            return response.json()
-
-        except httpx.ProxyError as e:
-            logger.error(f"Proxy error: {e}")
-            raise ProxyError(f"Proxy connection failed: {e}") from e
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e}")
-            raise HTTPError(
-                f"Request failed with status {e.response.status_code}",
-                status_code=e.response.status_code,
-                response_body=e.response.json()
-                if hasattr(e.response, "json")
-                else None,
-            ) from e
-        except httpx.TimeoutException as e:
-            logger.error(f"Request timeout: {e}")
-            raise HTTPError(f"Request timed out: {e}") from e
+        except RavexClientError:
+            raise
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise HTTPError(f"Request failed: {e}") from e
+            raise self._map_error(e) from e
+
+        try:
+            body = ResponseStream(response, max_bytes, map_error=self._map_error)
+            try:
+                if response.is_error and body.fits():
+                    await response.aread()
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                raise self._map_error(e) from e
+            await body.check_size()
+            logger.debug(f"Streaming response: {response.status_code}")
+            yield body
+        finally:
+            await response.aclose()
+
+    async def _iter_json(
+        self,
+        method: str,
+        endpoint: str = "",
+        params: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        *,
+        path: str | Sequence[str | int] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """
+        Perform an HTTP request and yield the items of its JSON array.
+
+        The response is streamed with ``_stream`` and parsed incrementally,
+        so each item is yielded as soon as it has arrived and only about one
+        item is held in memory, instead of the raw body and the whole parsed
+        list as with ``_fetch``. Reading stops, and the connection is
+        released, once the array ends. To release it as soon as the caller
+        stops iterating early, wrap the iterator in ``contextlib.aclosing``.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE, PATCH, etc.).
+            endpoint: API endpoint path (will be appended to BASE_URL).
+            params: Query parameters for the request.
+            payload: JSON payload for POST/PUT/PATCH requests.
+            headers: Additional headers for this specific request.
+            path: Location of the array in the response: dot-separated
+                 member names (and array indexes) such as ``"data.items"``,
+                 or a sequence of them. None means the response itself is
+                 the array.
+            **kwargs: Additional arguments passed to ``_stream``, e.g.
+                     ``max_bytes``.
+
+        Yields:
+            The decoded array items, in order.
+
+        Raises:
+            HTTPError: If the request fails, returns an error status code or
+                its body isn't JSON with an array at ``path``.
+            ResponseTooLargeError: If the body exceeds ``max_bytes``.
+            ProxyError: If there's a proxy-related connection issue.
+            RateLimitError: If the rate limiter refuses to send the request.
+            CircuitOpenError: If the circuit of the host or proxy is open.
+
+        Example:
+            >>> async for user in self._iter_json("GET", "/users", path="data"):
+            ...     print(user["name"])
+        """
+        parser = JSONArrayParser(path)
+        async with self._stream(
+            method, endpoint, params, payload, headers, **kwargs
+        ) as body:
+            try:
+                async for text in body.iter_text():
+                    for item in parser.feed(text):
+                        yield item
+                    if parser.done:
+                        return
+                for item in parser.close():
+                    yield item
+            except ValueError as e:
+                raise self._map_error(e) from e
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        rate_limit_blocking: bool | None = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a single request attempt through the client's flow control.
+
+        The attempt is refused up front if the circuit of its host or proxy
+        is open. It then waits for the rate limiter and the concurrency
+        limiter (when configured) and reports its outcome back to them and
+        to the circuit breakers. Metadata about the response is recorded for
+        ``last_response_info``. Status codes are not checked here.
+
+        Args:
+            method: HTTP method.
+            url: Fully qualified request URL.
+            endpoint: Endpoint path used to select rate limits.
+            rate_limit_blocking: Per-call override for the rate limiter.
+            stream: Return once the headers arrive, leaving the body unread.
+                   The caller must close the response.
+            **kwargs: Arguments passed to httpx request method.
+
+        Returns:
+            The raw httpx response.
+
+        Raises:
+            CircuitOpenError: If the circuit of the host or proxy is open.
+        """
+        breakers = self._admit(url)
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(endpoint, rate_limit_blocking)
+
+            logger.debug(f"{method} {url}")
+            request = functools.partial(self._request, method, url, stream, **kwargs)
+            limiter = self.concurrency_limiter
+            if limiter is None:
+                response = await request()
+            else:
+                start = await limiter.acquire()
+                try:
+                    response = await request()
+                except (asyncio.CancelledError, CircuitOpenError):
+                    limiter.release(start, ignore=True)
+                    raise
+                except Exception:
+                    limiter.release(start, dropped=True)
+                    raise
+                limiter.release(start, dropped=response.status_code in (429, 503))
+        except BaseException as e:
+            for breaker, is_failure in breakers:
+                if isinstance(e, Exception) and is_failure(error=e):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            raise
+
+        for breaker, is_failure in breakers:
+            if is_failure(response=response):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        info = record_response(response)
+        logger.debug(f"{method} {url} answered over {info.http_version}")
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(endpoint, response)
+        return response
+
+    async def _request(
+        self, method: str, url: str, stream: bool, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request with httpx, leaving the body unread if ``stream``."""
+        if not stream:
+            return await self.client.request(method, url, **kwargs)
+        send_kwargs = {
+            name: kwargs.pop(name)
+            for name in ("auth", "follow_redirects")
+            if name in kwargs
+        }
+        request = self.client.build_request(method, url, **kwargs)
+        return await self.client.send(request, stream=True, **send_kwargs)
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        rate_limit_blocking: bool | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request attempt, hedging it if it is slow.
+
+        The attempt is sent with ``_send``. If it hasn't answered after the
+        hedge policy's delay and the policy's budget allows it, a backup
+        attempt is sent, through a different proxy when the client uses a
+        proxy pool. The first attempt to answer wins and the other one is
+        cancelled. A failed attempt only loses if the other one answers.
+
+        Args:
+            method: HTTP method.
+            url: Fully qualified request URL.
+            endpoint: Endpoint path used to select rate limits.
+            rate_limit_blocking: Per-call override for the rate limiter.
+            **kwargs: Arguments passed to httpx request method.
+
+        Returns:
+            The raw httpx response of the winning attempt.
+        """
+        policy = self.hedge_policy
+        policy.record_request()
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        pool = self.proxy_pool
+        pin = pool is not None and PROXY_EXTENSION not in extensions
+        used: list[str] = []
+
+        async def attempt() -> tuple[httpx.Response, float]:
+            attempt_extensions = extensions
+            if pin:
+                # Pin each attempt so the backup avoids the first one's proxy.
+                proxy = pool.select(exclude=used)
+                used.append(proxy)
+                attempt_extensions = {**extensions, PROXY_EXTENSION: proxy}
+            started = time.perf_counter()
+            response = await self._send(
+                method,
+                url,
+                endpoint,
+                rate_limit_blocking=rate_limit_blocking,
+                extensions=attempt_extensions,
+                **kwargs,
+            )
+            return response, time.perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        primary = loop.create_task(attempt())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=policy.delay)
+            if not done and policy.try_hedge():
+                logger.debug(f"Hedging {method} {url} after {policy.delay:.3f}s")
+                tasks.append(loop.create_task(attempt()))
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if not task.exception()), None)
+                if winner is not None or not pending:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        if winner is None:
+            # Every attempt failed: report the first attempt's error.
+            raise primary.exception()
+        for task, result in zip(tasks, results):
+            if task is not winner and isinstance(result, tuple):
+                await result[0].aclose()
+        response, latency = winner.result()
+        policy.record_latency(latency)
+        if winner is not primary:
+            policy.hedge_wins += 1
+        # Attempts run in their own tasks; record the winner for the caller.
+        record_response(response)
+        return response
+
+    def _admit(self, url: str) -> list[tuple[CircuitBreaker, Callable[..., bool]]]:
+        """
+        Pass the circuit breakers guarding a request to ``url``.
+
+        Args:
+            url: Fully qualified request URL.
+
+        Returns:
+            The admitting breakers, each with the predicate that classifies
+            the attempt's outcome as a failure for it.
+
+        Raises:
+            CircuitOpenError: If the host's or the proxy's circuit is open.
+        """
+        registry = self.circuit_breakers
+        if registry is None:
+            return []
+        proxied = self._proxy_url is not None or self.proxy_pool is not None
+        guards: list[tuple[CircuitBreaker, Callable[..., bool]]] = [
+            (
+                registry.get(host_key(url)),
+                functools.partial(registry.is_host_failure, proxied=proxied),
+            )
+        ]
+        if self._proxy_url is not None:
+            guards.append(
+                (registry.get(proxy_key(self._proxy_url)), registry.is_proxy_failure)
+            )
+        admitted: list[tuple[CircuitBreaker, Callable[..., bool]]] = []
+        try:
+            for breaker, is_failure in guards:
+                breaker.allow()
+                admitted.append((breaker, is_failure))
+        except CircuitOpenError:
+            for breaker, _ in admitted:
+                breaker.release()
+            raise
+        return admitted
+
+    def _retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        error: Exception,
+        previous: float | None,
+        retry: bool | None,
+    ) -> float | None:
+        """
+        Decide whether a failed attempt should be retried.
+
+        Args:
+            method: HTTP method of the request.
+            attempt: Zero-based index of the attempt that failed.
+            error: Exception raised while performing the attempt.
+            previous: Delay used before the failed attempt, if any.
+            retry: Per-call override passed to _fetch.
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up.
+        """
+        policy = self.retry_policy
+        if policy is None or retry is False or isinstance(error, RavexClientError):
+            return None
+        if not policy.is_retryable(method, attempt, error, force=bool(retry)):
+            return None
+        return policy.next_delay(attempt, error, previous)
+
+    def _budget_exhausted(self, attempt: int, error: Exception) -> HTTPError:
+        """
+        Build the error raised when the retry budget denies a retry.
+
+        Args:
+            attempt: Zero-based index of the attempt that failed.
+            error: Exception raised by the failed attempt.
+
+        Returns:
+            HTTPError describing the denied retry and the original failure.
+        """
+        cause = self._map_error(error)
+        logger.warning(f"Retry budget exhausted after {attempt + 1} attempt(s)")
+        return HTTPError(
+            f"Retry budget exhausted after {attempt + 1} attempt(s): {cause.message}",
+            status_code=getattr(cause, "status_code", None),
+            response_body=getattr(cause, "response_body", None),
+        )
+
+    def _map_error(self, error: Exception) -> RavexClientError:
+        """
+        Translate an exception raised while performing a request.
+
+        Args:
+            error: Exception raised by httpx or while parsing the response.
+
+        Returns:
+            The RavexClient exception that should be raised to the caller.
+        """
+        if isinstance(error, RavexClientError):
+            return error
+        if isinstance(error, httpx.ProxyError):
+            logger.error(f"Proxy error: {error}")
+            return ProxyError(f"Proxy connection failed: {error}")
+        if isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            logger.error(f"HTTP error {status_code}: {error}")
+            try:
+                response_body = error.response.json()
+            except (ValueError, httpx.ResponseNotRead):
+                # Bodies of streamed errors are not read beyond max_bytes.
+                response_body = None
+            return HTTPError(
+                f"Request failed with status {status_code}",
+                status_code=status_code,
+                response_body=response_body,
+            )
+        if isinstance(error, httpx.PoolTimeout):
+            logger.error(f"Connection pool timeout: {error}")
+            return PoolTimeoutError(
+                f"Timed out waiting for a pooled connection: {error}"
+            )
+        if isinstance(error, httpx.TimeoutException):
+            logger.error(f"Request timeout: {error}")
+            return HTTPError(f"Request timed out: {error}")
+        logger.error(f"Unexpected error: {error}")
+        return HTTPError(f"Request failed: {error}")
 
     async def _get(
         self,
@@ -290,6 +1456,13 @@ class BaseClient(ABC):
             ... finally:
             ...     await client.close()
         """
+        refreshes = list(self._refreshes.values())
+        self._refreshes.clear()
+        for task in refreshes:
+            task.cancel()
+        await asyncio.gather(*refreshes, return_exceptions=True)
+        if self.refresh_ahead is not None:
+            await self.refresh_ahead.aclose()
         await self.client.aclose()
         logger.info("Client closed")
 
@@ -0,0 +1,1047 @@
+"""
+HTTP response caching for BaseClient.
+
+This module provides the response cache consulted by ``BaseClient._fetch``
+before a request is sent. ``ResponseCache`` decides what may be stored and
+for how long from the response's ``Cache-Control``, ``Expires`` and ``Vary``
+headers; where entries live is up to a ``CacheBackend``. ``MemoryCache`` is
+a bounded in-process LRU backend; ``SQLiteCache`` keeps compressed entries
+in a file shared by every worker process on the host, so they survive
+restarts. Stale entries with an ``ETag`` or
+``Last-Modified`` validator are revalidated with a conditional request, so
+an unchanged resource costs a ``304 Not Modified`` instead of a full body.
+``NegativeCache`` remembers 404/410 errors for a short time, so repeated
+lookups of missing resources fail without a round trip.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import math
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from os import PathLike
+from typing import Any
+
+import httpx
+
+from .exceptions import ConfigurationError, HTTPError
+from .response import ResponseInfo
+
+logger = logging.getLogger(__name__)
+
+# Fixed per-entry overhead counted against MemoryCache.max_bytes.
+_ENTRY_OVERHEAD = 256
+
+# Cache-Control directives forbidding to serve a response once stale.
+_NEVER_STALE = frozenset({"must-revalidate", "proxy-revalidate", "no-cache"})
+
+# Headers of a 304 that describe its (empty) body, not the stored one.
+_BODY_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding"})
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """
+    Parse a ``Cache-Control`` header into a directive mapping.
+
+    Args:
+        value: Header value, e.g. ``'max-age=60, must-revalidate'``.
+
+    Returns:
+        Lower-cased directive names mapped to their value (None for
+        directives without one).
+    """
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _elapsed(response: httpx.Response) -> float:
+    try:
+        return response.elapsed.total_seconds()
+    except RuntimeError:
+        # Responses built by hand have no timing.
+        return 0.0
+
+
+def _seconds(value: str | None) -> float | None:
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class CacheEntry:
+    """
+    A stored response.
+
+    Attributes:
+        url: URL the response was fetched from.
+        status_code: HTTP status code.
+        http_version: Protocol the response was received over.
+        headers: Response headers.
+        body: Raw response body.
+        stored_at: Wall-clock time the response was stored.
+        expires_at: Wall-clock time the response stops being fresh.
+        vary: Request header values the response varies on, keyed by
+             lower-cased header name.
+        fetch_time: Seconds the request for the response took, used to
+                   refresh the entry early.
+    """
+
+    url: str
+    status_code: int
+    http_version: str
+    headers: dict[str, str]
+    body: bytes
+    stored_at: float
+    expires_at: float
+    vary: dict[str, str | None] = field(default_factory=dict)
+    fetch_time: float = 0.0
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes."""
+        return len(self.body) + _ENTRY_OVERHEAD
+
+    def is_fresh(self, now: float) -> bool:
+        """Whether the entry may be served without contacting the server."""
+        return now < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """
+        Conditional request headers that revalidate this entry.
+
+        Returns:
+            ``If-None-Match`` and/or ``If-Modified-Since`` built from the
+            stored ``ETag`` and ``Last-Modified`` headers; empty if the
+            entry has neither.
+        """
+        headers = httpx.Headers(self.headers)
+        conditional = {}
+        if "etag" in headers:
+            conditional["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            conditional["If-Modified-Since"] = headers["last-modified"]
+        return conditional
+
+    def matches(self, request_headers: httpx.Headers) -> bool:
+        """Whether a request selects this entry under its ``Vary`` headers."""
+        return all(request_headers.get(name) == v for name, v in self.vary.items())
+
+    def json(self) -> Any:
+        """Parse the stored body; each call returns a new object."""
+        return json.loads(self.body)
+
+    def info(self, stale: bool = False) -> ResponseInfo:
+        """Response metadata for a cache hit, flagged ``stale`` if it is."""
+        return ResponseInfo(
+            url=self.url,
+            status_code=self.status_code,
+            http_version=self.http_version,
+            elapsed=0.0,
+            cached=True,
+            stale=stale,
+        )
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cache entries.
+
+    Backends only store and evict; freshness and cacheability are decided
+    by ResponseCache. Methods are coroutines so backends may do I/O.
+    """
+
+    evictions: int = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> CacheEntry | None:
+        """Return the entry stored under ``key``, if any."""
+
+    async def peek(self, key: str) -> CacheEntry | None:
+        """Like get, but without counting as a use for eviction order."""
+        return await self.get(key)
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """Store ``entry`` under ``key``, evicting others if needed."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the entry stored under ``key``, if any."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+
+    async def aclose(self) -> None:
+        """Release resources held by the backend."""
+
+    def stats(self) -> dict[str, float]:
+        """Backend counters, e.g. entries, bytes and evictions."""
+        return {"evictions": self.evictions}
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache bounded by entry count and total bytes.
+
+    Attributes:
+        max_entries: Maximum number of entries.
+        max_bytes: Maximum total size of the stored bodies (plus a small
+                  per-entry overhead). Larger responses are not stored.
+        evictions: Entries evicted to stay within the bounds.
+
+    Example:
+        >>> cache = ResponseCache(MemoryCache(max_entries=10_000, max_bytes=2**28))
+        >>> client = MyAPIClient(cache=cache)
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        if max_entries < 1 or max_bytes < 1:
+            raise ConfigurationError("max_entries and max_bytes must be >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def peek(self, key: str) -> CacheEntry | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.delete(key)
+        if entry.size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {entry.size} bytes exceeds max_bytes")
+            return
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "evictions": self.evictions,
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    body BLOB NOT NULL,
+    compressed INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + new.size;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - old.size;
+END;
+"""
+
+# Seconds between access time updates of an entry, which cost a write.
+_TOUCH_INTERVAL = 1.0
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent cache backend stored in an SQLite database file.
+
+    Entries are keyed by the normalized request key and survive process
+    restarts. Bodies are compressed with zlib when that makes them
+    smaller. The database runs in WAL mode, so several worker processes
+    on one host can share the file: readers don't block each other or the
+    writer, and writers wait up to ``busy_timeout`` for the lock. Totals
+    are kept in the database by triggers, so every process enforces the
+    same bounds, evicting the least recently used entries first.
+
+    SQLite calls run in the default executor and are serialized per
+    instance, so the event loop never blocks on disk I/O.
+
+    Attributes:
+        path: Database file.
+        max_entries: Maximum number of entries.
+        max_bytes: Maximum total size of the stored (compressed) bodies
+                  and metadata. Larger entries are not stored.
+        compression_level: zlib level, 0 to store bodies uncompressed.
+        evictions: Entries evicted by this instance.
+
+    Example:
+        >>> backend = SQLiteCache("/var/cache/myapi.sqlite", max_bytes=2**30)
+        >>> client = MyAPIClient(cache=ResponseCache(backend))
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        max_entries: int = 100_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        compression_level: int = 6,
+        busy_timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_entries < 1 or max_bytes < 1:
+            raise ConfigurationError("max_entries and max_bytes must be >= 1")
+        if not 0 <= compression_level <= 9:
+            raise ConfigurationError("compression_level must be between 0 and 9")
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.busy_timeout = busy_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.evictions = 0
+        self._totals = (0, 0)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+            self._db = db
+        return self._db
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        def call() -> Any:
+            with self._lock:
+                return fn(self._connect(), *args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, call)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await self._run(self._get, key)
+
+    async def peek(self, key: str) -> CacheEntry | None:
+        return await self._run(self._get, key, False)
+
+    def _get(
+        self, db: sqlite3.Connection, key: str, touch: bool = True
+    ) -> CacheEntry | None:
+        row = db.execute(
+            "SELECT meta, body, compressed, accessed FROM entries WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        meta, body, compressed, accessed = row
+        now = self._clock()
+        if touch and now - accessed >= _TOUCH_INTERVAL:
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        body = zlib.decompress(body) if compressed else body
+        return CacheEntry(body=body, **json.loads(meta))
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self._run(self._set, key, entry)
+
+    def _set(self, db: sqlite3.Connection, key: str, entry: CacheEntry) -> None:
+        meta = asdict(entry)
+        del meta["body"]
+        meta_json = json.dumps(meta, separators=(",", ":"))
+        body: bytes = entry.body
+        compressed = False
+        if self.compression_level and body:
+            packed = zlib.compress(body, self.compression_level)
+            if len(packed) < len(body):
+                body, compressed = packed, True
+        size = len(body) + len(meta_json)
+
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if size > self.max_bytes:
+                logger.debug(f"Not caching {key}: {size} bytes exceeds max_bytes")
+            else:
+                db.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, meta_json, body, compressed, size, self._clock()),
+                )
+                self._evict(db)
+            self._totals = db.execute("SELECT entries, bytes FROM totals").fetchone()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        entries, total = db.execute("SELECT entries, bytes FROM totals").fetchone()
+        excess_entries = entries - self.max_entries
+        excess_bytes = total - self.max_bytes
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+        victims = []
+        oldest = db.execute("SELECT key, size FROM entries ORDER BY accessed")
+        for key, size in oldest:
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            victims.append((key,))
+            excess_entries -= 1
+            excess_bytes -= size
+        oldest.close()
+        db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    async def delete(self, key: str) -> None:
+        await self._run(
+            lambda db: db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        )
+
+    async def clear(self) -> None:
+        await self._run(lambda db: db.execute("DELETE FROM entries"))
+        self._totals = (0, 0)
+
+    async def aclose(self) -> None:
+        def close(db: sqlite3.Connection) -> None:
+            db.close()
+            self._db = None
+
+        if self._db is not None:
+            await self._run(close)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Backend counters.
+
+        ``entries`` and ``bytes`` are the database totals as of this
+        instance's last write; other processes may have changed them since.
+        """
+        entries, total = self._totals
+        return {"entries": entries, "bytes": total, "evictions": self.evictions}
+
+
+class ResponseCache:
+    """
+    HTTP-aware response cache used by ``BaseClient._fetch``.
+
+    Responses to cacheable methods with a cacheable status are stored for
+    their ``Cache-Control: max-age`` (or ``Expires``) lifetime, minus their
+    ``Age``. Responses without freshness information are kept for
+    ``default_ttl`` seconds (not at all by default). ``no-store`` responses
+    and ``Vary: *`` responses are never stored. Entries remember the
+    request headers named by ``Vary`` and only serve requests with the
+    same values. Requests sent with ``Cache-Control: no-cache`` skip the
+    lookup, and ``no-store`` requests are neither served nor stored.
+
+    Responses with an ``ETag`` or ``Last-Modified`` validator are kept
+    after they go stale, even when they were never fresh (e.g.
+    ``Cache-Control: no-cache``). The client then sends a conditional
+    request, and a ``304 Not Modified`` answer refreshes the entry and
+    serves its body without downloading or storing it again.
+
+    Stale entries can also be served as they are (RFC 5861). Within
+    ``stale_while_revalidate`` seconds of expiring, an entry answers
+    immediately while the client refreshes it in the background. Within
+    ``stale_if_error`` seconds, it answers requests that failed because
+    the upstream is unreachable, timed out or returned a 5xx. The
+    response's own ``stale-while-revalidate``/``stale-if-error``
+    directives override these windows, and ``must-revalidate``,
+    ``proxy-revalidate`` or ``no-cache`` responses are never served stale.
+
+    Two mechanisms keep a hot entry from triggering a stampede of identical
+    requests when it expires. Shortly before expiry, each hit may decide
+    to refresh the entry early in the background, with a probability that
+    grows as expiry nears and with the time the request takes to answer
+    (XFetch, tuned by ``early_refresh_beta``). And once an entry is
+    missing or expired, only the first caller sends a request; concurrent
+    callers for the same key wait up to ``lock_timeout`` seconds for it to
+    store the response, then read it from the cache.
+
+    Attributes:
+        backend: Where entries are stored.
+        default_ttl: Lifetime of responses without freshness information.
+        methods: HTTP methods whose responses are cached.
+        statuses: Status codes that may be cached.
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to go to the network.
+        stores: Responses stored.
+        revalidations: Conditional requests sent for stale entries.
+        not_modified: Revalidations answered with 304 Not Modified.
+        bytes_saved: Body bytes served from the cache instead of being
+                    downloaded, by fresh hits and by 304 answers.
+        stale_while_revalidate: Seconds after expiry an entry is served
+                               while it is refreshed in the background.
+        stale_if_error: Seconds after expiry an entry is served when the
+                       request fails.
+        stale_hits: Stale entries served while being revalidated.
+        stale_errors: Stale entries served in place of a failed request.
+        early_refresh_beta: XFetch aggressiveness; larger values refresh
+                           earlier, 0 disables early refreshes.
+        lock_timeout: Longest a caller waits for another caller to refill
+                     the same key before sending its own request; 0
+                     disables the refill lock.
+        early_refreshes: Fresh entries refreshed early.
+        lock_waits: Misses that waited for another caller's request.
+
+    Example:
+        >>> cache = ResponseCache(MemoryCache(max_bytes=32 * 1024 * 1024))
+        >>> client = MyAPIClient(cache=cache)
+        >>> await client._get("/countries", cache_ttl=3600)
+        >>> cache.stats()["hits"]
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        default_ttl: float = 0.0,
+        methods: Iterable[str] = ("GET",),
+        statuses: Iterable[int] = (200, 203),
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        early_refresh_beta: float = 1.0,
+        lock_timeout: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        if stale_while_revalidate < 0 or stale_if_error < 0:
+            raise ConfigurationError("Stale windows must be >= 0")
+        if early_refresh_beta < 0 or lock_timeout < 0:
+            raise ConfigurationError("early_refresh_beta and lock_timeout must be >= 0")
+        self.early_refresh_beta = early_refresh_beta
+        self.lock_timeout = lock_timeout
+        self._refills: dict[str, asyncio.Event] = {}
+        self.backend = backend if backend is not None else MemoryCache()
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.methods = frozenset(m.upper() for m in methods)
+        self.statuses = frozenset(statuses)
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.stale_hits = 0
+        self.stale_errors = 0
+        self.early_refreshes = 0
+        self.lock_waits = 0
+
+    def applies_to(self, method: str) -> bool:
+        """Whether responses to ``method`` are cached."""
+        return method.upper() in self.methods
+
+    @staticmethod
+    def key(method: str, url: str, params: Mapping[str, Any] | None = None) -> str:
+        """
+        Build the normalized cache key of a request.
+
+        Args:
+            method: HTTP method.
+            url: Fully qualified request URL.
+            params: Query parameters, merged into the URL.
+
+        Returns:
+            The method and the normalized URL, e.g.
+            ``"GET https://api.example.com/items?page=1"``.
+        """
+        merged = httpx.URL(url, params=params) if params else httpx.URL(url)
+        return f"{method.upper()} {merged}"
+
+    async def get(
+        self, key: str, request_headers: httpx.Headers, stale: bool = False
+    ) -> CacheEntry | None:
+        """
+        Return a fresh entry for the request, counting a hit or a miss.
+
+        Args:
+            key: Cache key from ``key``.
+            request_headers: Headers the request would be sent with.
+            stale: Also return a stale entry, to revalidate it or serve it
+                  stale. Check ``is_fresh`` to tell the two apart.
+
+        Returns:
+            The cached entry, or None if there is no usable entry.
+        """
+        request_directives = parse_cache_control(request_headers.get("Cache-Control"))
+        if "no-cache" in request_directives or "no-store" in request_directives:
+            self.misses += 1
+            return None
+        entry = await self.backend.get(key)
+        if entry is None or not entry.matches(request_headers):
+            self.misses += 1
+            return None
+        if not self.is_fresh(entry):
+            self.misses += 1
+            return entry if stale else None
+        self.hits += 1
+        self.bytes_saved += len(entry.body)
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether ``entry`` may be served without contacting the server."""
+        return entry.is_fresh(self._clock())
+
+    def ttl(self, entry: CacheEntry) -> float:
+        """Seconds until ``entry`` expires (negative once it is stale)."""
+        return entry.expires_at - self._clock()
+
+    def should_refresh_early(self, entry: CacheEntry) -> bool:
+        """
+        Decide whether a fresh entry should be refreshed ahead of expiry.
+
+        Uses XFetch: the entry counts as expired once
+        ``now - fetch_time * beta * ln(U)`` reaches its expiry, for U
+        uniform in (0, 1]. Entries that are slow to fetch start refreshing
+        earlier, and few callers do so long before expiry.
+
+        Returns:
+            True if the caller should start a refresh (counted).
+        """
+        if not self.early_refresh_beta or not entry.fetch_time:
+            return False
+        gap = (
+            -entry.fetch_time
+            * self.early_refresh_beta
+            * math.log(1.0 - random.random())
+        )
+        if self._clock() + gap < entry.expires_at:
+            return False
+        self.early_refreshes += 1
+        return True
+
+    @asynccontextmanager
+    async def refill_lock(self, key: str) -> AsyncIterator[bool]:
+        """
+        Let one caller at a time refill ``key`` after a miss.
+
+        The first caller holds the lock until it leaves the block, and
+        should send the request and store the response. Callers entering
+        meanwhile wait for it (up to ``lock_timeout`` seconds), then
+        should look the key up again before sending their own request.
+
+        Yields:
+            True for the caller holding the lock (or for every caller when
+            ``lock_timeout`` is 0), False for one that waited.
+
+        Example:
+            >>> async with cache.refill_lock(key) as leader:
+            ...     if not leader and (entry := await cache.get(key, headers)):
+            ...         return entry.json()
+            ...     return await fetch_and_store()
+        """
+        if not self.lock_timeout:
+            yield True
+            return
+        refill = self._refills.get(key)
+        if refill is not None:
+            self.lock_waits += 1
+            try:
+                await asyncio.wait_for(refill.wait(), self.lock_timeout)
+            except asyncio.TimeoutError:
+                logger.debug(f"Timed out waiting for the refill of {key}")
+            yield False
+            return
+
+        refill = self._refills[key] = asyncio.Event()
+        try:
+            yield True
+        finally:
+            del self._refills[key]
+            refill.set()
+
+    def try_serve_stale(self, entry: CacheEntry, on_error: bool = False) -> bool:
+        """
+        Check whether stale ``entry`` may be served, counting it if so.
+
+        Args:
+            entry: A stale entry.
+            on_error: Use the ``stale-if-error`` window (the request failed)
+                     instead of ``stale-while-revalidate``.
+
+        Returns:
+            True if the entry expired less than the window ago.
+        """
+        if self._clock() >= entry.expires_at + self._stale_window(entry, on_error):
+            return False
+        if on_error:
+            self.stale_errors += 1
+        else:
+            self.stale_hits += 1
+        return True
+
+    def _stale_window(self, entry: CacheEntry, on_error: bool) -> float:
+        directives = parse_cache_control(
+            httpx.Headers(entry.headers).get("Cache-Control")
+        )
+        if not _NEVER_STALE.isdisjoint(directives):
+            return 0.0
+        name = "stale-if-error" if on_error else "stale-while-revalidate"
+        window = _seconds(directives.get(name))
+        if window is not None:
+            return window
+        return self.stale_if_error if on_error else self.stale_while_revalidate
+
+    def freshness(self, response: httpx.Response) -> float | None:
+        """
+        Lifetime of ``response`` according to its headers.
+
+        Returns:
+            Seconds the response stays fresh, or None if it must not be
+            stored.
+        """
+        return self._lifetime(response.headers)
+
+    def _lifetime(self, headers: httpx.Headers) -> float | None:
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            return None
+        age = _seconds(headers.get("Age")) or 0.0
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            return max(0.0, max_age - age)
+        if "no-cache" in directives:
+            return 0.0
+        expires = headers.get("Expires")
+        if expires is not None:
+            try:
+                return max(
+                    0.0, parsedate_to_datetime(expires).timestamp() - self._clock()
+                )
+            except (TypeError, ValueError):
+                # Invalid dates mean "already expired".
+                return 0.0
+        return self.default_ttl
+
+    async def store(
+        self, key: str, response: httpx.Response, ttl: float | None = None
+    ) -> CacheEntry | None:
+        """
+        Store ``response`` if it is cacheable.
+
+        Args:
+            key: Cache key from ``key``.
+            response: A response whose body has been read.
+            ttl: Lifetime overriding the response's freshness headers.
+                ``no-store`` responses are still not stored.
+
+        Returns:
+            The stored entry, or None if the response wasn't stored.
+        """
+        request = response.request
+        if (
+            response.status_code not in self.statuses
+            or "no-store" in parse_cache_control(request.headers.get("Cache-Control"))
+        ):
+            return None
+        vary = [
+            name.strip().lower()
+            for name in response.headers.get("Vary", "").split(",")
+            if name.strip()
+        ]
+        if "*" in vary:
+            return None
+        lifetime = self.freshness(response)
+        if lifetime is None:
+            return None
+        if ttl is not None:
+            lifetime = ttl
+        now = self._clock()
+        entry = CacheEntry(
+            url=str(response.url),
+            status_code=response.status_code,
+            http_version=response.http_version,
+            headers=dict(response.headers),
+            body=response.content,
+            stored_at=now,
+            expires_at=now + max(0.0, lifetime),
+            vary={name: request.headers.get(name) for name in vary},
+            fetch_time=_elapsed(response),
+        )
+        if (
+            lifetime <= 0
+            and not entry.validators()
+            and not self._stale_window(entry, on_error=False)
+            and not self._stale_window(entry, on_error=True)
+        ):
+            return None
+        await self.backend.set(key, entry)
+        self.stores += 1
+        return entry
+
+    def conditional_headers(self, entry: CacheEntry) -> dict[str, str]:
+        """
+        Headers turning a request into a revalidation of ``entry``.
+
+        Counts a revalidation if the entry has validators.
+
+        Returns:
+            ``If-None-Match``/``If-Modified-Since`` headers; empty if the
+            entry has neither ``ETag`` nor ``Last-Modified``.
+        """
+        validators = entry.validators()
+        if validators:
+            self.revalidations += 1
+        return validators
+
+    async def revalidated(
+        self,
+        key: str,
+        entry: CacheEntry,
+        response: httpx.Response,
+        ttl: float | None = None,
+    ) -> CacheEntry:
+        """
+        Refresh ``entry`` after a ``304 Not Modified`` answer.
+
+        The stored headers are updated with the 304's headers and the
+        entry's lifetime is recomputed from them. The body is kept.
+
+        Args:
+            key: Cache key from ``key``.
+            entry: Entry that was revalidated.
+            response: The 304 response.
+            ttl: Lifetime overriding the freshness headers.
+
+        Returns:
+            The refreshed entry, whose body answers the request. It is not
+            stored again if the 304 says ``no-store``.
+        """
+        self.not_modified += 1
+        self.bytes_saved += len(entry.body)
+        headers = httpx.Headers(entry.headers)
+        for name, value in response.headers.items():
+            if name not in _BODY_HEADERS:
+                headers[name] = value
+        lifetime = self._lifetime(headers)
+        if lifetime is not None and ttl is not None:
+            lifetime = ttl
+        now = self._clock()
+        refreshed = replace(
+            entry,
+            headers=dict(headers),
+            stored_at=now,
+            expires_at=now + max(0.0, lifetime or 0.0),
+            fetch_time=_elapsed(response),
+        )
+        if lifetime is None:
+            await self.backend.delete(key)
+        else:
+            await self.backend.set(key, refreshed)
+        return refreshed
+
+    async def invalidate(self, key: str) -> None:
+        """Drop the entry stored under ``key``."""
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        """Drop every entry."""
+        await self.backend.clear()
+
+    async def aclose(self) -> None:
+        """Close the backend."""
+        await self.backend.aclose()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of cache counters.
+
+        Returns:
+            Dictionary with hits, misses, stores, the hit ratio, the
+            revalidation counters (revalidations, not_modified,
+            bytes_saved) and the stale counters (stale_hits,
+            stale_errors) and the stampede counters (early_refreshes,
+            lock_waits), merged with the backend's counters (entries,
+            bytes, evictions).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+            "stale_hits": self.stale_hits,
+            "stale_errors": self.stale_errors,
+            "early_refreshes": self.early_refreshes,
+            "lock_waits": self.lock_waits,
+            **self.backend.stats(),
+        }
+
+
+class NegativeCache:
+    """
+    Short-lived cache of "not found" errors.
+
+    When a request fails with a status in ``ttls`` (404 and 410 by
+    default), its HTTPError is remembered for that status's TTL and
+    identical requests raise an equal HTTPError without being sent. A
+    successful response for the request drops the entry. Entries are keyed
+    like ResponseCache's and at most ``max_entries`` are kept, the least
+    recently stored being evicted first.
+
+    Attributes:
+        ttls: Seconds to remember an error, by status code.
+        methods: HTTP methods whose errors are cached.
+        max_entries: Maximum number of remembered errors.
+        hits: Lookups answered with a cached error.
+        misses: Lookups that found no cached error.
+        stores: Errors remembered.
+        evictions: Errors dropped to stay within ``max_entries``.
+
+    Example:
+        >>> client = MyAPIClient(negative_cache=NegativeCache({404: 60}))
+        >>> await client._get("/items/missing")  # HTTPError(404), sent
+        >>> await client._get("/items/missing")  # HTTPError(404), not sent
+        >>> await client._get("/items/missing", negative_cache=False)  # sent
+    """
+
+    def __init__(
+        self,
+        ttls: Mapping[int, float] | None = None,
+        methods: Iterable[str] = ("GET", "HEAD"),
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        ttls = {404: 30.0, 410: 300.0} if ttls is None else dict(ttls)
+        if any(ttl <= 0 for ttl in ttls.values()):
+            raise ConfigurationError("Negative cache TTLs must be > 0")
+        if max_entries < 1:
+            raise ConfigurationError("max_entries must be >= 1")
+        self.ttls = ttls
+        self.methods = frozenset(m.upper() for m in methods)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._errors: OrderedDict[str, tuple[float, HTTPError]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._errors)
+
+    key = staticmethod(ResponseCache.key)
+
+    def applies_to(self, method: str) -> bool:
+        """Whether errors of ``method`` requests are cached."""
+        return method.upper() in self.methods
+
+    def check(self, key: str) -> None:
+        """
+        Raise the error cached for ``key``, if any.
+
+        Args:
+            key: Cache key from ``key``.
+
+        Raises:
+            HTTPError: A copy of the remembered error.
+        """
+        cached = self._errors.get(key)
+        if cached is not None and self._clock() >= cached[0]:
+            del self._errors[key]
+            cached = None
+        if cached is None:
+            self.misses += 1
+            return
+        self.hits += 1
+        error = cached[1]
+        # A fresh exception per hit, so tracebacks don't accumulate on it.
+        raise HTTPError(
+            error.message,
+            status_code=error.status_code,
+            response_body=copy.deepcopy(error.response_body),
+        )
+
+    def store(self, key: str, error: HTTPError) -> bool:
+        """
+        Remember ``error`` for ``key`` if its status has a TTL.
+
+        Args:
+            key: Cache key from ``key``.
+            error: Error the request failed with.
+
+        Returns:
+            True if the error was stored.
+        """
+        ttl = self.ttls.get(error.status_code)
+        if ttl is None:
+            return False
+        self._errors.pop(key, None)
+        self._errors[key] = (self._clock() + ttl, error)
+        self.stores += 1
+        while len(self._errors) > self.max_entries:
+            self._errors.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def discard(self, key: str) -> None:
+        """Forget the error stored under ``key``, if any."""
+        self._errors.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every error."""
+        self._errors.clear()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of negative cache counters.
+
+        Returns:
+            Dictionary with entries, hits, misses, the hit ratio, stores and
+            evictions.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._errors),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,341 @@
+"""
+Circuit breakers for BaseClient.
+
+When an origin or a proxy goes down, every request sent to it waits for a
+connect or read timeout before failing. A circuit breaker counts
+consecutive failures per host and per proxy and, past a threshold, opens:
+requests are then refused immediately with CircuitOpenError instead of
+queueing behind timeouts. After a cool-down the breaker lets a few trial
+requests through (half-open) and closes again once they succeed.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import httpx
+
+from .exceptions import CircuitOpenError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def host_key(url: str | httpx.URL) -> str:
+    """Breaker key for the host of ``url``."""
+    return f"host:{httpx.URL(url).host}"
+
+
+def proxy_key(proxy_url: str) -> str:
+    """Breaker key for a proxy URL."""
+    return f"proxy:{proxy_url}"
+
+
+@dataclass(frozen=True)
+class CircuitEvent:
+    """
+    State change of a circuit breaker, passed to registry listeners.
+
+    Attributes:
+        key: Breaker key, e.g. "host:api.example.com" or
+            "proxy:http://proxy.example.com:8080".
+        previous: State before the change.
+        state: State after the change.
+        failures: Consecutive failures recorded when the change happened.
+        timestamp: Clock reading at the change.
+    """
+
+    key: str
+    previous: str
+    state: str
+    failures: int
+    timestamp: float
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one host or proxy.
+
+    While closed, requests pass and consecutive failures are counted; once
+    they reach ``failure_threshold`` the breaker opens. While open, ``allow``
+    raises CircuitOpenError without touching the network. After
+    ``recovery_timeout`` seconds the breaker turns half-open and admits up to
+    ``half_open_max_calls`` trial requests at a time; ``success_threshold``
+    successes close it, and any failure opens it again.
+
+    Breakers are created by a CircuitBreakerRegistry, which holds the shared
+    settings and the state change listeners.
+
+    Attributes:
+        key: Host or proxy this breaker protects.
+        state: Current state: CLOSED, OPEN or HALF_OPEN.
+        failures: Consecutive failures while closed.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        registry: "CircuitBreakerRegistry",
+    ):
+        self.key = key
+        self._registry = registry
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once cooled down."""
+        if (
+            self._state == OPEN
+            and self._registry._clock() - self._opened_at
+            >= self._registry.recovery_timeout
+        ):
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open breaker admits a trial request."""
+        if self.state != OPEN:
+            return 0.0
+        elapsed = self._registry._clock() - self._opened_at
+        return max(0.0, self._registry.recovery_timeout - elapsed)
+
+    def available(self) -> bool:
+        """Whether ``allow`` would currently admit a request."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        return state == HALF_OPEN and self._trials < self._registry.half_open_max_calls
+
+    def allow(self) -> None:
+        """
+        Admit one request or refuse it immediately.
+
+        Every admitted request must be followed by exactly one call to
+        ``record_success``, ``record_failure`` or ``release``.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all
+                trial slots taken.
+        """
+        if self.available():
+            if self._state == HALF_OPEN:
+                self._trials += 1
+            return
+        self.rejected += 1
+        retry_after = self.retry_after
+        raise CircuitOpenError(
+            f"Circuit for {self.key} is open", key=self.key, retry_after=retry_after
+        )
+
+    def record_success(self) -> None:
+        """Record a successful request admitted by ``allow``."""
+        if self._state == HALF_OPEN:
+            self._trials = max(0, self._trials - 1)
+            self._trial_successes += 1
+            if self._trial_successes >= self._registry.success_threshold:
+                self._transition(CLOSED)
+        elif self._state == CLOSED:
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failed request admitted by ``allow``."""
+        if self._state == HALF_OPEN:
+            self._trials = max(0, self._trials - 1)
+            self._transition(OPEN)
+            return
+        if self._state == CLOSED:
+            self.failures += 1
+            if self.failures >= self._registry.failure_threshold:
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """Free a trial slot without an outcome, e.g. on cancellation."""
+        if self._state == HALF_OPEN:
+            self._trials = max(0, self._trials - 1)
+
+    def reset(self) -> None:
+        """Close the breaker and forget its failures."""
+        if self._state != CLOSED:
+            self._transition(CLOSED)
+        self.failures = 0
+
+    def _transition(self, state: str) -> None:
+        previous = self._state
+        now = self._registry._clock()
+        self._state = state
+        self._trials = 0
+        self._trial_successes = 0
+        if state == OPEN:
+            self._opened_at = now
+            self.opened += 1
+        elif state == CLOSED:
+            self.failures = 0
+        event = CircuitEvent(self.key, previous, state, self.failures, now)
+        log = logger.warning if state == OPEN else logger.info
+        log(f"Circuit for {self.key} changed {previous} -> {state}")
+        self._registry._emit(event)
+
+    def stats(self) -> dict[str, float | str]:
+        """
+        Snapshot of breaker state.
+
+        Returns:
+            Dictionary with the state, consecutive failures, seconds until
+            a trial request is admitted, and rejected/opened totals.
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_after": self.retry_after,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers keyed by host and by proxy, sharing one configuration.
+
+    BaseClient consults the breaker of the request's host (and of its proxy)
+    before every attempt and reports the outcome afterwards. Transport
+    errors and responses with a status in ``failure_statuses`` count as host
+    failures; connection errors, ProxyErrors and 407 answers count as proxy
+    failures instead when the request goes through a proxy.
+
+    With a ProxyPool, proxies with an open circuit are skipped.
+
+    A registry can be shared by several clients so they trip together.
+
+    Attributes:
+        failure_threshold: Consecutive failures that open a breaker.
+        recovery_timeout: Seconds a breaker stays open before admitting
+                         trial requests.
+        half_open_max_calls: Concurrent trial requests while half-open.
+        success_threshold: Trial successes needed to close a breaker.
+        failure_statuses: Response status codes counted as host failures.
+
+    Example:
+        >>> breakers = CircuitBreakerRegistry(failure_threshold=5)
+        >>> breakers.add_listener(lambda event: print(event.key, event.state))
+        >>> client = MyAPIClient(circuit_breakers=breakers)
+        >>> breakers.stats()["host:api.example.com"]["state"]
+        'closed'
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        success_threshold: int = 1,
+        failure_statuses: Iterable[int] = (500, 502, 503, 504),
+        listeners: Iterable[Callable[[CircuitEvent], None]] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ConfigurationError("failure_threshold must be >= 1")
+        if half_open_max_calls < 1 or success_threshold < 1:
+            raise ConfigurationError(
+                "half_open_max_calls and success_threshold must be >= 1"
+            )
+        if recovery_timeout < 0:
+            raise ConfigurationError("recovery_timeout must be >= 0")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.failure_statuses = frozenset(failure_statuses)
+        self._listeners = list(listeners)
+        self._clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def __len__(self) -> int:
+        return len(self._breakers)
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Return the breaker for ``key``, creating a closed one if needed."""
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(key, self)
+        return breaker
+
+    def add_listener(self, listener: Callable[[CircuitEvent], None]) -> None:
+        """
+        Call ``listener`` with a CircuitEvent on every state change.
+
+        Listeners run synchronously in the request path and should be
+        cheap, e.g. incrementing a metrics counter.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[CircuitEvent], None]) -> None:
+        """Stop calling ``listener``."""
+        self._listeners.remove(listener)
+
+    def _emit(self, event: CircuitEvent) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:  # noqa: BLE001 - listeners are user code
+                logger.error(f"Circuit breaker listener failed: {e}")
+
+    def is_host_failure(
+        self,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+        proxied: bool = False,
+    ) -> bool:
+        """
+        Whether an attempt's outcome counts against the host.
+
+        When the request went through a proxy, failures blamed on the proxy
+        are not held against the host.
+        """
+        if proxied and self.is_proxy_failure(response, error):
+            return False
+        if error is not None:
+            return isinstance(error, httpx.TransportError)
+        return response is not None and response.status_code in self.failure_statuses
+
+    @staticmethod
+    def is_proxy_failure(
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+    ) -> bool:
+        """Whether an attempt's outcome counts against the proxy."""
+        if error is not None:
+            return isinstance(
+                error, (httpx.ProxyError, httpx.ConnectError, httpx.ConnectTimeout)
+            )
+        return response is not None and response.status_code == 407
+
+    def reset(self, key: str | None = None) -> None:
+        """
+        Close breakers and forget their failures.
+
+        Args:
+            key: Only reset this breaker. None resets all of them.
+        """
+        breakers = self._breakers.values() if key is None else [self.get(key)]
+        for breaker in breakers:
+            breaker.reset()
+
+    def stats(self) -> dict[str, dict[str, float | str]]:
+        """
+        Snapshot of every breaker.
+
+        Returns:
+            Dictionary keyed by breaker key with each breaker's stats.
+        """
+        return {key: breaker.stats() for key, breaker in self._breakers.items()}
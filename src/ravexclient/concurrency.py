@@ -0,0 +1,264 @@
+"""
+Adaptive concurrency limiting for BaseClient.
+
+This module provides a limiter that caps the number of requests in flight
+and adjusts that cap from observed latency, in the style of Netflix's
+concurrency-limits library. Requests beyond the limit wait in a FIFO queue
+inside the client instead of piling up in the connection pool.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Protocol
+
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+
+class LimitAlgorithm(Protocol):
+    """Strategy that computes a new concurrency limit from a sample."""
+
+    initial_limit: float
+
+    def update(
+        self, limit: float, rtt: float, in_flight: int, dropped: bool
+    ) -> float: ...
+
+
+def _validate_bounds(initial: float, min_limit: float, max_limit: float) -> None:
+    if not 1 <= min_limit <= initial <= max_limit:
+        raise ConfigurationError(
+            "Concurrency limits must satisfy 1 <= min_limit <= initial <= max_limit"
+        )
+
+
+class AIMDLimit:
+    """
+    Additive-increase/multiplicative-decrease concurrency limit.
+
+    The limit grows by one after each successful request that was sent while
+    the limiter was at least half utilized, and shrinks by ``backoff_ratio``
+    whenever a request is dropped (timed out, failed to connect, or was
+    throttled) or takes longer than ``timeout``.
+
+    Attributes:
+        initial_limit: Starting concurrency limit.
+        min_limit: Lower bound for the limit.
+        max_limit: Upper bound for the limit.
+        backoff_ratio: Multiplier applied on a drop.
+        timeout: Latency in seconds above which a request counts as dropped.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 20,
+        min_limit: float = 1,
+        max_limit: float = 200,
+        backoff_ratio: float = 0.9,
+        timeout: float = 5.0,
+    ):
+        _validate_bounds(initial_limit, min_limit, max_limit)
+        if not 0 < backoff_ratio < 1:
+            raise ConfigurationError("backoff_ratio must be between 0 and 1")
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.timeout = timeout
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        """Return the new limit after observing one request."""
+        if dropped or rtt > self.timeout:
+            limit = limit * self.backoff_ratio
+        elif in_flight * 2 >= limit:
+            limit = limit + 1
+        return min(self.max_limit, max(self.min_limit, limit))
+
+
+class GradientLimit:
+    """
+    Latency-gradient concurrency limit (Netflix "Gradient2").
+
+    A slow exponential average of latency serves as the no-load baseline.
+    Each sample compares the baseline with the current latency; when latency
+    rises above ``tolerance`` times the baseline the limit shrinks
+    proportionally, otherwise it grows by roughly ``sqrt(limit)``.
+
+    Attributes:
+        initial_limit: Starting concurrency limit.
+        min_limit: Lower bound for the limit.
+        max_limit: Upper bound for the limit.
+        smoothing: Weight of each new estimate (0-1).
+        tolerance: Latency inflation accepted before shrinking the limit.
+        long_window: Number of samples averaged into the baseline latency.
+        backoff_ratio: Multiplier applied when a request is dropped.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 20,
+        min_limit: float = 1,
+        max_limit: float = 200,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        long_window: int = 600,
+        backoff_ratio: float = 0.9,
+    ):
+        _validate_bounds(initial_limit, min_limit, max_limit)
+        if not 0 < smoothing <= 1:
+            raise ConfigurationError("smoothing must be between 0 and 1")
+        if tolerance < 1:
+            raise ConfigurationError("tolerance must be >= 1")
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+        self._long_factor = 2 / (long_window + 1)
+        self.long_rtt: float | None = None
+
+    def update(self, limit: float, rtt: float, in_flight: int, dropped: bool) -> float:
+        """Return the new limit after observing one request."""
+        if dropped:
+            return max(self.min_limit, limit * self.backoff_ratio)
+        if rtt <= 0:
+            return limit
+
+        if self.long_rtt is None:
+            self.long_rtt = rtt
+        else:
+            self.long_rtt += (rtt - self.long_rtt) * self._long_factor
+            # Let the baseline recover quickly after a latency spike ends.
+            if self.long_rtt / rtt > 2:
+                self.long_rtt *= 0.95
+
+        # Don't grow while the client isn't using the capacity it has.
+        if in_flight < limit / 2:
+            return limit
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / rtt))
+        estimate = limit * gradient + math.sqrt(limit)
+        estimate = limit * (1 - self.smoothing) + estimate * self.smoothing
+        return min(self.max_limit, max(self.min_limit, estimate))
+
+
+class ConcurrencyLimiter:
+    """
+    Adaptive cap on the number of requests a client has in flight.
+
+    Callers ``acquire`` a slot before sending and ``release`` it with the
+    outcome afterwards; the configured algorithm turns each outcome into a
+    new limit. Waiters are served in FIFO order.
+
+    Attributes:
+        algorithm: Strategy used to update the limit.
+        in_flight: Requests currently holding a slot.
+
+    Example:
+        >>> limiter = ConcurrencyLimiter(GradientLimit(initial_limit=10))
+        >>> client = MyAPIClient(concurrency_limiter=limiter)
+        >>> limiter.limit, limiter.queue_depth
+        (10, 0)
+    """
+
+    def __init__(
+        self,
+        algorithm: LimitAlgorithm | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.algorithm = algorithm if algorithm is not None else GradientLimit()
+        self._clock = clock
+        self._limit = float(self.algorithm.initial_limit)
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self.in_flight = 0
+        self.completed = 0
+        self.dropped = 0
+
+    @property
+    def limit(self) -> int:
+        """Current maximum number of requests in flight."""
+        return max(1, int(self._limit))
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot.
+
+        Returns:
+            Start timestamp to pass back to ``release``.
+        """
+        if not self._waiters and self.in_flight < self.limit:
+            self.in_flight += 1
+            return self._clock()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation.
+                self.in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return self._clock()
+
+    def release(
+        self, start: float, dropped: bool = False, ignore: bool = False
+    ) -> None:
+        """
+        Free a slot and feed the outcome to the limit algorithm.
+
+        Args:
+            start: Timestamp returned by ``acquire``.
+            dropped: Whether the request timed out, failed to connect or was
+                    throttled by the server.
+            ignore: Free the slot without recording a sample, e.g. when the
+                   request was cancelled by the caller.
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if not ignore:
+            rtt = self._clock() - start
+            previous = self.limit
+            self._limit = self.algorithm.update(self._limit, rtt, in_flight, dropped)
+            self.completed += 1
+            self.dropped += dropped
+            if self.limit != previous:
+                logger.debug(f"Concurrency limit changed {previous} -> {self.limit}")
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of limiter state.
+
+        Returns:
+            Dictionary with the current limit, in-flight count, queue depth
+            and completed/dropped totals.
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "dropped": self.dropped,
+        }
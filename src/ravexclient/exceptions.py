@@ -29,6 +29,39 @@ class HTTPError(RavexClientError):
         self.response_body = response_body
 
 
+class PoolTimeoutError(HTTPError):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class CircuitOpenError(HTTPError):
+    """Raised without sending a request when a host's or proxy's circuit is open."""
+
+    def __init__(
+        self,
+        message: str,
+        key: str | None = None,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message)
+        self.details.update(key=key, retry_after=retry_after)
+        self.key = key
+        self.retry_after = retry_after
+
+
+class ResponseTooLargeError(HTTPError):
+    """Raised when a streamed response body exceeds its size limit."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        super().__init__(message, status_code=status_code)
+        self.details.update(max_bytes=max_bytes)
+        self.max_bytes = max_bytes
+
+
 class ProxyError(RavexClientError):
     """Raised when there's an issue with the proxy configuration or connection."""
 
@@ -51,3 +84,11 @@ class TimeoutError(RavexClientError):
     """Raised when a request times out."""
 
     pass
+
+
+class RateLimitError(RavexClientError):
+    """Raised when the client-side rate limiter refuses to send a request."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message, retry_after=retry_after)
+        self.retry_after = retry_after
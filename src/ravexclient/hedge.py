@@ -0,0 +1,150 @@
+"""
+Hedged requests for BaseClient.
+
+A hedged request sends a second copy of a slow request instead of waiting
+for it: if the first attempt hasn't answered after a high percentile of the
+latencies observed so far, a backup attempt is sent (through another proxy
+when a ProxyPool is used) and whichever answers first wins. Only the slow
+tail pays for the extra request, and a budget caps the added load.
+"""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+
+from .exceptions import ConfigurationError
+from .retry import RetryBudget
+
+
+class HedgePolicy:
+    """
+    When and how often ``BaseClient._fetch`` may hedge a request.
+
+    The hedge delay is the ``percentile`` of the last ``sample_size``
+    response latencies, clamped to ``[min_delay, max_delay]``. Until
+    ``min_samples`` latencies have been observed, ``initial_delay`` is used.
+    Hedges are drawn from a RetryBudget, so at most ``max_extra_load``
+    extra requests per request are sent over the sliding ``window``.
+
+    Attributes:
+        percentile: Latency percentile (0-100) after which to hedge.
+        initial_delay: Hedge delay used before enough samples exist.
+        min_delay: Lower bound for the hedge delay in seconds.
+        max_delay: Upper bound for the hedge delay in seconds.
+        max_extra_load: Maximum hedges per request over the window
+                       (0.1 = 10% extra requests).
+        methods: HTTP methods hedged by default. Other methods are only
+                hedged when the caller explicitly asks for it.
+        sample_size: Number of recent latencies kept.
+        min_samples: Latencies needed before the percentile is trusted.
+        budget: Budget hedges are drawn from.
+        requests: Requests sent under this policy.
+        hedges: Backup attempts sent.
+        hedge_wins: Requests answered by the backup attempt.
+        denied: Hedges refused by the budget.
+
+    Example:
+        >>> policy = HedgePolicy(percentile=95, max_extra_load=0.05)
+        >>> client = MyAPIClient(hedge_policy=policy)
+        >>> policy.stats()["hedge_wins"]
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 0.1,
+        min_delay: float = 0.005,
+        max_delay: float = 5.0,
+        max_extra_load: float = 0.1,
+        methods: Iterable[str] = ("GET", "HEAD"),
+        sample_size: int = 1000,
+        min_samples: int = 20,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < percentile < 100:
+            raise ConfigurationError("percentile must be between 0 and 100")
+        if not 0 <= min_delay <= max_delay:
+            raise ConfigurationError("Hedge delays must satisfy 0 <= min <= max")
+        if sample_size < 1 or min_samples < 1:
+            raise ConfigurationError("sample_size and min_samples must be >= 1")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_extra_load = max_extra_load
+        self.methods = frozenset(m.upper() for m in methods)
+        self.sample_size = sample_size
+        self.min_samples = min_samples
+        self.budget = RetryBudget(
+            ratio=max_extra_load, min_retries_per_second=0.0, window=window, clock=clock
+        )
+        self._samples: deque[float] = deque(maxlen=sample_size)
+        self._since_update = 0
+        self._delay: float | None = None
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.denied = 0
+
+    def applies_to(self, method: str, force: bool = False) -> bool:
+        """Whether requests with ``method`` are hedged."""
+        return force or method.upper() in self.methods
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait for the first attempt before hedging."""
+        if len(self._samples) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            # Sorting every sample per request would dominate the fast path;
+            # the percentile is recomputed after every 5% of new samples.
+            if self._delay is None or self._since_update >= self.sample_size // 20:
+                ordered = sorted(self._samples)
+                index = math.ceil(self.percentile / 100 * len(ordered)) - 1
+                self._delay = ordered[max(0, index)]
+                self._since_update = 0
+            delay = self._delay
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def record_request(self) -> None:
+        """Record a request sent under this policy."""
+        self.requests += 1
+        self.budget.record_request()
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a successful attempt."""
+        self._samples.append(latency)
+        self._since_update += 1
+
+    def try_hedge(self) -> bool:
+        """
+        Draw one hedge from the budget.
+
+        Returns:
+            True if the backup attempt may be sent.
+        """
+        if self.budget.try_acquire():
+            self.hedges += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of hedging counters.
+
+        Returns:
+            Dictionary with request, hedge, win and denial totals, the share
+            of hedges that won, the extra load added, and the current delay.
+        """
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "denied": self.denied,
+            "win_ratio": self.hedge_wins / self.hedges if self.hedges else 0.0,
+            "extra_load": self.hedges / self.requests if self.requests else 0.0,
+            "delay": self.delay,
+        }
@@ -0,0 +1,584 @@
+"""
+Proxy pools for BaseClient.
+
+This module provides a transport that spreads requests over several
+proxies. Each proxy keeps its own connection pool, so switching proxies
+never closes warm connections, and removing a proxy waits for the
+requests using it to finish before its connections are closed. An optional
+health check probes every proxy in the background and quarantines the ones
+that fail.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable, Container, Iterable
+from dataclasses import dataclass
+
+import httpx
+
+from .circuit import CircuitBreaker, CircuitBreakerRegistry, proxy_key
+from .exceptions import CircuitOpenError, ConfigurationError, ProxyError
+from .transport import ReleasingStream
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("round_robin", "least_in_flight", "latency_weighted")
+
+# Request extension that pins a request to one proxy of the pool.
+PROXY_EXTENSION = "ravexclient.proxy"
+
+# Attempts a proxy must have seen before its error rate can quarantine it.
+_MIN_SAMPLES = 10
+
+
+def normalize_proxy_url(proxy: str) -> str:
+    """
+    Return ``proxy`` as a URL, defaulting to the http scheme.
+
+    Args:
+        proxy: Proxy in "host:port" or "scheme://host:port" format.
+
+    Returns:
+        The proxy URL.
+    """
+    return proxy if proxy.startswith(("http", "socks")) else f"http://{proxy}"
+
+
+@dataclass
+class HealthCheck:
+    """
+    Health check settings for a ProxyPool.
+
+    Every ``interval`` seconds each proxy is probed concurrently with a
+    request to ``url``. Transport errors and 407 answers, on probes or real
+    requests, raise a proxy's error rate; probes also fail on 5xx answers. A proxy
+    is quarantined after ``failure_threshold`` consecutive failures, or once
+    its error rate reaches ``max_error_rate``. Quarantine lasts ``quarantine``
+    seconds, doubling for each repeat offence up to ``max_quarantine``. The
+    proxy is readmitted only after a probe succeeds, and its quarantine
+    length resets after ``recovery_successes`` consecutive successes.
+
+    Attributes:
+        url: URL requested through each proxy, ideally a cheap endpoint.
+        interval: Seconds between probe rounds.
+        timeout: Timeout for each probe in seconds.
+        method: HTTP method used for probes.
+        failure_threshold: Consecutive failures that trigger quarantine.
+        max_error_rate: Smoothed error rate (0-1) that triggers quarantine.
+        quarantine: First quarantine length in seconds.
+        max_quarantine: Upper bound for quarantine length.
+        recovery_successes: Consecutive successes that reset the
+                           quarantine length.
+    """
+
+    url: str
+    interval: float = 30.0
+    timeout: float = 5.0
+    method: str = "HEAD"
+    failure_threshold: int = 3
+    max_error_rate: float = 0.5
+    quarantine: float = 10.0
+    max_quarantine: float = 600.0
+    recovery_successes: int = 3
+
+
+class _Proxy:
+    """Routing and health state for one proxy of a ProxyPool."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.transport: httpx.AsyncBaseTransport | None = None
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.proxy_errors = 0
+        self.probes = 0
+        self.probe_failures = 0
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.consecutive_successes = 0
+        self.strikes = 0
+        self.quarantined_until: float | None = None
+        self.draining = False
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    @property
+    def attempts(self) -> int:
+        return self.requests + self.probes
+
+    def score(self, default_latency: float) -> float:
+        """Success rate per second of latency; higher is better."""
+        latency = self.latency if self.latency is not None else default_latency
+        return (1 - self.error_rate) / max(latency, 1e-6)
+
+    def stats(self, now: float) -> dict[str, float]:
+        attempts = self.attempts
+        quarantined = self.quarantined_until is not None
+        stats: dict[str, float] = {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "proxy_errors": self.proxy_errors,
+            "proxy_error_rate": self.proxy_errors / attempts if attempts else 0.0,
+            "probes": self.probes,
+            "probe_failures": self.probe_failures,
+            "error_rate": self.error_rate,
+            "latency": self.latency if self.latency is not None else 0.0,
+            "score": self.score(1.0),
+            "quarantined": quarantined,
+            "quarantined_for": (
+                max(0.0, self.quarantined_until - now) if quarantined else 0.0
+            ),
+            "strikes": self.strikes,
+        }
+        pool_stats = getattr(self.transport, "stats", None)
+        if pool_stats is not None:
+            stats.update(pool_stats())
+        return stats
+
+
+class ProxyPool(httpx.AsyncBaseTransport):
+    """
+    Transport that routes each request through one of several proxies.
+
+    Every proxy gets its own transport (and connection pool), created by
+    the BaseClient the pool is attached to, so TLS, pool limits and the
+    resolver match the client's settings. Proxies can be added and removed
+    at any time. A removed proxy stops receiving requests immediately, and
+    its connections are closed once the requests in flight through it
+    have finished.
+
+    With a ``health_check``, every proxy is scored on latency and error
+    rate, failing proxies are quarantined and no request is routed to them
+    until a probe succeeds again. Probing starts in the background with the
+    first request; ``check_health`` runs a round on demand.
+
+    Selection strategies:
+        - ``round_robin``: Cycle through the proxies in order.
+        - ``least_in_flight``: Pick the proxy with the fewest open requests.
+        - ``latency_weighted``: Pick at random, weighted by each proxy's
+          score: its success rate divided by its smoothed latency.
+
+    Attributes:
+        strategy: Selection strategy, one of STRATEGIES.
+        smoothing: Weight of each new latency and error sample (0-1).
+        health_check: Health check settings, or None to disable probing
+                     and quarantine.
+        circuit_breakers: Registry holding a circuit breaker per proxy;
+                         proxies with an open circuit are skipped. Defaults
+                         to the client's registry.
+
+    Example:
+        >>> pool = ProxyPool(
+        ...     ["proxy1.example.com:8080", "proxy2.example.com:8080"],
+        ...     strategy="least_in_flight",
+        ...     health_check=HealthCheck("https://api.example.com/health"),
+        ... )
+        >>> async with MyAPIClient(proxy_pool=pool) as client:
+        ...     await client.get_user(1)
+        ...     await pool.remove("proxy1.example.com:8080")
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[str] = (),
+        strategy: str = "round_robin",
+        smoothing: float = 0.3,
+        health_check: HealthCheck | None = None,
+        circuit_breakers: CircuitBreakerRegistry | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if strategy not in STRATEGIES:
+            raise ConfigurationError(
+                f"Unknown proxy strategy {strategy!r}, expected one of {STRATEGIES}"
+            )
+        if not 0 < smoothing <= 1:
+            raise ConfigurationError("smoothing must be between 0 and 1")
+        self.strategy = strategy
+        self.smoothing = smoothing
+        self.health_check = health_check
+        self.circuit_breakers = circuit_breakers
+        self._clock = clock
+        self._health_task: asyncio.Task[None] | None = None
+        self._factory: Callable[[str], httpx.AsyncBaseTransport] | None = None
+        self._proxies: dict[str, _Proxy] = {}
+        self._draining: set[_Proxy] = set()
+        self._cursor = 0
+        for proxy in proxies:
+            self.add(proxy)
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    @property
+    def proxies(self) -> list[str]:
+        """URLs of the proxies in the pool, including quarantined ones."""
+        return list(self._proxies)
+
+    @property
+    def healthy(self) -> list[str]:
+        """URLs of the proxies currently eligible for requests."""
+        return [url for url, state in self._proxies.items() if self._available(state)]
+
+    def bind(self, factory: Callable[[str], httpx.AsyncBaseTransport]) -> None:
+        """
+        Set how per-proxy transports are built.
+
+        Called by BaseClient; a pool can only serve one client.
+
+        Args:
+            factory: Builds a transport that connects through a proxy URL.
+
+        Raises:
+            ConfigurationError: If the pool is already bound.
+        """
+        if self._factory is not None:
+            raise ConfigurationError("ProxyPool is already used by another client")
+        self._factory = factory
+        for proxy in self._proxies.values():
+            proxy.transport = factory(proxy.url)
+
+    def add(self, proxy: str) -> None:
+        """
+        Start routing requests through ``proxy``.
+
+        Args:
+            proxy: Proxy in "host:port" or URL format.
+        """
+        url = normalize_proxy_url(proxy)
+        if url in self._proxies:
+            return
+        state = _Proxy(url)
+        if self._factory is not None:
+            state.transport = self._factory(url)
+        self._proxies[url] = state
+        logger.info(f"Added proxy {url}")
+
+    async def remove(self, proxy: str) -> None:
+        """
+        Stop routing requests through ``proxy`` and close its connections.
+
+        New requests avoid the proxy immediately. This coroutine waits until
+        the requests already using it have finished, then closes its
+        transport; run it as a task to avoid waiting.
+
+        Args:
+            proxy: Proxy in "host:port" or URL format.
+        """
+        state = self._proxies.pop(normalize_proxy_url(proxy), None)
+        if state is None:
+            return
+        state.draining = True
+        self._draining.add(state)
+        logger.info(f"Draining proxy {state.url} ({state.in_flight} in flight)")
+        try:
+            await state.idle.wait()
+        finally:
+            self._draining.discard(state)
+        if state.transport is not None:
+            await state.transport.aclose()
+        logger.info(f"Removed proxy {state.url}")
+
+    def _select(self, request: httpx.Request) -> _Proxy:
+        pinned = request.extensions.get(PROXY_EXTENSION)
+        if pinned is not None:
+            state = self._proxies.get(normalize_proxy_url(pinned))
+            if state is None:
+                raise ProxyError(f"Proxy {pinned} is not in the pool")
+            if not self._available(state, circuit=False):
+                raise ProxyError(f"Proxy {pinned} is quarantined")
+            return state
+        return self._choose()
+
+    def select(self, exclude: Iterable[str] = ()) -> str:
+        """
+        Choose a proxy with the pool's strategy without sending a request.
+
+        The choice is meant to be pinned to a request with the proxy
+        extension, e.g. to send a hedged request through another proxy.
+
+        Args:
+            exclude: Proxies to avoid unless no other proxy is available.
+
+        Returns:
+            URL of the chosen proxy.
+
+        Raises:
+            ProxyError: If no proxy is available.
+            CircuitOpenError: If every available proxy has an open circuit.
+        """
+        return self._choose({normalize_proxy_url(proxy) for proxy in exclude}).url
+
+    def _choose(self, exclude: Container[str] = ()) -> _Proxy:
+        candidates = [
+            state for state in self._proxies.values() if self._available(state)
+        ]
+        preferred = [state for state in candidates if state.url not in exclude]
+        candidates = preferred or candidates
+        if not candidates:
+            if not self._proxies:
+                raise ProxyError("No proxies available in the pool")
+            if any(state.quarantined_until is None for state in self._proxies.values()):
+                raise CircuitOpenError("All proxy circuits in the pool are open")
+            raise ProxyError("All proxies in the pool are quarantined")
+
+        if self.strategy == "least_in_flight":
+            # Rotate the starting point so ties are spread evenly.
+            offset = self._cursor % len(candidates)
+            self._cursor += 1
+            ordered = candidates[offset:] + candidates[:offset]
+            return min(ordered, key=lambda proxy: proxy.in_flight)
+        if self.strategy == "latency_weighted":
+            measured = [p.latency for p in candidates if p.latency is not None]
+            # Unmeasured proxies are weighted like the fastest one so they
+            # get sampled.
+            default = min(measured) if measured else 1.0
+            weights = [proxy.score(default) for proxy in candidates]
+            if not any(weights):
+                weights = [1.0] * len(candidates)
+            return random.choices(candidates, weights)[0]
+
+        state = candidates[self._cursor % len(candidates)]
+        self._cursor += 1
+        return state
+
+    def _release(self, state: _Proxy) -> None:
+        state.in_flight -= 1
+        if state.in_flight == 0:
+            state.idle.set()
+
+    def _breaker(self, state: _Proxy) -> CircuitBreaker | None:
+        if self.circuit_breakers is None:
+            return None
+        return self.circuit_breakers.get(proxy_key(state.url))
+
+    def _available(self, state: _Proxy, circuit: bool = True) -> bool:
+        if circuit:
+            breaker = self._breaker(state)
+            if breaker is not None and not breaker.available():
+                return False
+        if state.quarantined_until is None:
+            return True
+        if self.health_check is None and self._clock() >= state.quarantined_until:
+            # Without probes, a manual quarantine simply expires.
+            self._readmit(state)
+            return True
+        return False
+
+    def _record(
+        self,
+        state: _Proxy,
+        ok: bool,
+        latency: float | None = None,
+        proxy_error: bool = False,
+        probe: bool = False,
+    ) -> None:
+        """Feed the outcome of a request or probe into the proxy's health."""
+        if latency is not None:
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency += (latency - state.latency) * self.smoothing
+        state.error_rate += ((0.0 if ok else 1.0) - state.error_rate) * self.smoothing
+        if ok:
+            state.consecutive_successes += 1
+            state.consecutive_failures = 0
+        else:
+            state.consecutive_failures += 1
+            state.consecutive_successes = 0
+            state.proxy_errors += proxy_error
+
+        check = self.health_check
+        if check is None:
+            return
+        if state.quarantined_until is not None:
+            if probe and ok and self._clock() >= state.quarantined_until:
+                self._readmit(state)
+            return
+        if ok:
+            if state.consecutive_successes >= check.recovery_successes:
+                state.strikes = 0
+        elif state.consecutive_failures >= check.failure_threshold or (
+            state.attempts >= _MIN_SAMPLES and state.error_rate >= check.max_error_rate
+        ):
+            self._quarantine(state)
+
+    def _quarantine(self, state: _Proxy, seconds: float | None = None) -> None:
+        if seconds is None:
+            check = self.health_check
+            base = check.quarantine if check is not None else 10.0
+            ceiling = check.max_quarantine if check is not None else 600.0
+            seconds = min(ceiling, base * 2**state.strikes)
+        state.strikes += 1
+        state.quarantined_until = self._clock() + seconds
+        logger.warning(
+            f"Quarantined proxy {state.url} for {seconds:.1f}s "
+            f"(error rate {state.error_rate:.2f})"
+        )
+
+    def _readmit(self, state: _Proxy) -> None:
+        state.quarantined_until = None
+        state.error_rate = 0.0
+        state.consecutive_failures = 0
+        logger.info(f"Readmitted proxy {state.url}")
+
+    def quarantine(self, proxy: str, seconds: float | None = None) -> None:
+        """
+        Take ``proxy`` out of rotation.
+
+        Args:
+            proxy: Proxy in "host:port" or URL format.
+            seconds: Quarantine length. Defaults to the health check's
+                    escalating quarantine length.
+        """
+        state = self._proxies.get(normalize_proxy_url(proxy))
+        if state is not None:
+            self._quarantine(state, seconds)
+
+    async def _probe(self, state: _Proxy) -> bool:
+        """Send one health check request through ``state``'s transport."""
+        check = self.health_check
+        timeout = {name: check.timeout for name in ("connect", "read", "write", "pool")}
+        request = httpx.Request(
+            check.method, check.url, extensions={"timeout": timeout}
+        )
+        state.probes += 1
+        started = time.perf_counter()
+        try:
+            response = await state.transport.handle_async_request(request)
+            await response.aclose()
+        except httpx.HTTPError as e:
+            logger.debug(f"Health check through {state.url} failed: {e}")
+            state.probe_failures += 1
+            self._record(
+                state, False, proxy_error=isinstance(e, httpx.ProxyError), probe=True
+            )
+            return False
+
+        ok = response.status_code != 407 and response.status_code < 500
+        state.probe_failures += not ok
+        latency = time.perf_counter() - started if ok else None
+        self._record(state, ok, latency, proxy_error=not ok, probe=True)
+        return ok
+
+    async def check_health(self) -> dict[str, bool]:
+        """
+        Probe every proxy concurrently, once.
+
+        Quarantined proxies are only probed after their quarantine expires.
+
+        Returns:
+            Probe outcome keyed by proxy URL, for the proxies probed.
+
+        Raises:
+            ConfigurationError: If the pool has no health check or is not
+                attached to a client.
+        """
+        if self.health_check is None:
+            raise ConfigurationError("ProxyPool has no health_check configured")
+        if self._factory is None:
+            raise ConfigurationError("ProxyPool must be attached to a BaseClient")
+        now = self._clock()
+        states = [
+            state
+            for state in self._proxies.values()
+            if state.quarantined_until is None or now >= state.quarantined_until
+        ]
+        results = await asyncio.gather(*(self._probe(state) for state in states))
+        return {state.url: ok for state, ok in zip(states, results)}
+
+    async def _health_loop(self) -> None:
+        while True:
+            try:
+                await self.check_health()
+            except Exception as e:  # noqa: BLE001  # pragma: no cover
+                # Keep checking: one failed round must not stop the loop.
+                logger.error(f"Proxy health check round failed: {e}")
+            await asyncio.sleep(self.health_check.interval)
+
+    def _start_health_checks(self) -> None:
+        if self.health_check is not None and self._health_task is None:
+            self._health_task = asyncio.get_running_loop().create_task(
+                self._health_loop()
+            )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send ``request`` through the proxy chosen by the strategy."""
+        self._start_health_checks()
+        state = self._select(request)
+        if state.transport is None:
+            raise ConfigurationError("ProxyPool must be attached to a BaseClient")
+        breaker = self._breaker(state)
+        if breaker is not None:
+            breaker.allow()
+
+        state.in_flight += 1
+        state.requests += 1
+        state.idle.clear()
+        started = time.perf_counter()
+        try:
+            response = await state.transport.handle_async_request(request)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                state.errors += 1
+                self._record(state, False, proxy_error=isinstance(e, httpx.ProxyError))
+                logger.debug(f"Request through {state.url} failed: {e}")
+            if breaker is not None:
+                if isinstance(e, Exception) and self.circuit_breakers.is_proxy_failure(
+                    error=e
+                ):
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            self._release(state)
+            raise
+
+        if breaker is not None:
+            if self.circuit_breakers.is_proxy_failure(response=response):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        ok = response.status_code != 407
+        if not ok:
+            state.errors += 1
+        self._record(
+            state,
+            ok,
+            time.perf_counter() - started if ok else None,
+            proxy_error=not ok,
+        )
+        response.extensions[PROXY_EXTENSION] = state.url
+        response.stream = ReleasingStream(response.stream, lambda: self._release(state))
+        return response
+
+    async def aclose(self) -> None:
+        """Stop health checks and close every proxy's transport."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        states = list(self._proxies.values()) + list(self._draining)
+        self._proxies.clear()
+        for state in states:
+            if state.transport is not None:
+                await state.transport.aclose()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Snapshot of per-proxy statistics.
+
+        Returns:
+            Dictionary keyed by proxy URL with in-flight and total request
+            counts, error and ProxyError counts and rates, probe counts,
+            smoothed latency and error rate, score, quarantine state, and
+            the proxy's connection pool statistics.
+        """
+        now = self._clock()
+        return {url: state.stats(now) for url, state in self._proxies.items()}
@@ -0,0 +1,398 @@
+"""
+Client-side rate limiting for BaseClient.
+
+This module provides token buckets and a rate limiter that maps endpoint
+patterns to buckets, so ``BaseClient._fetch`` can pace requests before they
+are sent instead of discovering limits through 429 responses. In adaptive
+mode the limiter also learns from 429 and ``RateLimit-*`` headers.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+import httpx
+
+from .exceptions import ConfigurationError, RateLimitError
+from .retry import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at a fixed rate.
+
+    Waiting callers reserve their token up front, so concurrent waiters are
+    served in arrival order and never poll. A cancelled waiter gives its
+    reservation back.
+
+    Attributes:
+        rate: Tokens added per second.
+        burst: Maximum number of tokens the bucket can hold.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ConfigurationError("Rate limit rate must be > 0")
+        burst = rate if burst is None else burst
+        if burst < 1:
+            raise ConfigurationError("Rate limit burst must be >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available (negative while callers are queued)."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token without waiting.
+
+        Returns:
+            True if a token was available, False otherwise.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """
+        Reserve a token and return how long the caller must wait for it.
+
+        Args:
+            max_wait: Refuse the reservation if the wait would be longer.
+
+        Returns:
+            Seconds to wait before sending, or None if the reservation was
+            refused because of ``max_wait``.
+        """
+        self._refill()
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            return None
+        self._tokens -= 1
+        return wait
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the refill rate, keeping tokens accrued at the old rate.
+
+        Args:
+            rate: New number of tokens added per second.
+        """
+        self._refill()
+        self.rate = rate
+
+    def release(self) -> None:
+        """Return a reserved token that will not be used."""
+        self._refill()
+        self._tokens = min(self.burst, self._tokens + 1)
+
+    async def acquire(self, max_wait: float | None = None) -> bool:
+        """
+        Wait until a token is available and take it.
+
+        Args:
+            max_wait: Give up instead of waiting longer than this.
+
+        Returns:
+            True once the token is taken, False if ``max_wait`` was exceeded.
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+        return True
+
+
+@dataclass
+class RateLimit:
+    """
+    Rate limit for endpoints matching a glob pattern.
+
+    Attributes:
+        pattern: Glob matched against the endpoint passed to ``_fetch``,
+                e.g. ``"/users/*"``. ``*`` also matches ``/``.
+        rate: Requests per second.
+        burst: Maximum burst size. Defaults to ``rate``.
+    """
+
+    pattern: str
+    rate: float
+    burst: float | None = None
+
+
+class RateLimiter:
+    """
+    Per-endpoint-pattern rate limiter used by BaseClient.
+
+    Each configured pattern owns one token bucket shared by every endpoint
+    that matches it. Patterns are checked in order and the first match wins;
+    endpoints that match nothing use the ``default`` limit, or are not
+    limited at all if no default is given.
+
+    In adaptive mode the configured rates act as ceilings. Every 429
+    response or ``RateLimit-Remaining: 0`` header multiplies the matching
+    bucket's rate by ``decrease_factor``, and each healthy response adds
+    ``increase_step`` back. A ``Retry-After`` (or ``RateLimit-Reset`` on a
+    throttled response) pauses every request on the limiter until it
+    elapses, so concurrent tasks back off together.
+
+    Attributes:
+        blocking: Whether ``acquire`` waits for a token by default. When
+                 False, requests without an immediately available token
+                 raise RateLimitError.
+        max_wait: Longest time a blocking ``acquire`` may wait before
+                 raising RateLimitError. None waits indefinitely.
+        adaptive: Whether rates adapt to server feedback.
+        decrease_factor: Multiplier applied to the rate on throttling.
+        increase_step: Requests per second added after a healthy response.
+        min_rate: Lower bound for adapted rates.
+        decrease_cooldown: Minimum seconds between two decreases of the
+                          same bucket, so a burst of 429s from requests
+                          already in flight counts as a single signal.
+        max_pause: Longest client-wide pause honored from server headers.
+
+    Example:
+        >>> limiter = RateLimiter(
+        ...     [RateLimit("/users/*", rate=50, burst=100)],
+        ...     default=RateLimit("*", rate=200),
+        ...     adaptive=True,
+        ... )
+        >>> client = MyAPIClient(rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        limits: Iterable[RateLimit] = (),
+        default: RateLimit | None = None,
+        blocking: bool = True,
+        max_wait: float | None = None,
+        adaptive: bool = False,
+        decrease_factor: float = 0.5,
+        increase_step: float = 1.0,
+        min_rate: float = 0.1,
+        decrease_cooldown: float = 1.0,
+        max_pause: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < decrease_factor < 1:
+            raise ConfigurationError("decrease_factor must be between 0 and 1")
+        if increase_step < 0 or min_rate <= 0:
+            raise ConfigurationError("increase_step must be >= 0, min_rate > 0")
+        self.blocking = blocking
+        self.max_wait = max_wait
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.min_rate = min_rate
+        self.decrease_cooldown = decrease_cooldown
+        self.max_pause = max_pause
+        self._clock = clock
+        self._limits = list(limits)
+        if default is not None:
+            self._limits.append(default)
+        self._buckets = {
+            limit.pattern: TokenBucket(limit.rate, limit.burst, clock)
+            for limit in self._limits
+        }
+        self._last_decrease: dict[str, float] = {}
+        self._paused_until = 0.0
+        self.acquired = 0
+        self.rejected = 0
+        self.waited = 0.0
+        self.decreases = 0
+        self.pauses = 0
+
+    def match(self, endpoint: str) -> RateLimit | None:
+        """Return the first limit whose pattern matches ``endpoint``."""
+        for limit in self._limits:
+            if fnmatchcase(endpoint, limit.pattern):
+                return limit
+        return None
+
+    def bucket_for(self, endpoint: str) -> TokenBucket | None:
+        """Return the token bucket governing ``endpoint``, if any."""
+        limit = self.match(endpoint)
+        return None if limit is None else self._buckets[limit.pattern]
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds remaining in the current client-wide pause."""
+        return max(0.0, self._paused_until - self._clock())
+
+    def try_acquire(self, endpoint: str) -> bool:
+        """
+        Take a token for ``endpoint`` without waiting.
+
+        Args:
+            endpoint: Endpoint path as passed to ``_fetch``.
+
+        Returns:
+            True if the request may be sent now, False otherwise.
+        """
+        if self.paused_for > 0:
+            self.rejected += 1
+            return False
+        bucket = self.bucket_for(endpoint)
+        if bucket is None or bucket.try_acquire():
+            self.acquired += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def _retry_after(self, bucket: TokenBucket | None) -> float:
+        wait = 0.0 if bucket is None else max(0.0, (1 - bucket.tokens) / bucket.rate)
+        return max(self.paused_for, wait)
+
+    async def acquire(self, endpoint: str, blocking: bool | None = None) -> None:
+        """
+        Take a token for ``endpoint``, waiting if necessary.
+
+        Args:
+            endpoint: Endpoint path as passed to ``_fetch``.
+            blocking: Override the limiter's ``blocking`` setting.
+
+        Raises:
+            RateLimitError: If no token is available and the call is
+                non-blocking, or the wait would exceed ``max_wait``.
+        """
+        blocking = self.blocking if blocking is None else blocking
+        bucket = self.bucket_for(endpoint)
+
+        if not blocking:
+            if not self.try_acquire(endpoint):
+                raise RateLimitError(
+                    f"Rate limit exceeded for {endpoint}",
+                    retry_after=self._retry_after(bucket),
+                )
+            return
+
+        started = self._clock()
+        deadline = None if self.max_wait is None else started + self.max_wait
+        while (pause := self.paused_for) > 0:
+            if deadline is not None and self._clock() + pause > deadline:
+                self.rejected += 1
+                raise RateLimitError(
+                    f"Rate limiter paused for {pause:.2f}s, exceeding max_wait",
+                    retry_after=pause,
+                )
+            await asyncio.sleep(pause)
+
+        if bucket is not None:
+            remaining = None if deadline is None else deadline - self._clock()
+            if not await bucket.acquire(remaining):
+                self.rejected += 1
+                raise RateLimitError(
+                    f"Rate limit wait for {endpoint} would exceed {self.max_wait}s",
+                    retry_after=self._retry_after(bucket),
+                )
+        waited = self._clock() - started
+        if waited > 0:
+            logger.debug(f"Rate limiter delayed {endpoint} by {waited:.3f}s")
+        self.waited += waited
+        self.acquired += 1
+
+    def observe(self, endpoint: str, response: httpx.Response) -> None:
+        """
+        Feed a response back into the limiter.
+
+        Only has an effect in adaptive mode. Throttling signals shrink the
+        matching bucket's rate and may pause the whole limiter; healthy
+        responses grow the rate back towards the configured ceiling.
+
+        Args:
+            endpoint: Endpoint path as passed to ``_fetch``.
+            response: Response received for that endpoint.
+        """
+        if not self.adaptive:
+            return
+
+        status_code = response.status_code
+        exhausted = response.headers.get("RateLimit-Remaining", "").strip() == "0"
+        throttled = status_code == 429 or exhausted
+        if throttled or status_code == 503:
+            delay = parse_retry_after(response.headers)
+            if delay is not None:
+                self.pause(delay)
+
+        limit = self.match(endpoint)
+        if limit is None:
+            return
+        bucket = self._buckets[limit.pattern]
+        now = self._clock()
+        if throttled:
+            last = self._last_decrease.get(limit.pattern)
+            if last is None or now - last >= self.decrease_cooldown:
+                self._last_decrease[limit.pattern] = now
+                new_rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+                bucket.set_rate(new_rate)
+                self.decreases += 1
+                logger.info(
+                    f"Rate limit for {limit.pattern} reduced to {new_rate:.2f}/s"
+                )
+        elif status_code < 400 and bucket.rate < limit.rate:
+            bucket.set_rate(min(limit.rate, bucket.rate + self.increase_step))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pause every request on this limiter for ``seconds``.
+
+        Args:
+            seconds: Pause length, capped at ``max_pause``.
+        """
+        seconds = min(seconds, self.max_pause)
+        until = self._clock() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            self.pauses += 1
+            logger.warning(f"Rate limiter paused for {seconds:.2f}s")
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of limiter counters.
+
+        Returns:
+            Dictionary with acquired/rejected totals, total seconds spent
+            waiting, adaptive counters, and the current rate and available
+            tokens per pattern.
+        """
+        stats: dict[str, float] = {
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "waited": self.waited,
+            "decreases": self.decreases,
+            "pauses": self.pauses,
+            "paused_for": self.paused_for,
+        }
+        for pattern, bucket in self._buckets.items():
+            stats[f"rate[{pattern}]"] = bucket.rate
+            stats[f"tokens[{pattern}]"] = bucket.tokens
+        return stats
@@ -0,0 +1,260 @@
+"""
+Refresh-ahead for the BaseClient response cache.
+
+Even with stampede protection, the first read of an expired entry waits
+for a round trip. For keys read constantly that miss shows up in tail
+latency. A RefreshAhead scheduler tracks how often each cache key is read
+and refreshes the hottest entries in the background shortly before they
+expire, so their readers keep hitting the cache.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .cache import CacheEntry, ResponseCache
+from .exceptions import ConfigurationError
+from .ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+Refresh = Callable[[CacheEntry], Awaitable[Any]]
+
+
+class _Key:
+    """Access statistics of one cache key."""
+
+    __slots__ = ("refresh", "score", "updated")
+
+    def __init__(self, now: float, refresh: Refresh):
+        self.score = 0.0
+        self.updated = now
+        self.refresh = refresh
+
+
+class RefreshAhead:
+    """
+    Refresh hot cache entries before they expire.
+
+    Every read of a cached key is counted with exponential decay, so a
+    key's score reflects its recent read rate. Every ``interval`` seconds,
+    the ``top_n`` hottest keys whose entry has less than ``lead_ratio`` of
+    its lifetime left are refreshed in the background with a conditional
+    request when possible. At most ``workers`` refreshes run at once, and
+    a token bucket caps them at ``max_rate`` requests per second, so the
+    scheduler's CPU and upstream cost stay bounded.
+
+    A refresh avoided a miss when its key is read after the time the old
+    entry would have expired.
+
+    Attributes:
+        top_n: Number of hottest keys considered each round.
+        workers: Maximum concurrent refreshes.
+        lead_ratio: Fraction of an entry's lifetime before expiry at which
+                   it is refreshed.
+        interval: Seconds between scheduling rounds.
+        half_life: Seconds after which a read counts half as much.
+        max_tracked: Maximum number of keys tracked; the coldest are
+                    dropped beyond it.
+        budget: Token bucket refreshes are drawn from.
+        refreshes: Refreshes completed.
+        failures: Refreshes that raised.
+        denied: Refreshes postponed because the budget was empty.
+        misses_avoided: Reads served by a refreshed entry after the old
+                       one would have expired.
+
+    Example:
+        >>> ahead = RefreshAhead(top_n=20, workers=4, max_rate=10)
+        >>> client = MyAPIClient(cache=ResponseCache(), refresh_ahead=ahead)
+        >>> ahead.refreshed_keys()
+        {'GET https://api.example.com/config': 12}
+    """
+
+    def __init__(
+        self,
+        top_n: int = 10,
+        workers: int = 2,
+        lead_ratio: float = 0.2,
+        interval: float = 1.0,
+        max_rate: float = 5.0,
+        half_life: float = 60.0,
+        max_tracked: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if top_n < 1 or workers < 1 or max_tracked < 1:
+            raise ConfigurationError("top_n, workers and max_tracked must be >= 1")
+        if not 0 < lead_ratio < 1:
+            raise ConfigurationError("lead_ratio must be between 0 and 1")
+        if interval <= 0 or half_life <= 0:
+            raise ConfigurationError("interval and half_life must be > 0")
+        self.top_n = top_n
+        self.workers = workers
+        self.lead_ratio = lead_ratio
+        self.interval = interval
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+        self.budget = TokenBucket(max_rate, burst=max(1.0, max_rate), clock=clock)
+        self._clock = clock
+        self._cache: ResponseCache | None = None
+        self._keys: dict[str, _Key] = {}
+        self._running: dict[str, asyncio.Task[None]] = {}
+        self._replaced: dict[str, CacheEntry] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._refreshed: dict[str, int] = {}
+        self.refreshes = 0
+        self.failures = 0
+        self.denied = 0
+        self.misses_avoided = 0
+
+    def bind(self, cache: ResponseCache) -> None:
+        """
+        Set the cache whose entries are refreshed.
+
+        Called by BaseClient; a scheduler serves a single cache.
+
+        Raises:
+            ConfigurationError: If already bound to another cache.
+        """
+        if self._cache is not None and self._cache is not cache:
+            raise ConfigurationError("RefreshAhead is already bound to a cache")
+        self._cache = cache
+
+    def _decayed(self, key: _Key, now: float) -> float:
+        return key.score * 0.5 ** ((now - key.updated) / self.half_life)
+
+    def record(self, key: str, refresh: Refresh) -> None:
+        """
+        Count a read of ``key``.
+
+        Args:
+            key: Cache key that was read.
+            refresh: Refreshes the key's entry; receives the current entry
+                    so the request can be made conditional.
+        """
+        now = self._clock()
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _Key(now, refresh)
+        state.score = self._decayed(state, now) + 1.0
+        state.updated = now
+        state.refresh = refresh
+
+        replaced = self._replaced.get(key)
+        if replaced is not None and not self._cache.is_fresh(replaced):
+            # Without the refresh, this read would have found it expired.
+            del self._replaced[key]
+            self.misses_avoided += 1
+        self._start()
+
+    def hottest(self) -> list[str]:
+        """The ``top_n`` keys with the highest recent read rate."""
+        return heapq.nlargest(self.top_n, self._keys, key=self._score)
+
+    async def refresh_due(self) -> list[str]:
+        """
+        Run one scheduling round.
+
+        Returns:
+            Keys whose refresh was started.
+
+        Raises:
+            ConfigurationError: If the scheduler isn't bound to a cache.
+        """
+        if self._cache is None:
+            raise ConfigurationError("RefreshAhead is not bound to a cache")
+        self._prune()
+        started = []
+        for key in self.hottest():
+            if len(self._running) >= self.workers:
+                break
+            if key in self._running:
+                continue
+            entry = await self._cache.backend.peek(key)
+            if entry is None:
+                continue
+            lifetime = entry.expires_at - entry.stored_at
+            if lifetime <= 0 or self._cache.ttl(entry) > lifetime * self.lead_ratio:
+                continue
+            if not self.budget.try_acquire():
+                self.denied += 1
+                break
+            task = asyncio.get_running_loop().create_task(self._refresh(key, entry))
+            self._running[key] = task
+            task.add_done_callback(lambda _, key=key: self._running.pop(key, None))
+            started.append(key)
+        return started
+
+    async def _refresh(self, key: str, entry: CacheEntry) -> None:
+        try:
+            logger.debug(f"Refreshing hot key {key} ahead of expiry")
+            await self._keys[key].refresh(entry)
+        except Exception as e:  # noqa: BLE001 - nobody awaits this task
+            self.failures += 1
+            logger.warning(f"Refresh-ahead of {key} failed: {e}")
+        else:
+            self.refreshes += 1
+            self._refreshed[key] = self._refreshed.get(key, 0) + 1
+            # Uncacheable and error responses leave the old entry in place.
+            current = await self._cache.backend.peek(key)
+            if current is not None and current.stored_at != entry.stored_at:
+                self._replaced[key] = entry
+
+    def _prune(self) -> None:
+        if len(self._keys) <= self.max_tracked:
+            return
+        keep = set(heapq.nlargest(self.max_tracked, self._keys, key=self._score))
+        for key in list(self._keys):
+            if key not in keep and key not in self._running:
+                del self._keys[key]
+                self._replaced.pop(key, None)
+
+    def _score(self, key: str) -> float:
+        return self._decayed(self._keys[key], self._clock())
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.refresh_due()
+            except Exception as e:  # noqa: BLE001  # pragma: no cover
+                # Keep scheduling: one failed round must not stop the loop.
+                logger.error(f"Refresh-ahead round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def _start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def aclose(self) -> None:
+        """Stop scheduling and cancel running refreshes."""
+        tasks = list(self._running.values())
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def refreshed_keys(self) -> dict[str, int]:
+        """Number of completed refreshes per key."""
+        return dict(self._refreshed)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of refresh-ahead counters.
+
+        Returns:
+            Dictionary with tracked keys, running refreshes, completed and
+            failed refreshes, refreshes denied by the budget, and misses
+            avoided.
+        """
+        return {
+            "tracked": len(self._keys),
+            "running": len(self._running),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "denied": self.denied,
+            "misses_avoided": self.misses_avoided,
+        }
@@ -0,0 +1,353 @@
+"""
+DNS resolution for BaseClient connections.
+
+httpcore resolves the host of every new connection through the blocking
+system resolver, run in a worker thread. This module provides a pluggable
+resolver layer: a ``SystemResolver`` that performs the same lookup, a
+``CachingResolver`` that keeps answers in memory for their TTL, and the
+network backend that routes httpcore's connections through a resolver.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import httpcore
+
+from .exceptions import ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DNSResult:
+    """
+    Addresses returned by a resolver.
+
+    Attributes:
+        addresses: IP addresses in preference order.
+        ttl: Seconds the answer may be cached, if the resolver knows it.
+    """
+
+    addresses: tuple[str, ...]
+    ttl: float | None = None
+
+
+class Resolver(ABC):
+    """
+    Base class for host name resolvers used by BaseClient.
+
+    Subclasses implement ``resolve``. A resolver that knows record TTLs (for
+    example one backed by a DNS library) should report them in the result
+    so caching layers can honor them.
+    """
+
+    @abstractmethod
+    async def resolve(self, host: str, port: int) -> DNSResult:
+        """
+        Resolve ``host`` to IP addresses.
+
+        Args:
+            host: Host name to resolve.
+            port: Port the caller will connect to.
+
+        Returns:
+            The resolved addresses.
+
+        Raises:
+            OSError: If the name cannot be resolved.
+        """
+
+    async def aclose(self) -> None:
+        """Release resources held by the resolver."""
+
+
+class SystemResolver(Resolver):
+    """Resolver using the operating system's ``getaddrinfo``."""
+
+    def __init__(self, family: int = socket.AF_UNSPEC):
+        self.family = family
+
+    async def resolve(self, host: str, port: int) -> DNSResult:
+        """Resolve ``host`` with ``getaddrinfo`` in the default executor."""
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, family=self.family, type=socket.SOCK_STREAM
+        )
+        addresses = dict.fromkeys(str(info[4][0]) for info in infos)
+        return DNSResult(tuple(addresses))
+
+
+@dataclass
+class _Entry:
+    result: DNSResult | None
+    error: OSError | None
+    created: float
+    expires: float
+    refresh_at: float
+
+
+class CachingResolver(Resolver):
+    """
+    In-process DNS cache in front of another resolver.
+
+    Answers are kept for their TTL (or ``ttl`` when the upstream resolver
+    does not report one, capped at ``max_ttl``). Failed lookups are cached
+    for ``negative_ttl`` so a dead host name doesn't cost a lookup per
+    request. Once ``refresh_ratio`` of an entry's lifetime has passed, the
+    next lookup still returns the cached answer but refreshes it in the
+    background, so hot names never expire on the request path. Concurrent
+    misses for the same name share one upstream lookup.
+
+    One instance can be shared by any number of clients running on the
+    same event loop.
+
+    Attributes:
+        resolver: Upstream resolver queried on misses and refreshes.
+        ttl: Default lifetime of an answer in seconds.
+        max_ttl: Upper bound applied to upstream TTLs.
+        negative_ttl: Lifetime of a cached failure in seconds.
+        refresh_ratio: Fraction of the lifetime after which an entry is
+                      refreshed in the background.
+        max_entries: Maximum number of cached names.
+
+    Example:
+        >>> resolver = CachingResolver(ttl=120)
+        >>> clients = [MyAPIClient(resolver=resolver) for _ in range(10)]
+        >>> resolver.stats()["hits"]
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver | None = None,
+        ttl: float = 60.0,
+        max_ttl: float = 3600.0,
+        negative_ttl: float = 5.0,
+        refresh_ratio: float = 0.8,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < refresh_ratio <= 1:
+            raise ConfigurationError("refresh_ratio must be between 0 and 1")
+        self.resolver = resolver if resolver is not None else SystemResolver()
+        self.ttl = ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_ratio = refresh_ratio
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: dict[tuple[str, int], _Entry] = {}
+        self._pending: dict[tuple[str, int], asyncio.Task[_Entry]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def resolve(self, host: str, port: int) -> DNSResult:
+        """
+        Return the cached answer for ``host``, resolving it on a miss.
+
+        Raises:
+            OSError: If the name cannot be resolved (possibly cached).
+        """
+        key = (host.lower(), port)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.expires:
+            if entry.error is not None:
+                self.negative_hits += 1
+                raise entry.error
+            self.hits += 1
+            if now >= entry.refresh_at and key not in self._pending:
+                self._refresh(key)
+            return entry.result
+
+        self.misses += 1
+        entry = await asyncio.shield(self._lookup(key))
+        if entry.error is not None:
+            raise entry.error
+        return entry.result
+
+    def invalidate(self, host: str | None = None) -> None:
+        """
+        Drop cached answers.
+
+        Args:
+            host: Only forget this name. None clears the whole cache.
+        """
+        if host is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == host.lower()]:
+            del self._entries[key]
+
+    def _lookup(self, key: tuple[str, int]) -> asyncio.Task[_Entry]:
+        """
+        Return the upstream lookup task for ``key``, starting one if needed.
+
+        Callers await the task through ``asyncio.shield`` so a cancelled
+        caller never cancels a lookup other callers are waiting on.
+        """
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._query(key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return task
+
+    async def _query(self, key: tuple[str, int]) -> _Entry:
+        """Query the upstream resolver and cache the answer or failure."""
+        host, port = key
+        try:
+            result = await self.resolver.resolve(host, port)
+        except OSError as e:
+            self.errors += 1
+            logger.debug(f"DNS lookup for {host} failed: {e}")
+            now = self._clock()
+            expires = now + self.negative_ttl
+            entry = _Entry(None, e, now, expires, expires)
+            self._store(key, entry)
+            return entry
+
+        ttl = self.ttl if result.ttl is None else min(result.ttl, self.max_ttl)
+        now = self._clock()
+        logger.debug(f"Resolved {host} to {', '.join(result.addresses)}")
+        entry = _Entry(result, None, now, now + ttl, now + ttl * self.refresh_ratio)
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key: tuple[str, int], entry: _Entry) -> None:
+        if entry.expires <= entry.created:
+            return
+        previous = self._entries.get(key)
+        if (
+            entry.error is not None
+            and previous is not None
+            and previous.error is None
+            and entry.created < previous.expires
+        ):
+            # A failed refresh keeps serving the previous answer until it
+            # expires, retrying after negative_ttl instead of every lookup.
+            previous.refresh_at = min(previous.expires, entry.expires)
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            # Dicts preserve insertion order: drop the oldest answer.
+            del self._entries[next(iter(self._entries))]
+
+    def _refresh(self, key: tuple[str, int]) -> None:
+        """Refresh ``key`` in the background while its answer is served."""
+        self.refreshes += 1
+        self._lookup(key)
+
+    async def aclose(self) -> None:
+        """Cancel pending lookups and close the upstream resolver."""
+        tasks = list(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.resolver.aclose()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of cache counters.
+
+        Returns:
+            Dictionary with hit, miss, negative hit, background refresh and
+            lookup error totals, the hit ratio and the number of entries.
+        """
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class ResolvingBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves host names through a Resolver.
+
+    TCP connections are opened to the resolved addresses in order, moving
+    on to the next address when one refuses the connection. TLS still uses
+    the original host name for SNI and certificate checks, since httpcore
+    takes those from the request origin rather than the connected address.
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        backend: httpcore.AsyncNetworkBackend | None = None,
+    ):
+        self.resolver = resolver
+        self.backend = backend if backend is not None else httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Resolve ``host`` and connect to the first reachable address."""
+        if _is_ip_address(host):
+            addresses: tuple[str, ...] = (host,)
+        else:
+            try:
+                addresses = (await self.resolver.resolve(host, port)).addresses
+            except OSError as e:
+                raise httpcore.ConnectError(str(e)) from e
+            if not addresses:
+                raise httpcore.ConnectError(f"No addresses found for {host}")
+
+        error: httpcore.ConnectError | None = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except httpcore.ConnectError as e:
+                logger.debug(f"Connecting to {host} via {address} failed: {e}")
+                error = e
+        raise error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to a Unix socket (no resolution involved)."""
+        return await self.backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
@@ -0,0 +1,95 @@
+"""
+Response metadata for BaseClient.
+
+``BaseClient._fetch`` returns parsed JSON, which leaves no room for details
+about how the response was obtained. This module records those details in
+a context variable so callers can inspect them after the call returns.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import httpx
+
+from .proxypool import PROXY_EXTENSION
+
+
+@dataclass(frozen=True)
+class ResponseInfo:
+    """
+    Details about the most recent response received by the current task.
+
+    Attributes:
+        url: Final request URL.
+        status_code: HTTP status code.
+        http_version: Negotiated protocol, e.g. ``"HTTP/1.1"`` or ``"HTTP/2"``.
+        elapsed: Seconds between sending the request and reading the body.
+        proxy: Proxy of a ProxyPool the response came through, if any.
+        cached: Whether the body was served from the response cache, either
+               as a fresh hit or after a ``304 Not Modified`` revalidation
+               (``status_code`` is then 304).
+        stale: Whether the cached body was served after it expired, while
+              being revalidated or because the request failed.
+    """
+
+    url: str
+    status_code: int
+    http_version: str
+    elapsed: float
+    proxy: str | None = None
+    cached: bool = False
+    stale: bool = False
+
+    @classmethod
+    def from_response(cls, response: httpx.Response) -> "ResponseInfo":
+        """Build the metadata for an httpx response."""
+        try:
+            elapsed = response.elapsed.total_seconds()
+        except RuntimeError:
+            # The body has not been read yet (streaming responses).
+            elapsed = 0.0
+        return cls(
+            url=str(response.url),
+            status_code=response.status_code,
+            http_version=response.http_version,
+            elapsed=elapsed,
+            proxy=response.extensions.get(PROXY_EXTENSION),
+        )
+
+
+_last_response_info: ContextVar[ResponseInfo | None] = ContextVar(
+    "ravexclient_last_response_info", default=None
+)
+
+
+def last_response_info() -> ResponseInfo | None:
+    """
+    Return metadata for the last response received in the current task.
+
+    Each asyncio task sees only its own responses, so concurrent requests
+    never overwrite each other's metadata.
+
+    Returns:
+        The ResponseInfo recorded by the last request, or None.
+
+    Example:
+        >>> data = await client.get_user(1)
+        >>> last_response_info().http_version
+        'HTTP/2'
+    """
+    return _last_response_info.get()
+
+
+def record_response(response: httpx.Response | ResponseInfo) -> ResponseInfo:
+    """
+    Record metadata for ``response`` in the current task and return it.
+
+    A ResponseInfo is recorded as is, e.g. to hand metadata captured in
+    another task over to the caller.
+    """
+    if isinstance(response, ResponseInfo):
+        info = response
+    else:
+        info = ResponseInfo.from_response(response)
+    _last_response_info.set(info)
+    return info
@@ -0,0 +1,297 @@
+"""
+Retry policies for BaseClient.
+
+This module provides a configurable retry policy that ``BaseClient._fetch``
+uses to decide whether a failed request should be attempted again and how
+long to wait before doing so, plus a client-wide retry budget that stops
+retries from amplifying load during an outage.
+"""
+
+import random
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .exceptions import ConfigurationError
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+"""HTTP methods that are safe to retry by default (RFC 9110, section 9.2.2)."""
+
+JITTER_MODES = ("none", "full", "decorrelated")
+
+
+def parse_retry_after(headers: httpx.Headers, now: float | None = None) -> float | None:
+    """
+    Extract the server-requested delay from response headers.
+
+    ``Retry-After`` is checked first and may be either a number of seconds or
+    an HTTP date. ``RateLimit-Reset`` (and the common ``X-RateLimit-Reset``
+    variant) is used as a fallback; values that look like a Unix timestamp
+    are converted to a delay relative to ``now``.
+
+    Args:
+        headers: Response headers.
+        now: Current Unix time. Defaults to ``time.time()``.
+
+    Returns:
+        Delay in seconds (never negative), or None if no usable header exists.
+    """
+    now = time.time() if now is None else now
+
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        retry_after = retry_after.strip()
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            when = None
+        if when is not None:
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max(0.0, when.timestamp() - now)
+
+    for name in ("RateLimit-Reset", "X-RateLimit-Reset"):
+        reset = headers.get(name)
+        if reset is None:
+            continue
+        try:
+            value = float(reset.strip())
+        except ValueError:
+            continue
+        # Large values are absolute epoch timestamps rather than deltas.
+        if value > 10**9:
+            value -= now
+        return max(0.0, value)
+
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Configuration for automatic retries inside ``BaseClient._fetch``.
+
+    Attributes:
+        max_retries: Maximum number of retries after the first attempt.
+        base_delay: Initial backoff delay in seconds.
+        max_delay: Upper bound for any single backoff delay in seconds.
+        jitter: Backoff strategy. One of ``"none"`` (plain exponential),
+               ``"full"`` (uniform between 0 and the exponential delay) or
+               ``"decorrelated"`` (AWS-style decorrelated jitter).
+        retry_statuses: HTTP status codes that are considered retryable.
+        retry_exceptions: httpx exception types that are considered retryable.
+        retry_methods: HTTP methods that may be retried. Other methods are
+                      only retried when the caller explicitly asks for it.
+        respect_retry_after: Honor ``Retry-After``/``RateLimit-Reset`` headers.
+        max_retry_after: Longest server-requested delay that will be honored.
+                        Responses asking for a longer wait are not retried.
+
+    Example:
+        >>> policy = RetryPolicy(max_retries=5, base_delay=0.2, max_delay=10.0)
+        >>> client = MyAPIClient(retry_policy=policy)
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 30.0
+    jitter: str = "decorrelated"
+    retry_statuses: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+    retry_exceptions: tuple[type[Exception], ...] = (
+        httpx.TimeoutException,
+        httpx.NetworkError,
+        httpx.RemoteProtocolError,
+        httpx.ProxyError,
+    )
+    retry_methods: frozenset[str] = IDEMPOTENT_METHODS
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def __post_init__(self) -> None:
+        if self.max_retries < 0:
+            raise ConfigurationError("max_retries must be >= 0")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ConfigurationError("Retry delays must be >= 0")
+        if self.jitter not in JITTER_MODES:
+            raise ConfigurationError(
+                f"Invalid jitter mode {self.jitter!r}, expected one of {JITTER_MODES}"
+            )
+        self.retry_statuses = frozenset(self.retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in self.retry_methods)
+
+    def is_retryable(
+        self,
+        method: str,
+        attempt: int,
+        exception: Exception,
+        force: bool = False,
+    ) -> bool:
+        """
+        Decide whether a failed attempt may be retried.
+
+        Args:
+            method: HTTP method of the request.
+            attempt: Zero-based index of the attempt that just failed.
+            exception: The exception raised by httpx for that attempt.
+            force: Retry even if the method is not in ``retry_methods``.
+
+        Returns:
+            True if another attempt should be made.
+        """
+        if attempt >= self.max_retries:
+            return False
+        if not force and method.upper() not in self.retry_methods:
+            return False
+        if isinstance(exception, httpx.HTTPStatusError):
+            return exception.response.status_code in self.retry_statuses
+        return isinstance(exception, self.retry_exceptions)
+
+    def backoff(self, attempt: int, previous: float | None = None) -> float:
+        """
+        Compute the backoff delay before the next attempt.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            previous: Delay used before this attempt, for decorrelated jitter.
+
+        Returns:
+            Delay in seconds.
+        """
+        exponential = min(self.max_delay, self.base_delay * (2**attempt))
+        if self.jitter == "none":
+            return exponential
+        if self.jitter == "full":
+            return random.uniform(0, exponential)
+        previous = self.base_delay if previous is None else previous
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def next_delay(
+        self,
+        attempt: int,
+        exception: Exception,
+        previous: float | None = None,
+    ) -> float | None:
+        """
+        Compute the delay before retrying, honoring server hints.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+            exception: The exception raised by httpx for that attempt.
+            previous: Delay used before this attempt.
+
+        Returns:
+            Delay in seconds, or None if the server asked for a longer wait
+            than ``max_retry_after`` allows.
+        """
+        delay = self.backoff(attempt, previous)
+        if self.respect_retry_after and isinstance(exception, httpx.HTTPStatusError):
+            server_delay = parse_retry_after(exception.response.headers)
+            if server_delay is not None:
+                if server_delay > self.max_retry_after:
+                    return None
+                delay = max(delay, server_delay)
+        return delay
+
+
+class RetryBudget:
+    """
+    Client-wide cap on the share of traffic that may be retries.
+
+    The budget tracks first attempts and retries over a sliding window.
+    A retry is allowed while the number of retries in the window stays
+    below ``ratio`` times the number of requests in the window, plus a
+    small reserve of ``min_retries_per_second`` so that low-traffic
+    clients can still retry.
+
+    Attributes:
+        ratio: Maximum retries per request over the window (0.1 = 10%).
+        min_retries_per_second: Reserve of retries always available.
+        window: Length of the sliding window in seconds.
+        allowed: Number of retries granted so far.
+        denied: Number of retries refused so far.
+
+    Example:
+        >>> budget = RetryBudget(ratio=0.1, window=10.0)
+        >>> client = MyAPIClient(retry_policy=RetryPolicy(), retry_budget=budget)
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ratio < 0 or min_retries_per_second < 0:
+            raise ConfigurationError("Retry budget ratio and reserve must be >= 0")
+        if window <= 0:
+            raise ConfigurationError("Retry budget window must be > 0")
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window = window
+        self._clock = clock
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self.allowed = 0
+        self.denied = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] <= cutoff:
+                events.popleft()
+
+    @property
+    def capacity(self) -> float:
+        """Number of retries currently permitted within the window."""
+        self._trim(self._clock())
+        return self.min_retries_per_second * self.window + self.ratio * len(
+            self._requests
+        )
+
+    def record_request(self) -> None:
+        """Record a first attempt, which earns budget for later retries."""
+        now = self._clock()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_acquire(self) -> bool:
+        """
+        Consume budget for one retry.
+
+        Returns:
+            True if the retry may proceed, False if the budget is exhausted.
+        """
+        # Reading capacity trims expired retries before they are counted.
+        capacity = self.capacity
+        if len(self._retries) < capacity:
+            self._retries.append(self._clock())
+            self.allowed += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of the budget counters.
+
+        Returns:
+            Dictionary with allowed/denied totals and current window usage.
+        """
+        capacity = self.capacity
+        return {
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "requests_in_window": len(self._requests),
+            "retries_in_window": len(self._retries),
+            "capacity": capacity,
+        }
@@ -0,0 +1,170 @@
+"""
+Request coalescing for BaseClient.
+
+When many coroutines ask for the same resource at the same moment, each of
+them normally pays for a full round trip. A SingleFlight group lets the
+first caller perform the request while identical callers that arrive before
+it completes wait for the same result.
+"""
+
+import asyncio
+import copy
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight request and the callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task[Any]):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one in-flight request between identical concurrent calls.
+
+    Calls are identical when they have the same method, URL, query
+    parameters and values for the headers in ``vary_headers``. The first
+    call runs the request; later ones wait for its result. Every caller but
+    one receives a deep copy of the result (unless ``copy_results`` is
+    False), so callers can mutate what they get. Errors are raised to every
+    waiter.
+
+    Each waiter can be cancelled on its own: the shared request keeps
+    running for the others and is only cancelled when nobody is waiting for
+    it anymore. Results are not cached; a call arriving after the request
+    completed starts a new one.
+
+    Attributes:
+        methods: HTTP methods that are coalesced.
+        vary_headers: Request headers that distinguish otherwise identical
+                     calls, e.g. credentials or content negotiation.
+        copy_results: Give each caller its own deep copy of the result.
+        leaders: Calls that performed a request.
+        followers: Calls that shared another call's request.
+
+    Example:
+        >>> client = MyAPIClient(single_flight=SingleFlight())
+        >>> await asyncio.gather(*(client.get_user(1) for _ in range(100)))
+        >>> client.single_flight.stats()["followers"]
+        99
+    """
+
+    def __init__(
+        self,
+        methods: Iterable[str] = ("GET", "HEAD"),
+        vary_headers: Iterable[str] = (
+            "Authorization",
+            "Cookie",
+            "Accept",
+            "Accept-Language",
+        ),
+        copy_results: bool = True,
+    ):
+        self.methods = frozenset(m.upper() for m in methods)
+        self.vary_headers = tuple(dict.fromkeys(h.lower() for h in vary_headers))
+        self.copy_results = copy_results
+        self._calls: dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def applies_to(self, method: str) -> bool:
+        """Whether calls with ``method`` are coalesced."""
+        return method.upper() in self.methods
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> Hashable:
+        """
+        Build the coalescing key of a call.
+
+        Args:
+            method: HTTP method.
+            url: Fully qualified request URL.
+            params: Query parameters, merged into the URL.
+            headers: Request headers; only ``vary_headers`` are used.
+
+        Returns:
+            A hashable key equal for identical calls.
+        """
+        merged = httpx.URL(url, params=params) if params else httpx.URL(url)
+        lowered = httpx.Headers(headers or {})
+        return (
+            method.upper(),
+            str(merged),
+            tuple(lowered.get(name) for name in self.vary_headers),
+        )
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` unless an identical call is in flight, and return its result.
+
+        Args:
+            key: Coalescing key, usually from ``key``.
+            fn: Performs the request when this call leads.
+
+        Returns:
+            The result of the shared call.
+        """
+        call = self._calls.get(key)
+        leader = call is None
+        if leader:
+            call = _Call(asyncio.get_running_loop().create_task(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.followers += 1
+            logger.debug(f"Joining in-flight request {key}")
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is waiting anymore: stop the request.
+                call.task.cancel()
+            raise
+        except BaseException:
+            call.waiters -= 1
+            raise
+        call.waiters -= 1
+        if call.waiters == 0 or not self.copy_results:
+            # The last waiter to resume can take the original.
+            return result
+        return copy.deepcopy(result)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of coalescing counters.
+
+        Returns:
+            Dictionary with leader and follower totals, the share of calls
+            that were coalesced, and the number of requests in flight.
+        """
+        calls = self.leaders + self.followers
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "coalesced_ratio": self.followers / calls if calls else 0.0,
+        }
@@ -0,0 +1,335 @@
+"""
+Streamed response bodies for BaseClient.
+
+``BaseClient._fetch`` reads and parses the whole body before returning, so
+large responses sit in memory at once. ``BaseClient._stream`` instead hands
+out a ``ResponseStream`` that reads the body from the socket chunk by chunk
+as bytes, text or lines, within an optional size limit. ``JSONArrayParser``
+turns such a stream into the items of a JSON array, one at a time, for
+``BaseClient._iter_json``.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import AsyncIterator, Callable, Generator, Iterator, Sequence
+from typing import Any
+
+import httpx
+
+from .exceptions import RavexClientError, ResponseTooLargeError
+
+_NEWLINE = re.compile(r"\r\n|\r|\n")
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that can follow a decoded number within a longer number; ""
+# is the end of the input.
+_NUMBER_TAIL = ("", *"0123456789.eE+-")
+
+# Yielded by JSONArrayParser's internal generator when it needs more input.
+_MORE = object()
+
+
+class ResponseStream:
+    """
+    Body of a response read incrementally from the connection.
+
+    The body can be iterated once, with ``iter_bytes``, ``iter_text`` or
+    ``iter_lines``. Chunks are decoded according to ``Content-Encoding``
+    and counted against ``max_bytes``; a body declaring or reaching a
+    larger size raises ResponseTooLargeError and closes the response.
+    Transport errors while reading are raised as RavexClient exceptions.
+
+    Attributes:
+        response: The underlying httpx response.
+        max_bytes: Maximum decoded body size, or None for no limit.
+        bytes_read: Decoded bytes read so far.
+
+    Example:
+        >>> async with client._stream("GET", "/export", max_bytes=2**30) as body:
+        ...     async for line in body.iter_lines():
+        ...         process(line)
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        max_bytes: int | None = None,
+        map_error: Callable[[Exception], RavexClientError] | None = None,
+    ):
+        self.response = response
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self._map_error = map_error
+
+    @property
+    def status_code(self) -> int:
+        """HTTP status code of the response."""
+        return self.response.status_code
+
+    @property
+    def headers(self) -> httpx.Headers:
+        """Headers of the response."""
+        return self.response.headers
+
+    @property
+    def declared_size(self) -> int | None:
+        """Body size announced by ``Content-Length``, if any."""
+        try:
+            return int(self.response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return None
+
+    def fits(self) -> bool:
+        """Whether the declared body size is within ``max_bytes``."""
+        declared = self.declared_size
+        return self.max_bytes is None or (
+            declared is not None and declared <= self.max_bytes
+        )
+
+    async def _too_large(self) -> ResponseTooLargeError:
+        await self.response.aclose()
+        return ResponseTooLargeError(
+            f"Response body exceeds {self.max_bytes} bytes",
+            status_code=self.status_code,
+            max_bytes=self.max_bytes,
+        )
+
+    async def check_size(self) -> None:
+        """
+        Refuse a body whose declared size exceeds ``max_bytes``.
+
+        Raises:
+            ResponseTooLargeError: If ``Content-Length`` is over the limit.
+        """
+        if not self.fits() and self.declared_size is not None:
+            raise await self._too_large()
+
+    async def iter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        """
+        Yield the decoded body in chunks as they arrive.
+
+        Args:
+            chunk_size: Size of the yielded chunks. Defaults to the sizes
+                       received from the connection.
+
+        Raises:
+            ResponseTooLargeError: If the body exceeds ``max_bytes``.
+            HTTPError: If the connection fails while reading.
+        """
+        try:
+            async for chunk in self.response.aiter_bytes(chunk_size):
+                self.bytes_read += len(chunk)
+                if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+                    raise await self._too_large()
+                yield chunk
+        except httpx.HTTPError as e:
+            if self._map_error is None:
+                raise
+            raise self._map_error(e) from e
+
+    async def iter_text(self, chunk_size: int | None = None) -> AsyncIterator[str]:
+        """
+        Yield the body decoded as text, using the response's charset.
+
+        Multi-byte characters split between chunks are decoded whole.
+        """
+        decoder = codecs.getincrementaldecoder(self.response.encoding or "utf-8")(
+            errors="replace"
+        )
+        async for chunk in self.iter_bytes(chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    async def iter_lines(self) -> AsyncIterator[str]:
+        """Yield the body line by line, without line endings."""
+        pending = ""
+        async for text in self.iter_text():
+            pending += text
+            # A trailing "\r" may be the first half of a "\r\n".
+            held = "\r" if pending.endswith("\r") else ""
+            lines = _NEWLINE.split(pending[: len(pending) - len(held)])
+            pending = lines.pop() + held
+            for line in lines:
+                yield line
+        if pending:
+            yield pending.removesuffix("\r")
+
+
+class JSONArrayParser:
+    """
+    Incremental parser yielding the items of a JSON array as text arrives.
+
+    The array is the whole document, or the value at ``path`` inside it.
+    Text is passed in with ``feed`` as it is received, and every item
+    completed by it is decoded with ``json`` and yielded, so only the
+    current item is held in memory rather than the whole array. Values
+    before the array at ``path`` are decoded and discarded; anything
+    after the array is ignored.
+
+    Attributes:
+        path: Keys (and array indexes) leading to the array.
+        items: Number of items yielded so far.
+
+    Example:
+        >>> parser = JSONArrayParser("data.items")
+        >>> list(parser.feed('{"data": {"items": [{"id": 1}, {"i'))
+        [{'id': 1}]
+        >>> list(parser.feed('d": 2}]}}'))
+        [{'id': 2}]
+        >>> parser.done
+        True
+    """
+
+    def __init__(self, path: str | Sequence[str | int] | None = None):
+        if isinstance(path, str):
+            path = path.split(".") if path else []
+        self.path = list(path or [])
+        self.items = 0
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._closed = False
+        self._parser = self._parse()
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the end of the array has been reached."""
+        return self._done
+
+    def feed(self, text: str) -> Iterator[Any]:
+        """
+        Add ``text`` to the input and yield the items it completes.
+
+        Raises:
+            ValueError: If the input isn't valid JSON or has no array at
+                       ``path``.
+        """
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return self._drain()
+
+    def close(self) -> Iterator[Any]:
+        """
+        Mark the end of the input and yield the remaining items.
+
+        Raises:
+            ValueError: If the input ends before the array does.
+        """
+        self._closed = True
+        return self._drain()
+
+    def _drain(self) -> Iterator[Any]:
+        for value in self._parser:
+            if value is _MORE:
+                return
+            self.items += 1
+            yield value
+        self._done = True
+
+    def _parse(self) -> Generator[Any, None, None]:
+        for segment in self.path:
+            yield from self._enter(segment)
+        yield from self._skip_whitespace()
+        if self._buffer[self._pos] != "[":
+            raise self._error("Expected a JSON array")
+        self._pos += 1
+        yield from self._skip_whitespace()
+        if self._buffer[self._pos] == "]":
+            return
+        while True:
+            item = yield from self._decode()
+            yield item
+            if (yield from self._delimiter("]")) == "]":
+                return
+            yield from self._skip_whitespace()
+
+    def _enter(self, segment: str | int) -> Generator[Any, None, None]:
+        """Move the cursor to the member ``segment`` of the current value."""
+        yield from self._skip_whitespace()
+        container = self._buffer[self._pos]
+        self._pos += 1
+        if container == "{":
+            yield from self._skip_whitespace()
+            if self._buffer[self._pos] == "}":
+                raise self._not_found(segment)
+            while True:
+                if self._buffer[self._pos] != '"':
+                    raise self._error("Expected a member name")
+                key = yield from self._decode()
+                yield from self._delimiter(":")
+                yield from self._skip_whitespace()
+                if key == str(segment):
+                    return
+                yield from self._decode()
+                if (yield from self._delimiter("}")) == "}":
+                    raise self._not_found(segment)
+                yield from self._skip_whitespace()
+        if container == "[" and str(segment).isdigit():
+            for _ in range(int(segment)):
+                yield from self._skip_whitespace()
+                if self._buffer[self._pos] == "]":
+                    raise self._not_found(segment)
+                yield from self._decode()
+                if (yield from self._delimiter("]")) == "]":
+                    raise self._not_found(segment)
+            yield from self._skip_whitespace()
+            if self._buffer[self._pos] == "]":
+                raise self._not_found(segment)
+            return
+        raise self._not_found(segment)
+
+    def _decode(self) -> Generator[Any, None, Any]:
+        """Decode the value at the cursor, waiting for it to arrive whole."""
+        retry_at = 0
+        while True:
+            available = len(self._buffer) - self._pos
+            if available >= retry_at or self._closed:
+                try:
+                    value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                except json.JSONDecodeError:
+                    if self._closed:
+                        raise
+                else:
+                    # A number at the end of the input may continue, e.g.
+                    # "1." decodes as 1 until the "5" of "1.5" arrives.
+                    partial = isinstance(value, (int, float)) and (
+                        self._buffer[end : end + 1] in _NUMBER_TAIL
+                    )
+                    if not partial or self._closed:
+                        self._pos = end
+                        return value
+                # Wait for the input to double before decoding again, so a
+                # large value arriving in small chunks costs linear time.
+                retry_at = 2 * available
+            yield _MORE
+
+    def _delimiter(self, closing: str) -> Generator[Any, None, str]:
+        """Consume a "," or ``closing`` after a value (or ":" after a key)."""
+        yield from self._skip_whitespace()
+        char = self._buffer[self._pos]
+        if char != closing and (char != "," or closing == ":"):
+            expected = '":"' if closing == ":" else f'"," or "{closing}"'
+            raise self._error(f"Expected {expected}")
+        self._pos += 1
+        return char
+
+    def _skip_whitespace(self) -> Generator[Any, None, None]:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return
+            if self._closed:
+                raise self._error("Unexpected end of JSON input")
+            yield _MORE
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def _not_found(self, segment: str | int) -> ValueError:
+        path = ".".join(str(part) for part in self.path)
+        return ValueError(f"No {segment!r} member on JSON path {path!r}")
@@ -0,0 +1,436 @@
+"""
+Instrumented HTTP transport for BaseClient.
+
+This module provides an httpx transport that records connection pool
+telemetry: how long requests wait for a connection, how many connections
+are opened versus reused, and how many idle and active connections the
+pool currently holds, and optionally caps concurrent HTTP/2 streams per
+origin. It also provides a registry that lets many client
+instances share one transport, and a cache of SSL contexts so that the CA
+bundle is loaded once per distinct TLS configuration.
+"""
+
+import asyncio
+import logging
+import os
+import ssl
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from typing import Any
+
+import httpcore
+import httpx
+
+from .exceptions import ConfigurationError
+from .resolver import Resolver, ResolvingBackend
+
+logger = logging.getLogger(__name__)
+
+
+_ssl_contexts: dict[Hashable, ssl.SSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def get_ssl_context(
+    verify: ssl.SSLContext | str | bool = True,
+    cert: Any = None,
+    trust_env: bool = True,
+    http2: bool = False,
+) -> ssl.SSLContext:
+    """
+    Return a shared SSL context for the given TLS settings.
+
+    Building a context loads the whole CA bundle, which is the most
+    expensive part of creating an httpx client. Contexts are cached per
+    distinct ``verify``/``cert`` configuration (and per ``http2`` flag,
+    because httpcore sets ALPN protocols on the context it is given).
+    Caller-supplied ``ssl.SSLContext`` objects are returned unchanged.
+
+    Args:
+        verify: True, False, a CA bundle path, or an SSLContext.
+        cert: Client certificate file or (cert, key[, password]) tuple.
+        trust_env: Honor ``SSL_CERT_FILE``/``SSL_CERT_DIR``.
+        http2: Whether the context will be used by an HTTP/2 transport.
+
+    Returns:
+        An SSL context that may be shared between transports.
+    """
+    if isinstance(verify, ssl.SSLContext):
+        return verify
+
+    env = (
+        (os.environ.get("SSL_CERT_FILE"), os.environ.get("SSL_CERT_DIR"))
+        if trust_env
+        else None
+    )
+    key = (verify, tuple(cert) if isinstance(cert, list) else cert, env, http2)
+    with _ssl_contexts_lock:
+        context = _ssl_contexts.get(key)
+        if context is None:
+            context = httpx.create_ssl_context(
+                verify=verify, cert=cert, trust_env=trust_env
+            )
+            _ssl_contexts[key] = context
+            logger.debug("Created SSL context")
+    return context
+
+
+def clear_ssl_context_cache() -> None:
+    """Forget cached SSL contexts, e.g. after rotating certificates on disk."""
+    with _ssl_contexts_lock:
+        _ssl_contexts.clear()
+
+
+# httpx.AsyncHTTPTransport's default pool limits.
+_DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def _connection_pool(
+    network_backend: httpcore.AsyncNetworkBackend,
+    verify: ssl.SSLContext | str | bool = True,
+    cert: Any = None,
+    trust_env: bool = True,
+    http1: bool = True,
+    http2: bool = False,
+    limits: httpx.Limits = _DEFAULT_LIMITS,
+    proxy: str | httpx.URL | httpx.Proxy | None = None,
+    **options: Any,
+) -> httpcore.AsyncConnectionPool:
+    """
+    Build the pool httpx.AsyncHTTPTransport would, on ``network_backend``.
+
+    Takes the AsyncHTTPTransport arguments; ``options`` (uds, local_address,
+    retries, socket_options) are passed to the pool as they are.
+
+    Raises:
+        ConfigurationError: If the proxy scheme is not supported.
+    """
+    pool_options: dict[str, Any] = {
+        "ssl_context": get_ssl_context(verify, cert, trust_env, http2),
+        "max_connections": limits.max_connections,
+        "max_keepalive_connections": limits.max_keepalive_connections,
+        "keepalive_expiry": limits.keepalive_expiry,
+        "http1": http1,
+        "http2": http2,
+        "network_backend": network_backend,
+    }
+    if proxy is None:
+        return httpcore.AsyncConnectionPool(**pool_options, **options)
+
+    proxy = httpx.Proxy(url=proxy) if isinstance(proxy, (str, httpx.URL)) else proxy
+    proxy_url = httpcore.URL(
+        scheme=proxy.url.raw_scheme,
+        host=proxy.url.raw_host,
+        port=proxy.url.port,
+        target=proxy.url.raw_path,
+    )
+    if proxy.url.scheme in ("http", "https"):
+        return httpcore.AsyncHTTPProxy(
+            proxy_url=proxy_url,
+            proxy_auth=proxy.raw_auth,
+            proxy_headers=proxy.headers.raw,
+            proxy_ssl_context=proxy.ssl_context,
+            socket_options=options.get("socket_options"),
+            **pool_options,
+        )
+    if proxy.url.scheme in ("socks5", "socks5h"):
+        return httpcore.AsyncSOCKSProxy(
+            proxy_url=proxy_url, proxy_auth=proxy.raw_auth, **pool_options
+        )
+    raise ConfigurationError(f"Unsupported proxy scheme: {proxy.url.scheme!r}")
+
+
+# First trace events emitted once the pool has handed a connection over.
+_CONNECT_EVENTS = frozenset(
+    {
+        "connection.connect_tcp.started",
+        "connection.connect_unix_socket.started",
+    }
+)
+
+
+class ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that runs a callback once, when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close: Callable[[], None] | None = on_close
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                on_close, self._on_close = self._on_close, None
+                on_close()
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    ``httpx.AsyncHTTPTransport`` that collects connection pool statistics.
+
+    Pool wait time is measured from the moment a request enters the
+    transport until httpcore emits the first trace event for it, which
+    happens right after the pool assigns a connection. A first event that
+    opens a socket marks a new connection; anything else marks a reused one.
+
+    With ``max_concurrent_streams`` set, each origin may have at most that
+    many responses open at once. httpcore multiplexes all HTTP/2 requests
+    to an origin over a single connection, so this is the per-connection
+    stream limit; it only lowers the limit advertised by the server. Origins
+    that fall back to HTTP/1.1 are held to the same number of open requests.
+
+    With a ``resolver``, host names of new connections are resolved through
+    it instead of httpcore's per-connection system lookup.
+
+    Attributes:
+        requests: Requests handled by the transport.
+        connections_opened: Requests that had to open a new connection.
+        connections_reused: Requests served by an existing connection.
+        pool_timeouts: Requests that gave up waiting for a connection.
+        pool_wait_total: Total seconds spent waiting for connections.
+        pool_wait_max: Longest single wait for a connection in seconds.
+        waiting: Requests currently waiting for a connection.
+        max_waiting: Highest number of simultaneous waiters observed.
+        max_concurrent_streams: Open responses allowed per origin, or None.
+        resolver: Resolver used for new connections, or None.
+        protocols: Responses received per negotiated HTTP version.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_concurrent_streams: int | None = None,
+        resolver: Resolver | None = None,
+        **kwargs: Any,
+    ):
+        if resolver is None:
+            super().__init__(*args, **kwargs)
+        else:
+            # httpcore takes the network backend as a constructor argument,
+            # so the pool is built here rather than by AsyncHTTPTransport.
+            self._pool = _connection_pool(ResolvingBackend(resolver), *args, **kwargs)
+        self.max_concurrent_streams = max_concurrent_streams
+        self.resolver = resolver
+        self._stream_slots: dict[Hashable, asyncio.Semaphore] = {}
+        self.protocols: dict[str, int] = {}
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.pool_timeouts = 0
+        self.pool_wait_total = 0.0
+        self.pool_wait_max = 0.0
+        self.waiting = 0
+        self.max_waiting = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request while recording pool acquisition telemetry."""
+        started = time.perf_counter()
+        waiting = True
+        user_trace = request.extensions.get("trace")
+
+        def acquired(event_name: str) -> None:
+            nonlocal waiting
+            waiting = False
+            self.waiting -= 1
+            wait = time.perf_counter() - started
+            self.pool_wait_total += wait
+            self.pool_wait_max = max(self.pool_wait_max, wait)
+            if event_name in _CONNECT_EVENTS:
+                self.connections_opened += 1
+            else:
+                self.connections_reused += 1
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if waiting:
+                acquired(event_name)
+            if user_trace is not None:
+                await user_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self.requests += 1
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        slot = None
+        try:
+            if self.max_concurrent_streams is not None:
+                streams = self._stream_slot(request.url)
+                await streams.acquire()
+                slot = streams
+            response = await super().handle_async_request(request)
+        except BaseException as e:
+            if slot is not None:
+                slot.release()
+            if isinstance(e, httpx.PoolTimeout):
+                self.pool_timeouts += 1
+            raise
+        finally:
+            if waiting:
+                waiting = False
+                self.waiting -= 1
+
+        version = response.extensions.get("http_version", b"HTTP/1.1").decode()
+        self.protocols[version] = self.protocols.get(version, 0) + 1
+        if slot is not None:
+            response.stream = ReleasingStream(response.stream, slot.release)
+        return response
+
+    def _stream_slot(self, url: httpx.URL) -> asyncio.Semaphore:
+        """Return the semaphore limiting open streams to ``url``'s origin."""
+        origin = (url.raw_scheme, url.raw_host, url.port)
+        slot = self._stream_slots.get(origin)
+        if slot is None:
+            slot = self._stream_slots[origin] = asyncio.Semaphore(
+                self.max_concurrent_streams
+            )
+        return slot
+
+    def stats(self) -> dict[str, float]:
+        """
+        Snapshot of connection pool statistics.
+
+        Returns:
+            Dictionary with live connection counts (idle, active, total),
+            current and peak waiters, pool wait times, connection
+            open/reuse/timeout counters, and responses per HTTP version.
+        """
+        connections = self._pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        acquired = self.connections_opened + self.connections_reused
+        return {
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "pool_timeouts": self.pool_timeouts,
+            "pool_wait_total": self.pool_wait_total,
+            "pool_wait_max": self.pool_wait_max,
+            "pool_wait_avg": self.pool_wait_total / acquired if acquired else 0.0,
+            **{
+                f"responses[{version}]": count
+                for version, count in self.protocols.items()
+            },
+        }
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Per-client handle onto a transport owned by a TransportRegistry.
+
+    Requests are forwarded to the shared transport. Closing the handle
+    releases this client's reference instead of closing the transport, so
+    the shared connection pool stays up until its last user leaves.
+
+    Attributes:
+        transport: The shared underlying transport.
+        key: Registry key the transport is stored under.
+    """
+
+    def __init__(
+        self,
+        registry: "TransportRegistry",
+        key: Hashable,
+        transport: httpx.AsyncBaseTransport,
+    ):
+        self.registry = registry
+        self.key = key
+        self.transport = transport
+        self._closed = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Forward a request to the shared transport."""
+        if self._closed:
+            raise RuntimeError("Cannot send a request on a released transport")
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Release this client's reference to the shared transport."""
+        if not self._closed:
+            self._closed = True
+            await self.registry.release(self.key)
+
+
+class TransportRegistry:
+    """
+    Reference-counted registry of transports shared by BaseClient instances.
+
+    Clients that resolve to the same key (base host, proxy and TLS/pool
+    settings) share one transport, and with it one connection pool, SSL
+    context and set of sockets. Each client keeps its own httpx.AsyncClient,
+    so headers and cookies stay per instance. The transport is closed when
+    the last client holding it is closed.
+
+    Shared transports are bound to the event loop that first uses them, so
+    all clients sharing a registry must run on the same loop.
+
+    Example:
+        >>> registry = TransportRegistry()
+        >>> clients = [
+        ...     MyAPIClient(headers={"Authorization": token}, share_transport=registry)
+        ...     for token in tokens
+        ... ]
+        >>> len(registry)
+        1
+    """
+
+    def __init__(self):
+        self._transports: dict[Hashable, httpx.AsyncBaseTransport] = {}
+        self._refs: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._transports)
+
+    def acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], httpx.AsyncBaseTransport],
+    ) -> SharedTransport:
+        """
+        Get a handle onto the transport for ``key``, creating it if needed.
+
+        Args:
+            key: Hashable description of the transport configuration.
+            factory: Builds the transport when no client holds one yet.
+
+        Returns:
+            A SharedTransport handle owned by the caller.
+        """
+        transport = self._transports.get(key)
+        if transport is None:
+            transport = self._transports[key] = factory()
+            self._refs[key] = 0
+            logger.debug(f"Created shared transport for {key!r}")
+        self._refs[key] += 1
+        return SharedTransport(self, key, transport)
+
+    async def release(self, key: Hashable) -> None:
+        """
+        Drop one reference to ``key`` and close the transport if unused.
+
+        Args:
+            key: Registry key previously passed to ``acquire``.
+        """
+        self._refs[key] -= 1
+        if self._refs[key] > 0:
+            return
+        del self._refs[key]
+        transport = self._transports.pop(key)
+        await transport.aclose()
+        logger.debug(f"Closed shared transport for {key!r}")
+
+    def references(self, key: Hashable) -> int:
+        """Return how many clients currently hold the transport for ``key``."""
+        return self._refs.get(key, 0)
+
+
+default_registry = TransportRegistry()
+"""Process-wide registry used by ``BaseClient(share_transport=True)``."""
@@ -0,0 +1,343 @@
+"""
+Shared test fixtures.
+
+``api_client`` builds BaseClient test instances and closes them when the
+test ends; ``fake_clock`` is a manually advanced clock for the components
+that accept a ``clock`` argument. ``mock_api`` builds configurable mock
+transports (status, headers, body, delay, error, ETag) that record the
+requests they answer.
+
+The ``local_server`` fixture runs a minimal keep-alive HTTP/1.1 server on
+the loopback interface so transport-level behavior (pooling, connection
+reuse, warmup) can be observed without network access. ``local_h2_server``
+does the same over cleartext HTTP/2 (prior knowledge) when ``h2`` is
+installed.
+"""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from ravexclient import BaseClient
+
+
+class APIClient(BaseClient):
+    """Test implementation of BaseClient (not collected by pytest)."""
+
+    BASE_URL = "http://api.test.com"
+
+
+class FakeClock:
+    """Manually advanced clock; set or increase ``now`` to move time."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    """Clock starting at 0 that only moves when a test changes ``now``."""
+    return FakeClock()
+
+
+@pytest.fixture
+async def api_client():
+    """Build APIClient instances, closing them all after the test."""
+    clients: list[APIClient] = []
+
+    def build(**kwargs) -> APIClient:
+        client = APIClient(**kwargs)
+        clients.append(client)
+        return client
+
+    yield build
+    for client in clients:
+        await client.close()
+
+
+class MockAPI(httpx.MockTransport):
+    """
+    Configurable mock transport recording the requests it answers.
+
+    Each request waits ``delay`` seconds, then raises ``error`` if set, or
+    answers ``status_code`` with ``headers`` and ``json`` as the body. A
+    callable ``json`` is called with the request; without one the body is
+    ``{"n": <requests so far>}``. With an ``etag``, responses carry it and
+    requests sending it back in If-None-Match get an empty 304.
+
+    ``script`` lists per-request overrides of those attributes: the n-th
+    request applies the n-th entry, and the last entry repeats. Bodies are
+    sent as streams, so, as with a real transport, a response stays open
+    until it is read or closed.
+    """
+
+    def __init__(
+        self,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        delay: float = 0.0,
+        error: Exception | None = None,
+        etag: str | None = None,
+        script: list[dict[str, Any]] | None = None,
+    ):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.json = json
+        self.delay = delay
+        self.error = error
+        self.etag = etag
+        self.script = script or []
+        self.requests: list[httpx.Request] = []
+        self.cancelled = 0
+        self.closed = False
+        super().__init__(self._respond)
+
+    async def _respond(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        overrides = {}
+        if self.script:
+            overrides = self.script[min(len(self.requests), len(self.script)) - 1]
+
+        def option(name: str) -> Any:
+            return overrides.get(name, getattr(self, name))
+
+        if option("delay"):
+            try:
+                await asyncio.sleep(option("delay"))
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        if option("error") is not None:
+            raise option("error")
+
+        headers = dict(option("headers"))
+        etag = option("etag")
+        if etag is not None:
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304, headers=headers)
+        body = option("json")
+        if body is None:
+            body = {"n": len(self.requests)}
+        elif callable(body):
+            body = body(request)
+        content = json.dumps(body).encode()
+        headers.setdefault("Content-Type", "application/json")
+        headers["Content-Length"] = str(len(content))
+        return httpx.Response(
+            option("status_code"), headers=headers, stream=httpx.ByteStream(content)
+        )
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def mock_api():
+    """Build MockAPI transports; takes the MockAPI arguments."""
+    return MockAPI
+
+
+class LocalServer:
+    """Minimal asyncio HTTP/1.1 server that answers every request with JSON."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self.delay = 0.0
+        self.status = 200
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        # Drop connections a failed test left open so shutdown can't hang.
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {
+                    name.lower(): value
+                    for name, value in (
+                        line.split(": ", 1) for line in lines[1:] if line
+                    )
+                }
+                length = int(headers.get("content-length", 0))
+                if length:
+                    await reader.readexactly(length)
+                self.requests.append((method, target))
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                body = json.dumps({"method": method, "path": target}).encode()
+                writer.write(
+                    f"HTTP/1.1 {self.status} OK\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + (b"" if method == "HEAD" else body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+@pytest.fixture
+async def local_server():
+    """Start a loopback HTTP/1.1 server for the duration of a test."""
+    server = LocalServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+async def local_server_factory():
+    """Start any number of loopback HTTP/1.1 servers during a test."""
+    servers: list[LocalServer] = []
+
+    async def start() -> LocalServer:
+        server = LocalServer()
+        await server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        await server.stop()
+
+
+class LocalH2Server:
+    """Minimal asyncio HTTP/2 (h2c prior knowledge) server answering JSON."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests: list[tuple[str, str]] = []
+        self.delay = 0.0
+        self.max_concurrent_streams = 100
+        self.open_streams = 0
+        self.max_open_streams = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        # Drop connections a failed test left open so shutdown can't hang.
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.settings
+
+        self.connections += 1
+        self._writers.add(writer)
+        conn = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        conn.initiate_connection()
+        max_streams = h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS
+        conn.update_settings({max_streams: self.max_concurrent_streams})
+        writer.write(conn.data_to_send())
+        requests: dict[int, tuple[str, str]] = {}
+        tasks: set[asyncio.Task] = set()
+
+        async def respond(stream_id: int, method: str, path: str) -> None:
+            self.open_streams += 1
+            self.max_open_streams = max(self.max_open_streams, self.open_streams)
+            try:
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                body = json.dumps({"method": method, "path": path}).encode()
+                conn.send_headers(
+                    stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(body))),
+                    ],
+                )
+                conn.send_data(stream_id, body, end_stream=True)
+                writer.write(conn.data_to_send())
+            finally:
+                self.open_streams -= 1
+
+        try:
+            while data := await reader.read(65536):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        headers = dict(event.headers)
+                        requests[event.stream_id] = (
+                            headers[":method"],
+                            headers[":path"],
+                        )
+                    elif isinstance(event, h2.events.StreamEnded):
+                        method, path = requests.pop(event.stream_id)
+                        self.requests.append((method, path))
+                        task = asyncio.create_task(
+                            respond(event.stream_id, method, path)
+                        )
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._writers.discard(writer)
+            writer.close()
+
+
+@pytest.fixture
+async def local_h2_server():
+    """Start a loopback HTTP/2 server for the duration of a test."""
+    pytest.importorskip("h2")
+    server = LocalH2Server()
+    await server.start()
+    yield server
+    await server.stop()
@@ -0,0 +1,872 @@
+"""
+Unit tests for the response cache.
+
+Tests cover:
+- Cache-Control, Expires and Age freshness rules
+- no-store, Vary and per-call TTL overrides
+- ETag/Last-Modified revalidation and 304 handling
+- stale-while-revalidate and stale-if-error
+- Stampede protection (refill lock, early refresh)
+- LRU eviction by entry count and total bytes
+- Persistent SQLite backend shared between instances
+- Negative caching of 404/410 errors
+- Integration with BaseClient._fetch
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import httpx
+import pytest
+
+from ravexclient import (
+    MemoryCache,
+    NegativeCache,
+    ResponseCache,
+    SingleFlight,
+    SQLiteCache,
+    last_response_info,
+)
+from ravexclient.cache import CacheEntry, parse_cache_control
+from ravexclient.exceptions import ConfigurationError, HTTPError
+
+
+def _response(headers=None, request_headers=None, status_code=200):
+    request = httpx.Request("GET", "http://api.test.com/x", headers=request_headers)
+    return httpx.Response(
+        status_code, content=b'{"ok": true}', headers=headers, request=request
+    )
+
+
+def _entry(size):
+    return CacheEntry(
+        url="http://api.test.com/x",
+        status_code=200,
+        http_version="HTTP/1.1",
+        headers={},
+        body=b"x" * size,
+        stored_at=0.0,
+        expires_at=60.0,
+    )
+
+
+class TestCacheControl:
+    """Tests for freshness and cacheability rules."""
+
+    def test_parse_cache_control(self):
+        """Test directives are parsed case-insensitively."""
+        assert parse_cache_control('Max-Age=60, no-cache, foo="bar"') == {
+            "max-age": "60",
+            "no-cache": None,
+            "foo": "bar",
+        }
+
+    def test_max_age_minus_age(self):
+        """Test max-age is reduced by the Age header."""
+        cache = ResponseCache()
+
+        assert cache.freshness(_response({"Cache-Control": "max-age=60"})) == 60
+        assert (
+            cache.freshness(_response({"Cache-Control": "max-age=60", "Age": "15"}))
+            == 45
+        )
+
+    def test_expires(self, fake_clock):
+        """Test Expires is used without max-age."""
+        fake_clock.now = 1_700_000_000.0
+        cache = ResponseCache(clock=fake_clock)
+        expires = "Tue, 14 Nov 2023 22:14:20 GMT"
+
+        assert cache.freshness(_response({"Expires": expires})) == 60
+        assert cache.freshness(_response({"Expires": "garbage"})) == 0
+
+    def test_default_ttl_and_no_store(self):
+        """Test headerless responses use default_ttl and no-store wins."""
+        cache = ResponseCache(default_ttl=5)
+
+        assert cache.freshness(_response()) == 5
+        assert cache.freshness(_response({"Cache-Control": "no-store"})) is None
+
+    @pytest.mark.asyncio
+    async def test_store_rules(self):
+        """Test which responses are stored."""
+        cache = ResponseCache()
+        key = cache.key("GET", "http://api.test.com/x")
+        fresh = {"Cache-Control": "max-age=60"}
+
+        assert await cache.store(key, _response(fresh)) is not None
+        assert await cache.store(key, _response(fresh, status_code=201)) is None
+        assert await cache.store(key, _response({**fresh, "Vary": "*"})) is None
+        assert (
+            await cache.store(key, _response({"Cache-Control": "no-store"}), ttl=60)
+            is None
+        )
+        assert await cache.store(key, _response(), ttl=60) is not None
+        assert (
+            await cache.store(
+                key, _response(fresh, request_headers={"Cache-Control": "no-store"})
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_vary(self):
+        """Test entries only serve requests with matching Vary headers."""
+        cache = ResponseCache()
+        key = cache.key("GET", "http://api.test.com/x")
+        await cache.store(
+            key,
+            _response(
+                {"Cache-Control": "max-age=60", "Vary": "Accept-Language"},
+                request_headers={"Accept-Language": "es"},
+            ),
+        )
+
+        assert await cache.get(key, httpx.Headers({"accept-language": "es"}))
+        assert await cache.get(key, httpx.Headers({"Accept-Language": "en"})) is None
+        assert await cache.get(key, httpx.Headers()) is None
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self, fake_clock):
+        """Test entries stop being served after their lifetime."""
+        cache = ResponseCache(clock=fake_clock)
+        key = cache.key("GET", "http://api.test.com/x")
+        await cache.store(key, _response({"Cache-Control": "max-age=10"}))
+
+        assert await cache.get(key, httpx.Headers())
+        fake_clock.now += 10
+        assert await cache.get(key, httpx.Headers()) is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_cache_request_skips_lookup(self):
+        """Test requests with Cache-Control: no-cache go to the network."""
+        cache = ResponseCache()
+        key = cache.key("GET", "http://api.test.com/x")
+        await cache.store(key, _response({"Cache-Control": "max-age=60"}))
+
+        assert (
+            await cache.get(key, httpx.Headers({"Cache-Control": "no-cache"})) is None
+        )
+
+    def test_key_normalizes_params(self):
+        """Test params and query strings produce the same key."""
+        assert ResponseCache.key("get", "http://a.test/x", {"page": 1}) == (
+            "GET http://a.test/x?page=1"
+        )
+
+
+class TestMemoryCache:
+    """Tests for the in-memory LRU backend."""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted first."""
+        backend = MemoryCache(max_entries=2)
+        await backend.set("a", _entry(1))
+        await backend.set("b", _entry(1))
+        await backend.get("a")
+        await backend.set("c", _entry(1))
+
+        assert await backend.get("b") is None
+        assert await backend.get("a") is not None
+        assert backend.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_peek_keeps_eviction_order(self):
+        """Test a peek doesn't save an entry from eviction."""
+        backend = MemoryCache(max_entries=2)
+        await backend.set("a", _entry(1))
+        await backend.set("b", _entry(1))
+        assert await backend.peek("a") is not None
+        await backend.set("c", _entry(1))
+
+        assert await backend.peek("a") is None
+        assert await backend.peek("b") is not None
+
+    @pytest.mark.asyncio
+    async def test_bounded_by_bytes(self):
+        """Test total size stays within max_bytes."""
+        size = _entry(1000).size
+        backend = MemoryCache(max_bytes=size * 2)
+        for key in "abc":
+            await backend.set(key, _entry(1000))
+
+        assert len(backend) == 2
+        assert backend.stats()["bytes"] == size * 2
+
+        await backend.set("huge", _entry(size * 3))
+        assert await backend.get("huge") is None
+
+    @pytest.mark.asyncio
+    async def test_replacing_entry_updates_bytes(self):
+        """Test overwriting a key doesn't double count its size."""
+        backend = MemoryCache()
+        await backend.set("a", _entry(10))
+        await backend.set("a", _entry(20))
+
+        assert backend.stats()["bytes"] == _entry(20).size
+        await backend.clear()
+        assert backend.stats()["bytes"] == 0
+
+    def test_invalid_bounds(self):
+        """Test bounds must be positive."""
+        with pytest.raises(ConfigurationError):
+            MemoryCache(max_entries=0)
+
+
+class TestBaseClientCache:
+    """Tests for the response cache in BaseClient._fetch."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_responses_are_served_from_cache(self, api_client, mock_api):
+        """Test a cached response answers without a request."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60"})
+        cache = ResponseCache()
+        client = api_client(transport=transport, cache=cache)
+
+        first = await client._get("/items", params={"page": 1})
+        assert last_response_info().cached is False
+        second = await client._get("/items", params={"page": 1})
+
+        assert first == second == {"n": 1}
+        assert len(transport.requests) == 1
+        assert last_response_info().cached is True
+        assert cache.stats()["hits"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_independent(self, api_client, mock_api):
+        """Test callers can mutate what the cache returns."""
+        client = api_client(
+            transport=mock_api(headers={"Cache-Control": "max-age=60"}),
+            cache=ResponseCache(),
+        )
+
+        await client._get("/items")
+        (await client._get("/items"))["n"] = 99
+
+        assert await client._get("/items") == {"n": 1}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_per_call_ttl(self, api_client, mock_api):
+        """Test cache_ttl caches responses without freshness headers."""
+        transport = mock_api()
+        client = api_client(transport=transport, cache=ResponseCache())
+
+        await client._get("/items")
+        await client._get("/items")
+        assert len(transport.requests) == 2
+
+        await client._get("/other", cache_ttl=60)
+        await client._get("/other")
+        assert len(transport.requests) == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_no_store_and_errors_are_not_cached(self, api_client, mock_api):
+        """Test no-store responses and failures are fetched every time."""
+        transport = mock_api(headers={"Cache-Control": "no-store"})
+        client = api_client(transport=transport, cache=ResponseCache())
+
+        await client._get("/items", cache_ttl=60)
+        await client._get("/items", cache_ttl=60)
+        assert len(transport.requests) == 2
+
+        transport.headers = {"Cache-Control": "max-age=60"}
+        transport.status_code = 500
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                await client._get("/broken")
+        assert len(transport.requests) == 4
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_vary_on_client_cookies(self, api_client, mock_api):
+        """Test responses varying on Cookie are served to the same cookies."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60", "Vary": "Cookie"})
+        cache = ResponseCache()
+        client = api_client(transport=transport, cache=cache, cf_clearance="abc")
+
+        for _ in range(3):
+            await client._get("/items")
+
+        assert len(transport.requests) == 1
+        assert transport.requests[0].headers["Cookie"] == "cf_clearance=abc"
+        assert cache.stats()["hits"] == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_only_get_is_cached(self, api_client, mock_api):
+        """Test POST responses are not cached."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60"})
+        client = api_client(transport=transport, cache=ResponseCache())
+
+        await client._post("/items", payload={})
+        await client._post("/items", payload={})
+
+        assert len(transport.requests) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_in_front_of_single_flight(self, api_client, mock_api):
+        """Test a cache hit doesn't enter the single-flight group."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60"})
+        flight = SingleFlight()
+        client = api_client(
+            transport=transport, cache=ResponseCache(), single_flight=flight
+        )
+
+        await client._get("/items")
+        await client._get("/items")
+
+        assert flight.stats()["leaders"] == 1
+        await client.close()
+
+
+# Versioned resource served with an ETag by the revalidation tests.
+_RESOURCE = {"version": 1, "data": "x" * 100}
+
+
+class TestRevalidation:
+    """Tests for ETag/Last-Modified revalidation of stale entries."""
+
+    def test_validators(self):
+        """Test ETag and Last-Modified become conditional headers."""
+        entry = _entry(1)
+        assert entry.validators() == {}
+
+        entry.headers = {
+            "ETag": '"abc"',
+            "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+        assert entry.validators() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+
+    @pytest.mark.asyncio
+    async def test_entries_with_validators_are_kept_when_stale(self):
+        """Test no-cache responses with an ETag are stored for revalidation."""
+        cache = ResponseCache()
+        key = cache.key("GET", "http://api.test.com/x")
+        await cache.store(key, _response({"Cache-Control": "no-cache", "ETag": '"a"'}))
+
+        assert await cache.get(key, httpx.Headers()) is None
+        entry = await cache.get(key, httpx.Headers(), stale=True)
+        assert entry is not None
+        assert not cache.is_fresh(entry)
+
+    @pytest.mark.asyncio
+    async def test_not_modified_serves_cached_body(self, api_client, mock_api):
+        """Test a 304 answer returns the cached body and counts bytes saved."""
+        transport = mock_api(json=_RESOURCE, etag='"v1"')
+        cache = ResponseCache()
+        client = api_client(transport=transport, cache=cache)
+
+        first = await client._get("/items")
+        second = await client._get("/items")
+
+        assert first == second == {"version": 1, "data": "x" * 100}
+        assert "If-None-Match" not in transport.requests[0].headers
+        assert transport.requests[1].headers["If-None-Match"] == '"v1"'
+        info = last_response_info()
+        assert info.status_code == 304
+        assert info.cached is True
+        stats = cache.stats()
+        assert stats["revalidations"] == 1
+        assert stats["not_modified"] == 1
+        assert stats["bytes_saved"] == len(json.dumps(_RESOURCE))
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_changed_resource_replaces_entry(self, api_client, mock_api):
+        """Test a 200 answer to a conditional request replaces the entry."""
+        transport = mock_api(json=_RESOURCE, etag='"v1"')
+        cache = ResponseCache()
+        client = api_client(transport=transport, cache=cache)
+
+        await client._get("/items")
+        transport.json = {**_RESOURCE, "version": 2}
+        transport.etag = '"v2"'
+        assert (await client._get("/items"))["version"] == 2
+        assert (await client._get("/items"))["version"] == 2
+
+        assert transport.requests[2].headers["If-None-Match"] == '"v2"'
+        assert cache.stats()["not_modified"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_not_modified_refreshes_freshness(
+        self, api_client, mock_api, fake_clock
+    ):
+        """Test the 304's Cache-Control makes the entry fresh again."""
+        transport = mock_api(
+            headers={"Cache-Control": "max-age=10"}, json=_RESOURCE, etag='"v1"'
+        )
+        client = api_client(transport=transport, cache=ResponseCache(clock=fake_clock))
+
+        await client._get("/items")
+        fake_clock.now += 20
+        await client._get("/items")
+        await client._get("/items")
+
+        assert [r.headers.get("If-None-Match") for r in transport.requests] == [
+            None,
+            '"v1"',
+        ]
+        assert last_response_info().status_code == 200
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_caller_validators_are_not_overridden(self, api_client, mock_api):
+        """Test requests with their own If-None-Match are sent as is."""
+        transport = mock_api(json=_RESOURCE, etag='"v1"')
+        client = api_client(transport=transport, cache=ResponseCache())
+
+        await client._get("/items")
+        with pytest.raises(HTTPError) as exc_info:
+            await client._get("/items", headers={"If-None-Match": '"v1"'})
+
+        assert exc_info.value.status_code == 304
+        await client.close()
+
+
+class TestSQLiteCache:
+    """Tests for the persistent SQLite backend."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_persistence(self, tmp_path):
+        """Test entries survive closing and reopening the database."""
+        path = tmp_path / "cache.sqlite"
+        entry = _entry(5000)
+        entry.headers = {"etag": '"a"'}
+        entry.vary = {"accept-language": "es"}
+        backend = SQLiteCache(path)
+        await backend.set("k", entry)
+        await backend.aclose()
+
+        reopened = SQLiteCache(path)
+        assert await reopened.get("k") == entry
+        assert await reopened.get("missing") is None
+        await reopened.aclose()
+
+    @pytest.mark.asyncio
+    async def test_bodies_are_compressed(self, tmp_path):
+        """Test compressible bodies are stored compressed."""
+        path = tmp_path / "cache.sqlite"
+        backend = SQLiteCache(path)
+        await backend.set("k", _entry(100_000))
+        await backend.aclose()
+
+        with sqlite3.connect(path) as db:
+            (stored,) = db.execute("SELECT length(body) FROM entries").fetchone()
+        assert stored < 1000
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, tmp_path, fake_clock):
+        """Test eviction by entry count keeps recently read entries."""
+        backend = SQLiteCache(
+            tmp_path / "cache.sqlite", max_entries=2, clock=fake_clock
+        )
+        await backend.set("a", _entry(1))
+        fake_clock.now += 5
+        await backend.set("b", _entry(1))
+        fake_clock.now += 5
+        await backend.get("a")
+        fake_clock.now += 5
+        await backend.set("c", _entry(1))
+
+        assert await backend.get("b") is None
+        assert await backend.get("a") is not None
+        assert backend.stats()["entries"] == 2
+        assert backend.stats()["evictions"] == 1
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_peek_keeps_eviction_order(self, tmp_path, fake_clock):
+        """Test a peek doesn't save an entry from eviction."""
+        backend = SQLiteCache(
+            tmp_path / "cache.sqlite", max_entries=2, clock=fake_clock
+        )
+        await backend.set("a", _entry(1))
+        fake_clock.now += 5
+        await backend.set("b", _entry(1))
+        fake_clock.now += 5
+        assert await backend.peek("a") is not None
+        fake_clock.now += 5
+        await backend.set("c", _entry(1))
+
+        assert await backend.peek("a") is None
+        assert await backend.peek("b") is not None
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_bounded_by_bytes(self, tmp_path, fake_clock):
+        """Test the stored size stays within max_bytes."""
+        backend = SQLiteCache(
+            tmp_path / "cache.sqlite",
+            max_bytes=5000,
+            compression_level=0,
+            clock=fake_clock,
+        )
+        for key in "abc":
+            fake_clock.now += 1
+            await backend.set(key, _entry(2000))
+        await backend.set("huge", _entry(10_000))
+
+        assert backend.stats()["entries"] == 2
+        assert backend.stats()["bytes"] <= 5000
+        assert await backend.get("a") is None
+        assert await backend.get("huge") is None
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_instances_share_bounds(self, tmp_path):
+        """Test concurrent writers on one file enforce the same bounds."""
+        path = tmp_path / "cache.sqlite"
+        writers = [SQLiteCache(path, max_entries=10) for _ in range(4)]
+
+        await asyncio.gather(
+            *(
+                writer.set(f"{n}-{i}", _entry(100))
+                for n, writer in enumerate(writers)
+                for i in range(10)
+            )
+        )
+
+        with sqlite3.connect(path) as db:
+            (count,) = db.execute("SELECT count(*) FROM entries").fetchone()
+            totals = db.execute("SELECT entries FROM totals").fetchone()
+        assert count == totals[0] == 10
+        for writer in writers:
+            await writer.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cache_survives_client_restart(self, tmp_path, api_client, mock_api):
+        """Test a new client answers from the cache of a previous one."""
+        path = tmp_path / "cache.sqlite"
+        transport = mock_api(headers={"Cache-Control": "max-age=60"})
+
+        for _ in range(2):
+            cache = ResponseCache(SQLiteCache(path))
+            client = api_client(transport=transport, cache=cache)
+            assert await client._get("/items") == {"n": 1}
+            await client.close()
+            await cache.aclose()
+
+        assert len(transport.requests) == 1
+        assert last_response_info().cached is True
+
+    def test_invalid_configuration(self, tmp_path):
+        """Test invalid settings raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            SQLiteCache(tmp_path / "cache.sqlite", max_bytes=0)
+        with pytest.raises(ConfigurationError):
+            SQLiteCache(tmp_path / "cache.sqlite", compression_level=10)
+
+
+class TestStaleResponses:
+    """Tests for serving stale entries."""
+
+    @pytest.fixture
+    def stale_client(self, api_client, mock_api, fake_clock):
+        """Build a client whose cached /items entry has just gone stale."""
+
+        async def build(headers=None, **kwargs):
+            transport = mock_api(headers=headers or {"Cache-Control": "max-age=10"})
+            cache = ResponseCache(clock=fake_clock, **kwargs)
+            client = api_client(transport=transport, cache=cache)
+            assert await client._get("/items") == {"n": 1}
+            fake_clock.now += 15
+            return client, transport, cache
+
+        return build
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, stale_client):
+        """Test stale entries answer at once while one refresh runs."""
+        client, transport, cache = await stale_client(stale_while_revalidate=60)
+
+        async def read():
+            return await client._get("/items"), last_response_info()
+
+        results = await asyncio.gather(*(read() for _ in range(5)))
+        for data, info in results:
+            assert data == {"n": 1}
+            assert info.cached is True
+            assert info.stale is True
+
+        await asyncio.sleep(0.01)
+        assert len(transport.requests) == 2
+        assert await client._get("/items") == {"n": 2}
+        assert last_response_info().stale is False
+        assert cache.stats()["stale_hits"] == 5
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_response_directive_sets_window(self, stale_client):
+        """Test the response's stale-while-revalidate directive is honored."""
+        client, _, _ = await stale_client(
+            {"Cache-Control": "max-age=10, stale-while-revalidate=30"}
+        )
+
+        assert await client._get("/items") == {"n": 1}
+        assert last_response_info().stale is True
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_must_revalidate_is_never_stale(self, stale_client):
+        """Test must-revalidate responses are not served stale."""
+        client, transport, _ = await stale_client(
+            {"Cache-Control": "max-age=10, must-revalidate"},
+            stale_while_revalidate=60,
+            stale_if_error=60,
+        )
+        transport.status_code = 503
+
+        with pytest.raises(HTTPError):
+            await client._get("/items")
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_if_error(self, stale_client):
+        """Test stale entries replace 5xx answers and transport errors."""
+        client, transport, cache = await stale_client(stale_if_error=60)
+
+        transport.status_code = 503
+        assert await client._get("/items") == {"n": 1}
+        assert last_response_info().stale is True
+
+        transport.error = httpx.ConnectError("Connection refused")
+        assert await client._get("/items") == {"n": 1}
+        assert cache.stats()["stale_errors"] == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_raised(self, stale_client):
+        """Test 4xx answers are not hidden by stale entries."""
+        client, transport, _ = await stale_client(stale_if_error=60)
+        transport.status_code = 404
+
+        with pytest.raises(HTTPError) as exc_info:
+            await client._get("/items")
+
+        assert exc_info.value.status_code == 404
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_if_error_window(self, stale_client):
+        """Test entries older than the window are not served."""
+        client, transport, _ = await stale_client(stale_if_error=1)
+        transport.status_code = 503
+
+        with pytest.raises(HTTPError):
+            await client._get("/items")
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_background_refresh(self, stale_client):
+        """Test a failing refresh is logged and the entry stays stale."""
+        client, transport, _ = await stale_client(stale_while_revalidate=60)
+        transport.status_code = 500
+
+        assert await client._get("/items") == {"n": 1}
+        await asyncio.sleep(0.01)
+        assert await client._get("/items") == {"n": 1}
+        assert last_response_info().stale is True
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_refreshes(self, stale_client):
+        """Test closing the client cancels background refreshes."""
+        client, _, _ = await stale_client(stale_while_revalidate=60)
+
+        await client._get("/items")
+        assert client._refreshes
+        await client.close()
+
+        assert not client._refreshes
+
+
+class TestStampedeProtection:
+    """Tests for the refill lock and probabilistic early refresh."""
+
+    def test_should_refresh_early(self, monkeypatch, fake_clock):
+        """Test XFetch refreshes slow entries close to expiry."""
+        monkeypatch.setattr("ravexclient.cache.random.random", lambda: 0.5)
+        cache = ResponseCache(clock=fake_clock)
+        entry = _entry(1)
+        entry.fetch_time = 1.0
+
+        entry.expires_at = fake_clock.now + 10
+        assert not cache.should_refresh_early(entry)
+        # -ln(0.5) ~= 0.69 seconds ahead of expiry
+        entry.expires_at = fake_clock.now + 0.5
+        assert cache.should_refresh_early(entry)
+        assert cache.stats()["early_refreshes"] == 1
+
+        assert not ResponseCache(early_refresh_beta=0).should_refresh_early(entry)
+        entry.fetch_time = 0.0
+        assert not cache.should_refresh_early(entry)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_send_one_request(self, api_client, mock_api):
+        """Test concurrent misses for a key wait for the first request."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60"}, delay=0.02)
+        cache = ResponseCache()
+        client = api_client(transport=transport, cache=cache)
+
+        results = await asyncio.gather(*(client._get("/items") for _ in range(50)))
+
+        assert results == [{"n": 1}] * 50
+        assert len(transport.requests) == 1
+        assert cache.stats()["lock_waits"] == 49
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_responses_release_waiters(self, api_client, mock_api):
+        """Test waiters send their own requests if nothing was stored."""
+        transport = mock_api(headers={"Cache-Control": "no-store"}, delay=0.01)
+        client = api_client(transport=transport, cache=ResponseCache())
+
+        await asyncio.gather(*(client._get("/items") for _ in range(5)))
+
+        assert len(transport.requests) == 5
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_lock_timeout(self, api_client, mock_api):
+        """Test waiters stop waiting for a slow refill after lock_timeout."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60"}, delay=0.2)
+        cache = ResponseCache(lock_timeout=0.01)
+        client = api_client(transport=transport, cache=cache)
+
+        await asyncio.gather(*(client._get("/items") for _ in range(3)))
+
+        assert len(transport.requests) == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_hit_refreshes_early_in_background(
+        self, monkeypatch, api_client, mock_api
+    ):
+        """Test an early refresh serves the entry and refreshes it once."""
+        transport = mock_api(headers={"Cache-Control": "max-age=60"})
+        cache = ResponseCache()
+        client = api_client(transport=transport, cache=cache)
+        await client._get("/items")
+
+        monkeypatch.setattr(cache, "should_refresh_early", lambda entry: True)
+        assert await client._get("/items") == {"n": 1}
+        assert await client._get("/items") == {"n": 1}
+        await asyncio.sleep(0.01)
+
+        assert len(transport.requests) == 2
+        assert await client._get("/items") == {"n": 2}
+        await client.close()
+
+
+class TestNegativeCache:
+    """Tests for negative caching of not-found errors."""
+
+    def test_check_raises_copy_until_expiry(self, fake_clock):
+        """Test a stored error is raised again until its TTL passes."""
+        negative = NegativeCache({404: 30}, clock=fake_clock)
+        key = negative.key("GET", "http://api.test.com/items/1")
+        error = HTTPError("Not found", status_code=404, response_body={"id": 1})
+
+        assert negative.store(key, error)
+        with pytest.raises(HTTPError) as raised:
+            negative.check(key)
+        assert raised.value is not error
+        assert raised.value.status_code == 404
+        assert raised.value.response_body == {"id": 1}
+
+        fake_clock.now += 30
+        negative.check(key)
+        assert len(negative) == 0
+        assert negative.stats()["hits"] == 1
+        assert negative.stats()["misses"] == 1
+
+    def test_only_configured_statuses_are_stored(self):
+        """Test errors without a TTL for their status are ignored."""
+        negative = NegativeCache()
+
+        assert not negative.store("k", HTTPError("Boom", status_code=500))
+        assert not negative.store("k", HTTPError("Timed out"))
+        assert negative.store("k", HTTPError("Gone", status_code=410))
+        assert negative.ttls == {404: 30.0, 410: 300.0}
+
+    def test_bounded_size(self):
+        """Test the oldest errors are evicted beyond max_entries."""
+        negative = NegativeCache(max_entries=2)
+        for key in "abc":
+            negative.store(key, HTTPError("Not found", status_code=404))
+
+        negative.check("a")
+        assert len(negative) == 2
+        assert negative.stats()["evictions"] == 1
+        with pytest.raises(HTTPError):
+            negative.check("c")
+
+    def test_invalid_configuration(self):
+        """Test non-positive TTLs and sizes are rejected."""
+        with pytest.raises(ConfigurationError):
+            NegativeCache({404: 0})
+        with pytest.raises(ConfigurationError):
+            NegativeCache(max_entries=0)
+
+    @pytest.mark.asyncio
+    async def test_repeated_404_not_sent(self, api_client, mock_api):
+        """Test a cached 404 is raised without another request."""
+        transport = mock_api(status_code=404)
+        negative = NegativeCache()
+        client = api_client(transport=transport, negative_cache=negative)
+
+        for _ in range(3):
+            with pytest.raises(HTTPError) as raised:
+                await client._get("/items/1")
+            assert raised.value.status_code == 404
+
+        assert len(transport.requests) == 1
+        assert negative.stats()["hits"] == 2
+        with pytest.raises(HTTPError):
+            await client._get("/items/2")
+        assert len(transport.requests) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_bypass_and_success_clear_entry(self, api_client, mock_api):
+        """Test negative_cache=False sends the request and success forgets it."""
+        transport = mock_api(status_code=404)
+        negative = NegativeCache()
+        client = api_client(transport=transport, negative_cache=negative)
+
+        with pytest.raises(HTTPError):
+            await client._get("/items/1")
+        transport.status_code = 200
+        assert await client._get("/items/1", negative_cache=False) == {"n": 2}
+        assert len(negative) == 0
+        assert await client._get("/items/1") == {"n": 3}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_other_errors_and_methods_not_cached(self, api_client, mock_api):
+        """Test server errors and POST requests always reach the network."""
+        transport = mock_api(status_code=500)
+        client = api_client(transport=transport, negative_cache=NegativeCache())
+
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                await client._get("/items/1")
+        transport.status_code = 404
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                await client._post("/items", payload={"id": 1})
+
+        assert len(transport.requests) == 4
+        await client.close()
@@ -0,0 +1,301 @@
+"""
+Unit tests for circuit breakers.
+
+Tests cover:
+- Closed, open and half-open transitions
+- Trial request accounting and state change events
+- Per-host and per-proxy breakers in BaseClient
+- Proxy pools skipping proxies with an open circuit
+"""
+
+import httpx
+import pytest
+
+from ravexclient import (
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    ProxyPool,
+    RetryPolicy,
+)
+from ravexclient.circuit import CLOSED, HALF_OPEN, OPEN
+from ravexclient.exceptions import ConfigurationError, HTTPError
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the breaker opens at the failure threshold."""
+        breakers = CircuitBreakerRegistry(failure_threshold=3)
+        breaker = breakers.get("host:a")
+
+        for _ in range(2):
+            breaker.allow()
+            breaker.record_failure()
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.failures == 0
+
+        for _ in range(3):
+            breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == OPEN
+
+    def test_open_breaker_rejects_with_retry_after(self, fake_clock):
+        """Test an open breaker refuses requests immediately."""
+        breakers = CircuitBreakerRegistry(
+            failure_threshold=1, recovery_timeout=10, clock=fake_clock
+        )
+        breaker = breakers.get("host:a")
+        breaker.allow()
+        breaker.record_failure()
+        fake_clock.now = 4.0
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.allow()
+
+        assert exc_info.value.key == "host:a"
+        assert exc_info.value.retry_after == 6.0
+        assert isinstance(exc_info.value, HTTPError)
+        assert breaker.stats()["rejected"] == 1
+
+    def test_half_open_limits_trials_and_closes(self, fake_clock):
+        """Test half-open admits limited trials and closes on success."""
+        breakers = CircuitBreakerRegistry(
+            failure_threshold=1,
+            recovery_timeout=10,
+            success_threshold=2,
+            clock=fake_clock,
+        )
+        breaker = breakers.get("host:a")
+        breaker.allow()
+        breaker.record_failure()
+        fake_clock.now = 10.0
+
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+        assert breaker.state == HALF_OPEN
+
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_half_open_failure_reopens(self, fake_clock):
+        """Test a failed trial opens the breaker again."""
+        breakers = CircuitBreakerRegistry(
+            failure_threshold=1, recovery_timeout=10, clock=fake_clock
+        )
+        breaker = breakers.get("host:a")
+        breaker.allow()
+        breaker.record_failure()
+        fake_clock.now = 10.0
+
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.retry_after == 10.0
+        assert breaker.stats()["opened"] == 2
+
+    def test_release_frees_trial_slot(self, fake_clock):
+        """Test a cancelled trial doesn't block the next one."""
+        breakers = CircuitBreakerRegistry(
+            failure_threshold=1, recovery_timeout=0, clock=fake_clock
+        )
+        breaker = breakers.get("host:a")
+        breaker.allow()
+        breaker.record_failure()
+
+        breaker.allow()
+        breaker.release()
+        breaker.allow()
+
+        assert breaker.state == HALF_OPEN
+
+    def test_listeners_receive_events(self, fake_clock):
+        """Test state changes are published to listeners."""
+        events = []
+
+        def broken(event):
+            raise RuntimeError("metrics backend down")
+
+        breakers = CircuitBreakerRegistry(
+            failure_threshold=1,
+            recovery_timeout=5,
+            listeners=[broken],
+            clock=fake_clock,
+        )
+        breakers.add_listener(events.append)
+        breaker = breakers.get("proxy:http://p:1")
+
+        breaker.allow()
+        breaker.record_failure()
+        fake_clock.now = 5.0
+        breaker.allow()
+        breaker.record_success()
+
+        assert [(e.previous, e.state) for e in events] == [
+            (CLOSED, OPEN),
+            (OPEN, HALF_OPEN),
+            (HALF_OPEN, CLOSED),
+        ]
+        assert events[0].key == "proxy:http://p:1"
+        assert events[0].failures == 1
+        assert events[1].timestamp == 5.0
+
+    def test_reset(self):
+        """Test reset closes open breakers."""
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        breakers.get("host:a").allow()
+        breakers.get("host:a").record_failure()
+
+        breakers.reset()
+
+        assert breakers.stats()["host:a"]["state"] == CLOSED
+
+    def test_invalid_configuration(self):
+        """Test invalid thresholds are rejected."""
+        with pytest.raises(ConfigurationError):
+            CircuitBreakerRegistry(failure_threshold=0)
+        with pytest.raises(ConfigurationError):
+            CircuitBreakerRegistry(half_open_max_calls=0)
+
+
+class TestBaseClientCircuitBreakers:
+    """Tests for circuit breakers in the BaseClient request path."""
+
+    @pytest.mark.asyncio
+    async def test_server_errors_open_host_circuit(self, api_client, mock_api):
+        """Test an open host circuit stops requests from being sent."""
+        transport = mock_api(status_code=503, json={})
+        breakers = CircuitBreakerRegistry(failure_threshold=2)
+        client = api_client(transport=transport, circuit_breakers=breakers)
+
+        for _ in range(2):
+            with pytest.raises(HTTPError, match="503"):
+                await client._fetch("GET", "/items")
+        with pytest.raises(CircuitOpenError, match="host:api.test.com"):
+            await client._fetch("GET", "/items")
+
+        assert len(transport.requests) == 2
+        assert breakers.stats()["host:api.test.com"]["state"] == OPEN
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_circuits_are_per_host(self, api_client, mock_api):
+        """Test one failing host doesn't block others."""
+        transport = mock_api(status_code=500, json={})
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        client = api_client(transport=transport, circuit_breakers=breakers)
+
+        with pytest.raises(HTTPError):
+            await client._fetch("GET", "/items")
+        transport.status_code = 200
+        client.base_url = "http://other.test.com"
+
+        assert await client._fetch("GET", "/items") == {}
+        hosts = [request.url.host for request in transport.requests]
+        assert hosts == ["api.test.com", "other.test.com"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_count(self, api_client, mock_api):
+        """Test 4xx answers count as successes for the host."""
+        transport = mock_api(status_code=404, json={})
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        client = api_client(transport=transport, circuit_breakers=breakers)
+
+        for _ in range(3):
+            with pytest.raises(HTTPError, match="404"):
+                await client._fetch("GET", "/missing")
+
+        assert breakers.stats()["host:api.test.com"]["state"] == CLOSED
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_is_not_retried(self, api_client):
+        """Test CircuitOpenError bypasses the retry policy."""
+
+        def refuse(request):
+            raise httpx.ConnectError("Connection refused")
+
+        breakers = CircuitBreakerRegistry(failure_threshold=2)
+        client = api_client(
+            transport=httpx.MockTransport(refuse),
+            circuit_breakers=breakers,
+            retry_policy=RetryPolicy(max_retries=5, base_delay=0, jitter="none"),
+        )
+
+        with pytest.raises(CircuitOpenError):
+            await client._fetch("GET", "/items")
+
+        assert breakers.get("host:api.test.com").stats()["rejected"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_proxy_opens_proxy_circuit(
+        self, unused_tcp_port, api_client
+    ):
+        """Test connection failures to a proxy open its circuit."""
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        client = api_client(
+            proxy=f"127.0.0.1:{unused_tcp_port}", circuit_breakers=breakers
+        )
+
+        with pytest.raises(HTTPError):
+            await client._fetch("GET", "/items")
+        with pytest.raises(CircuitOpenError, match="proxy:"):
+            await client._fetch("GET", "/items")
+
+        key = f"proxy:http://127.0.0.1:{unused_tcp_port}"
+        assert breakers.stats()[key]["state"] == OPEN
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_proxy_pool_skips_open_circuits(self):
+        """Test the pool routes around proxies whose circuit is open."""
+        used = []
+
+        def factory(proxy):
+            def respond(request):
+                used.append(proxy)
+                status_code = 407 if proxy == "http://bad:1" else 200
+                return httpx.Response(status_code, stream=httpx.ByteStream(b""))
+
+            return httpx.MockTransport(respond)
+
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        pool = ProxyPool(["bad:1", "good:2"], circuit_breakers=breakers)
+        pool.bind(factory)
+
+        for _ in range(4):
+            response = await pool.handle_async_request(
+                httpx.Request("GET", "http://api.test.com/")
+            )
+            await response.aclose()
+
+        assert used == [
+            "http://bad:1",
+            "http://good:2",
+            "http://good:2",
+            "http://good:2",
+        ]
+        assert breakers.stats()["proxy:http://bad:1"]["state"] == OPEN
+
+        await pool.remove("good:2")
+        with pytest.raises(CircuitOpenError, match="circuits"):
+            await pool.handle_async_request(
+                httpx.Request("GET", "http://api.test.com/")
+            )
+
+    def test_client_registry_reaches_proxy_pool(self, api_client):
+        """Test the client's registry is used by its proxy pool."""
+        breakers = CircuitBreakerRegistry()
+        pool = ProxyPool(["a:1"])
+
+        api_client(proxy_pool=pool, circuit_breakers=breakers)
+
+        assert pool.circuit_breakers is breakers
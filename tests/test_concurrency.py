@@ -0,0 +1,210 @@
+"""
+Unit tests for the adaptive concurrency limiter.
+
+Tests cover:
+- AIMD and gradient limit algorithms
+- Slot acquisition, FIFO queueing and cancellation
+- Integration with BaseClient._fetch
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from ravexclient import AIMDLimit, ConcurrencyLimiter, GradientLimit
+from ravexclient.exceptions import ConfigurationError, HTTPError
+
+
+class TestAIMDLimit:
+    """Tests for the AIMD algorithm."""
+
+    def test_increases_when_utilized(self):
+        """Test limit grows by one under load."""
+        algorithm = AIMDLimit(initial_limit=10)
+
+        assert algorithm.update(10, rtt=0.1, in_flight=6, dropped=False) == 11
+
+    def test_holds_when_underutilized(self):
+        """Test limit is unchanged when little capacity is used."""
+        algorithm = AIMDLimit(initial_limit=10)
+
+        assert algorithm.update(10, rtt=0.1, in_flight=2, dropped=False) == 10
+
+    def test_decreases_on_drop_and_timeout(self):
+        """Test drops and slow requests shrink the limit."""
+        algorithm = AIMDLimit(initial_limit=10, backoff_ratio=0.5, timeout=1.0)
+
+        assert algorithm.update(10, rtt=0.1, in_flight=10, dropped=True) == 5
+        assert algorithm.update(10, rtt=2.0, in_flight=10, dropped=False) == 5
+
+    def test_respects_bounds(self):
+        """Test limit stays within min and max."""
+        algorithm = AIMDLimit(initial_limit=2, min_limit=2, max_limit=3)
+
+        assert algorithm.update(2, rtt=0.1, in_flight=2, dropped=True) == 2
+        assert algorithm.update(3, rtt=0.1, in_flight=3, dropped=False) == 3
+
+    def test_invalid_configuration(self):
+        """Test inconsistent bounds raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            AIMDLimit(initial_limit=5, min_limit=10)
+        with pytest.raises(ConfigurationError):
+            AIMDLimit(backoff_ratio=1.5)
+
+
+class TestGradientLimit:
+    """Tests for the latency-gradient algorithm."""
+
+    def test_grows_at_baseline_latency(self):
+        """Test limit grows while latency matches the baseline."""
+        algorithm = GradientLimit(initial_limit=16, smoothing=1.0)
+
+        assert algorithm.update(16, rtt=0.1, in_flight=16, dropped=False) == 20
+
+    def test_shrinks_when_latency_inflates(self):
+        """Test limit shrinks when latency rises well above the baseline."""
+        algorithm = GradientLimit(initial_limit=100, smoothing=1.0, tolerance=1.0)
+        limit = 100.0
+        for _ in range(50):
+            limit = algorithm.update(
+                limit, rtt=0.1, in_flight=int(limit), dropped=False
+            )
+        limit = 100.0
+
+        limit = algorithm.update(limit, rtt=0.4, in_flight=100, dropped=False)
+
+        assert limit < 100
+
+    def test_no_growth_when_app_limited(self):
+        """Test limit holds when fewer than half the slots are used."""
+        algorithm = GradientLimit(initial_limit=20)
+
+        assert algorithm.update(20, rtt=0.1, in_flight=3, dropped=False) == 20
+
+    def test_drop_backs_off(self):
+        """Test dropped requests shrink the limit."""
+        algorithm = GradientLimit(initial_limit=20, backoff_ratio=0.5)
+
+        assert algorithm.update(20, rtt=0.1, in_flight=20, dropped=True) == 10
+
+
+class TestConcurrencyLimiter:
+    """Tests for ConcurrencyLimiter slot management."""
+
+    @pytest.mark.asyncio
+    async def test_queues_beyond_limit(self):
+        """Test callers beyond the limit wait in the queue."""
+        limiter = ConcurrencyLimiter(AIMDLimit(initial_limit=2, max_limit=2))
+
+        first = await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        assert limiter.in_flight == 2
+        assert limiter.queue_depth == 1
+
+        limiter.release(first)
+        await waiter
+
+        assert limiter.queue_depth == 0
+        assert limiter.in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_fifo_order(self):
+        """Test waiters are served in arrival order."""
+        limiter = ConcurrencyLimiter(AIMDLimit(initial_limit=1, max_limit=1))
+        start = await limiter.acquire()
+        order = []
+
+        async def worker(name: str) -> None:
+            token = await limiter.acquire()
+            order.append(name)
+            limiter.release(token)
+
+        tasks = [asyncio.create_task(worker(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        limiter.release(start)
+        await asyncio.gather(*tasks)
+
+        assert order == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test cancelling a queued caller does not leak a slot."""
+        limiter = ConcurrencyLimiter(AIMDLimit(initial_limit=1, max_limit=1))
+        start = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release(start, ignore=True)
+
+        assert limiter.queue_depth == 0
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_release_updates_limit_and_stats(self):
+        """Test released samples drive the algorithm and counters."""
+        limiter = ConcurrencyLimiter(AIMDLimit(initial_limit=10, backoff_ratio=0.5))
+
+        start = await limiter.acquire()
+        limiter.release(start, dropped=True)
+
+        assert limiter.limit == 5
+        assert limiter.stats() == {
+            "limit": 5,
+            "in_flight": 0,
+            "queue_depth": 0,
+            "completed": 1,
+            "dropped": 1,
+        }
+
+
+class TestBaseClientConcurrencyLimiting:
+    """Tests for concurrency limiting inside BaseClient._fetch."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_never_exceeds_limit(self, api_client):
+        """Test concurrent _fetch calls stay within the limit."""
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json={})
+
+        limiter = ConcurrencyLimiter(AIMDLimit(initial_limit=3, max_limit=3))
+        client = api_client(
+            transport=httpx.MockTransport(handler), concurrency_limiter=limiter
+        )
+
+        await asyncio.gather(*(client._fetch("GET", "/data") for _ in range(12)))
+
+        assert peak == 3
+        assert limiter.stats()["completed"] == 12
+        assert limiter.in_flight == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_throttled_response_counts_as_drop(self, api_client):
+        """Test 503 responses shrink the limit."""
+        limiter = ConcurrencyLimiter(AIMDLimit(initial_limit=10, backoff_ratio=0.5))
+        client = api_client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+            concurrency_limiter=limiter,
+        )
+
+        with pytest.raises(HTTPError):
+            await client._fetch("GET", "/data")
+
+        assert limiter.limit == 5
+        assert limiter.in_flight == 0
+        await client.close()
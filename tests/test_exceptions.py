@@ -12,10 +12,14 @@ import pytest
 from ravexclient.exceptions import (
     RavexClientError,
     HTTPError,
+    PoolTimeoutError,
+    CircuitOpenError,
     ProxyError,
     AuthenticationError,
     ConfigurationError,
     TimeoutError,
+    RateLimitError,
+    ResponseTooLargeError,
 )
 
 
@@ -90,6 +94,57 @@ class TestHTTPError:
         assert error.details["response_body"] == {"error": "Internal error"}
 
 
+class TestPoolTimeoutError:
+    """Tests for PoolTimeoutError."""
+
+    def test_pool_timeout_error_creation(self):
+        """Test basic pool timeout error creation."""
+        error = PoolTimeoutError("Timed out waiting for a pooled connection")
+
+        assert error.message == "Timed out waiting for a pooled connection"
+        assert error.status_code is None
+
+    def test_pool_timeout_error_is_http_error(self):
+        """Test PoolTimeoutError can be caught as HTTPError."""
+        error = PoolTimeoutError("Pool exhausted")
+
+        assert isinstance(error, HTTPError)
+        assert isinstance(error, RavexClientError)
+
+
+class TestCircuitOpenError:
+    """Tests for CircuitOpenError."""
+
+    def test_circuit_open_error_creation(self):
+        """Test circuit open error with key and retry hint."""
+        error = CircuitOpenError(
+            "Circuit for host:api.test.com is open",
+            key="host:api.test.com",
+            retry_after=12.5,
+        )
+
+        assert error.key == "host:api.test.com"
+        assert error.retry_after == 12.5
+        assert error.details["retry_after"] == 12.5
+        assert error.status_code is None
+        assert isinstance(error, HTTPError)
+
+
+class TestResponseTooLargeError:
+    """Tests for ResponseTooLargeError."""
+
+    def test_response_too_large_error_creation(self):
+        """Test response too large error with its limit."""
+        error = ResponseTooLargeError(
+            "Response body exceeds 1024 bytes", status_code=200, max_bytes=1024
+        )
+
+        assert error.max_bytes == 1024
+        assert error.details["max_bytes"] == 1024
+        assert error.status_code == 200
+        assert isinstance(error, HTTPError)
+
+
 class TestProxyError:
     """Tests for ProxyError."""
 
@@ -176,6 +231,25 @@ class TestTimeoutError:
         assert error.details["endpoint"] == "/api/users"
 
 
+class TestRateLimitError:
+    """Tests for RateLimitError."""
+
+    def test_rate_limit_error_creation(self):
+        """Test basic rate limit error creation."""
+        error = RateLimitError("Rate limit exceeded")
+
+        assert error.message == "Rate limit exceeded"
+        assert error.retry_after is None
+        assert isinstance(error, RavexClientError)
+
+    def test_rate_limit_error_with_retry_after(self):
+        """Test rate limit error with retry hint."""
+        error = RateLimitError("Rate limit exceeded", retry_after=1.5)
+
+        assert error.retry_after == 1.5
+        assert error.details["retry_after"] == 1.5
+
+
 class TestExceptionHierarchy:
     """Tests for exception hierarchy and inheritance."""
 
@@ -187,6 +261,7 @@ class TestExceptionHierarchy:
             AuthenticationError("test"),
             ConfigurationError("test"),
             TimeoutError("test"),
+            RateLimitError("test"),
         ]
 
         for error in exceptions:
@@ -0,0 +1,255 @@
+"""
+Unit tests for hedged requests.
+
+Tests cover:
+- Hedge delay from the latency percentile
+- Extra load budget and counters
+- Hedged attempts in BaseClient._fetch, cancellation of the loser
+- Hedging through a different proxy of a pool
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from ravexclient import HedgePolicy, ProxyPool, last_response_info
+from ravexclient.exceptions import ConfigurationError, HTTPError
+from ravexclient.proxypool import PROXY_EXTENSION
+
+
+def _policy(**kwargs):
+    kwargs.setdefault("initial_delay", 0.02)
+    kwargs.setdefault("max_extra_load", 1.0)
+    policy = HedgePolicy(**kwargs)
+    # Earn budget so the first hedge is allowed.
+    for _ in range(5):
+        policy.budget.record_request()
+    return policy
+
+
+class TestHedgePolicy:
+    """Tests for HedgePolicy delay and budget."""
+
+    def test_initial_delay_until_enough_samples(self):
+        """Test the initial delay is used before min_samples latencies."""
+        policy = HedgePolicy(initial_delay=0.3, min_samples=3)
+        policy.record_latency(0.01)
+        policy.record_latency(0.01)
+
+        assert policy.delay == 0.3
+
+    def test_delay_follows_percentile(self):
+        """Test the delay is the configured latency percentile."""
+        policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0)
+        for i in range(1, 101):
+            policy.record_latency(i / 1000)
+
+        assert policy.delay == pytest.approx(0.090)
+
+    def test_delay_is_clamped(self):
+        """Test the delay respects min_delay and max_delay."""
+        policy = HedgePolicy(min_samples=1, min_delay=0.05, max_delay=1.0)
+        policy.record_latency(0.001)
+        assert policy.delay == 0.05
+
+        slow = HedgePolicy(min_samples=1, max_delay=1.0)
+        slow.record_latency(30.0)
+        assert slow.delay == 1.0
+
+    def test_budget_caps_extra_load(self):
+        """Test hedges are limited to max_extra_load per request."""
+        policy = HedgePolicy(max_extra_load=0.1)
+        for _ in range(20):
+            policy.record_request()
+
+        granted = sum(policy.try_hedge() for _ in range(5))
+
+        assert granted == 2
+        assert policy.stats()["denied"] == 3
+        assert policy.stats()["extra_load"] == 0.1
+
+    def test_methods(self):
+        """Test only configured methods are hedged unless forced."""
+        policy = HedgePolicy()
+
+        assert policy.applies_to("get")
+        assert not policy.applies_to("POST")
+        assert policy.applies_to("POST", force=True)
+
+    def test_invalid_configuration(self):
+        """Test invalid settings raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            HedgePolicy(percentile=100)
+        with pytest.raises(ConfigurationError):
+            HedgePolicy(min_delay=2, max_delay=1)
+
+
+class TestBaseClientHedging:
+    """Tests for hedged requests in BaseClient."""
+
+    @pytest.mark.asyncio
+    async def test_slow_attempt_is_hedged(self, api_client, mock_api):
+        """Test a backup attempt answers for a slow first attempt."""
+        transport = mock_api(
+            script=[
+                {"delay": 0.5, "json": {"attempt": "first"}},
+                {"json": {"attempt": "hedge"}},
+            ]
+        )
+        policy = _policy()
+        client = api_client(transport=transport, hedge_policy=policy)
+
+        data = await client._get("/items")
+
+        assert data == {"attempt": "hedge"}
+        assert len(transport.requests) == 2
+        assert transport.cancelled == 1
+        assert policy.stats()["hedges"] == 1
+        assert policy.stats()["hedge_wins"] == 1
+        assert last_response_info().status_code == 200
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_fast_attempt_is_not_hedged(self, api_client, mock_api):
+        """Test requests answering before the delay are sent once."""
+        transport = mock_api(json={"attempt": "first"})
+        policy = _policy(initial_delay=1.0)
+        client = api_client(transport=transport, hedge_policy=policy)
+
+        for _ in range(3):
+            assert await client._get("/items") == {"attempt": "first"}
+
+        assert len(transport.requests) == 3
+        assert policy.stats()["hedges"] == 0
+        assert policy.stats()["requests"] == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_first_attempt_can_still_win(self, api_client, mock_api):
+        """Test the first attempt wins if it answers before the hedge."""
+        transport = mock_api(
+            script=[
+                {"delay": 0.05, "json": {"attempt": "first"}},
+                {"delay": 0.5, "json": {"attempt": "hedge"}},
+            ]
+        )
+        policy = _policy()
+        client = api_client(transport=transport, hedge_policy=policy)
+
+        assert await client._get("/items") == {"attempt": "first"}
+        assert policy.stats()["hedges"] == 1
+        assert policy.stats()["hedge_wins"] == 0
+        assert transport.cancelled == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_waits_for_the_other(self, api_client, mock_api):
+        """Test a failing attempt doesn't beat a slower successful one."""
+        transport = mock_api(
+            script=[
+                {"delay": 0.05, "error": httpx.ConnectError("Connection reset")},
+                {"delay": 0.1, "json": {"attempt": "hedge"}},
+            ]
+        )
+        client = api_client(transport=transport, hedge_policy=_policy())
+
+        assert await client._get("/items") == {"attempt": "hedge"}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_all_attempts_fail(self, api_client, mock_api):
+        """Test the first attempt's error is raised when both fail."""
+        transport = mock_api(
+            script=[
+                {"delay": 0.05, "error": httpx.ConnectError("first failed")},
+                {"delay": 0.01, "error": httpx.ConnectError("hedge failed")},
+            ]
+        )
+        client = api_client(transport=transport, hedge_policy=_policy())
+
+        with pytest.raises(HTTPError, match="first failed"):
+            await client._get("/items")
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_budget_prevents_hedge(self, api_client, mock_api):
+        """Test no backup attempt is sent without budget."""
+        transport = mock_api(
+            script=[
+                {"delay": 0.05, "json": {"attempt": "first"}},
+                {"json": {"attempt": "hedge"}},
+            ]
+        )
+        policy = HedgePolicy(initial_delay=0.01, max_extra_load=0)
+        client = api_client(transport=transport, hedge_policy=policy)
+
+        assert await client._get("/items") == {"attempt": "first"}
+        assert len(transport.requests) == 1
+        assert policy.stats()["denied"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_hedged_by_default(self, api_client, mock_api):
+        """Test non-idempotent methods need hedge=True."""
+        transport = mock_api(
+            script=[
+                {"delay": 0.05, "json": {"attempt": "first"}},
+                {"json": {"attempt": "hedge"}},
+            ]
+        )
+        client = api_client(transport=transport, hedge_policy=_policy())
+
+        assert await client._post("/items", payload={}) == {"attempt": "first"}
+        assert len(transport.requests) == 1
+        assert await client._get("/items", hedge=False) == {"attempt": "hedge"}
+        assert len(transport.requests) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_hedge_uses_another_proxy(self, api_client):
+        """Test the backup attempt goes through a different proxy."""
+        seen = []
+
+        def factory(proxy):
+            async def respond(request):
+                seen.append(proxy)
+                if len(seen) == 1:
+                    await asyncio.sleep(0.5)
+                return httpx.Response(200, json={"proxy": proxy})
+
+            return httpx.MockTransport(respond)
+
+        pool = ProxyPool(["a:1", "b:2"], strategy="least_in_flight")
+        client = api_client(proxy_pool=pool, hedge_policy=_policy())
+        pool._factory = None
+        pool.bind(factory)
+
+        data = await client._get("/items")
+
+        assert seen == ["http://a:1", "http://b:2"]
+        assert data == {"proxy": "http://b:2"}
+        assert last_response_info().proxy == "http://b:2"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pinned_proxy_is_kept(self, api_client):
+        """Test hedging doesn't override an explicitly pinned proxy."""
+        seen = []
+
+        def factory(proxy):
+            def respond(request):
+                seen.append(proxy)
+                return httpx.Response(200, json={})
+
+            return httpx.MockTransport(respond)
+
+        pool = ProxyPool(["a:1", "b:2"])
+        client = api_client(proxy_pool=pool, hedge_policy=_policy())
+        pool._factory = None
+        pool.bind(factory)
+
+        await client._get("/items", extensions={PROXY_EXTENSION: "b:2"})
+
+        assert seen == ["http://b:2"]
+        await client.close()
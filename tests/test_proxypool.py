@@ -0,0 +1,410 @@
+"""
+Unit tests for proxy pools.
+
+Tests cover:
+- Round-robin, least-in-flight and latency-weighted selection
+- Draining removed proxies without closing busy connections
+- Per-proxy error counters
+- Health checks, quarantine and exponential re-admission
+- Integration with BaseClient against loopback proxies
+"""
+
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from ravexclient import HealthCheck, ProxyPool, last_response_info
+from ravexclient.exceptions import ConfigurationError, ProxyError
+from ravexclient.proxypool import PROXY_EXTENSION
+
+
+def _bound_pool(mock_api, proxies, **kwargs):
+    transports = {}
+
+    def factory(proxy):
+        transports[proxy] = mock_api(json={})
+        return transports[proxy]
+
+    pool = ProxyPool(proxies, **kwargs)
+    pool.bind(factory)
+    return pool, transports
+
+
+async def _send(pool, **extensions):
+    request = httpx.Request("GET", "http://api.test.com/", extensions=extensions)
+    return await pool.handle_async_request(request)
+
+
+async def _route(pool, count, **extensions):
+    """Send ``count`` requests, closing each, and return the proxies used."""
+    proxies = []
+    for _ in range(count):
+        response = await _send(pool, **extensions)
+        proxies.append(response.extensions[PROXY_EXTENSION])
+        await response.aclose()
+    return proxies
+
+
+@pytest.fixture
+async def proxy_servers(local_server_factory):
+    """Start two loopback servers acting as forward proxies."""
+    return [await local_server_factory(), await local_server_factory()]
+
+
+class TestProxyPoolSelection:
+    """Tests for proxy selection strategies."""
+
+    @pytest.mark.asyncio
+    async def test_round_robin(self, mock_api):
+        """Test proxies are used in turn."""
+        pool, _ = _bound_pool(mock_api, ["a:1", "b:2", "c:3"])
+
+        proxies = await _route(pool, 6)
+
+        assert proxies == ["http://a:1", "http://b:2", "http://c:3"] * 2
+
+    @pytest.mark.asyncio
+    async def test_least_in_flight(self, mock_api):
+        """Test busy proxies are avoided."""
+        pool, _ = _bound_pool(mock_api, ["a:1", "b:2"], strategy="least_in_flight")
+
+        held = await _send(pool)
+        proxies = await _route(pool, 3)
+
+        assert held.extensions[PROXY_EXTENSION] == "http://a:1"
+        assert proxies == ["http://b:2"] * 3
+        await held.aclose()
+        assert pool.stats()["http://a:1"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_latency_weighted_prefers_fast_proxies(self, mock_api):
+        """Test faster proxies receive most of the traffic."""
+        pool, _ = _bound_pool(
+            mock_api, ["fast:1", "slow:2"], strategy="latency_weighted"
+        )
+        pool._proxies["http://fast:1"].latency = 0.01
+        pool._proxies["http://slow:2"].latency = 1.0
+        random.seed(0)
+
+        proxies = await _route(pool, 200)
+
+        assert proxies.count("http://fast:1") > 180
+
+    @pytest.mark.asyncio
+    async def test_pinned_proxy(self, mock_api):
+        """Test the request extension selects a specific proxy."""
+        pool, _ = _bound_pool(mock_api, ["a:1", "b:2"])
+
+        proxies = await _route(pool, 2, **{PROXY_EXTENSION: "b:2"})
+
+        assert proxies == ["http://b:2"] * 2
+
+    @pytest.mark.asyncio
+    async def test_empty_pool_raises_proxy_error(self, mock_api):
+        """Test a pool without proxies refuses requests."""
+        pool, _ = _bound_pool(mock_api, [])
+
+        with pytest.raises(ProxyError, match="No proxies"):
+            await _send(pool)
+
+    def test_invalid_strategy(self):
+        """Test unknown strategies are rejected."""
+        with pytest.raises(ConfigurationError, match="strategy"):
+            ProxyPool(["a:1"], strategy="random")
+
+    def test_pool_binds_once(self, mock_api):
+        """Test a pool cannot serve two clients."""
+        pool, _ = _bound_pool(mock_api, ["a:1"])
+
+        with pytest.raises(ConfigurationError, match="already used"):
+            pool.bind(lambda proxy: httpx.MockTransport(lambda r: httpx.Response(200)))
+
+
+class TestProxyPoolLifecycle:
+    """Tests for adding, removing and failing proxies."""
+
+    @pytest.mark.asyncio
+    async def test_add_creates_transport(self, mock_api):
+        """Test proxies added later get their own transport."""
+        pool, transports = _bound_pool(mock_api, ["a:1"])
+
+        pool.add("b:2")
+        proxies = await _route(pool, 2)
+
+        assert set(transports) == {"http://a:1", "http://b:2"}
+        assert proxies == ["http://a:1", "http://b:2"]
+
+    @pytest.mark.asyncio
+    async def test_remove_waits_for_in_flight_requests(self, mock_api):
+        """Test a removed proxy is closed only after its requests finish."""
+        pool, transports = _bound_pool(mock_api, ["a:1", "b:2"])
+        held = await _send(pool)
+
+        removal = asyncio.create_task(pool.remove("a:1"))
+        await asyncio.sleep(0)
+        assert await _route(pool, 1) == ["http://b:2"]
+
+        assert pool.proxies == ["http://b:2"]
+        assert not removal.done()
+        assert not transports["http://a:1"].closed
+
+        await held.aclose()
+        await removal
+        assert transports["http://a:1"].closed
+        assert len(transports["http://a:1"].requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted_per_proxy(self):
+        """Test failures and ProxyErrors are tracked per proxy."""
+
+        def refuse(request):
+            raise httpx.ProxyError("407 Proxy Authentication Required")
+
+        pool = ProxyPool(["a:1"])
+        pool.bind(lambda proxy: httpx.MockTransport(refuse))
+
+        with pytest.raises(httpx.ProxyError):
+            await _send(pool)
+
+        stats = pool.stats()["http://a:1"]
+        assert stats["errors"] == 1
+        assert stats["proxy_errors"] == 1
+        assert stats["in_flight"] == 0
+
+
+def _health_pool(proxies, dead, clock, **kwargs):
+    """Pool whose proxies in ``dead`` refuse every request."""
+
+    def factory(proxy):
+        def respond(request):
+            if proxy in dead:
+                raise httpx.ProxyError("Connection refused")
+            return httpx.Response(200, stream=httpx.ByteStream(b"{}"))
+
+        return httpx.MockTransport(respond)
+
+    check = HealthCheck(
+        "http://health.test.com/", failure_threshold=2, quarantine=10, **kwargs
+    )
+    pool = ProxyPool(proxies, health_check=check, clock=clock)
+    pool.bind(factory)
+    return pool
+
+
+class TestProxyHealth:
+    """Tests for proxy health checks and quarantine."""
+
+    @pytest.mark.asyncio
+    async def test_failing_probes_quarantine_proxy(self, fake_clock):
+        """Test consecutive probe failures take a proxy out of rotation."""
+        dead = {"http://b:2"}
+        pool = _health_pool(["a:1", "b:2"], dead, fake_clock)
+
+        assert await pool.check_health() == {"http://a:1": True, "http://b:2": False}
+        assert pool.healthy == ["http://a:1", "http://b:2"]
+        await pool.check_health()
+
+        assert pool.healthy == ["http://a:1"]
+        stats = pool.stats()["http://b:2"]
+        assert stats["quarantined"]
+        assert stats["quarantined_for"] == 10
+        assert stats["proxy_errors"] == 2
+        assert stats["proxy_error_rate"] == 1.0
+        for _ in range(3):
+            response = await _send(pool)
+            assert response.extensions[PROXY_EXTENSION] == "http://a:1"
+            await response.aclose()
+
+    @pytest.mark.asyncio
+    async def test_request_failures_quarantine_proxy(self, fake_clock):
+        """Test failed requests count towards quarantine."""
+        pool = _health_pool(["a:1"], {"http://a:1"}, fake_clock)
+
+        for _ in range(2):
+            with pytest.raises(httpx.ProxyError):
+                await _send(pool)
+
+        with pytest.raises(ProxyError, match="quarantined"):
+            await _send(pool)
+        with pytest.raises(ProxyError, match="quarantined"):
+            await _send(pool, **{PROXY_EXTENSION: "a:1"})
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_readmission_requires_probe_and_backs_off(self, fake_clock):
+        """Test quarantine ends on a good probe and doubles on relapse."""
+        dead = {"http://a:1"}
+        pool = _health_pool(["a:1"], dead, fake_clock)
+        await pool.check_health()
+        await pool.check_health()
+
+        # Not probed again until the quarantine expires.
+        assert await pool.check_health() == {}
+        fake_clock.now = 10.0
+        assert pool.healthy == []
+        assert await pool.check_health() == {"http://a:1": False}
+        assert pool.healthy == []
+
+        dead.clear()
+        assert await pool.check_health() == {"http://a:1": True}
+        assert pool.healthy == ["http://a:1"]
+
+        dead.add("http://a:1")
+        await pool.check_health()
+        await pool.check_health()
+        assert pool.stats()["http://a:1"]["quarantined_for"] == 20
+        assert pool.stats()["http://a:1"]["strikes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_recovery_resets_backoff(self, fake_clock):
+        """Test consecutive successes reset the quarantine length."""
+        pool = _health_pool(["a:1"], set(), fake_clock, recovery_successes=2)
+        pool.quarantine("a:1")
+        fake_clock.now = 10.0
+
+        for _ in range(2):
+            await pool.check_health()
+
+        assert pool.stats()["http://a:1"]["strikes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_rate_quarantine(self, fake_clock):
+        """Test an intermittently failing proxy is quarantined by error rate."""
+        outcomes = iter([True, False] * 20)
+
+        def respond(request):
+            if next(outcomes):
+                return httpx.Response(200, stream=httpx.ByteStream(b"{}"))
+            return httpx.Response(407)
+
+        check = HealthCheck("http://health.test.com/", max_error_rate=0.4)
+        pool = ProxyPool(["a:1"], health_check=check, clock=fake_clock)
+        pool.bind(lambda proxy: httpx.MockTransport(respond))
+
+        for _ in range(12):
+            await pool.check_health()
+
+        stats = pool.stats()["http://a:1"]
+        assert stats["quarantined"]
+        assert stats["probe_failures"] >= 5
+
+    @pytest.mark.asyncio
+    async def test_latency_weighted_uses_error_rate(self, mock_api):
+        """Test unreliable proxies get less traffic at equal latency."""
+        pool, _ = _bound_pool(
+            mock_api, ["good:1", "flaky:2"], strategy="latency_weighted"
+        )
+        for state in pool._proxies.values():
+            state.latency = 0.1
+        pool._proxies["http://flaky:2"].error_rate = 0.9
+        random.seed(0)
+
+        proxies = await _route(pool, 200)
+
+        assert proxies.count("http://good:1") > 160
+
+    @pytest.mark.asyncio
+    async def test_manual_quarantine_expires_without_health_check(self, fake_clock):
+        """Test quarantine without a health check lapses on its own."""
+        pool = ProxyPool(["a:1", "b:2"], clock=fake_clock)
+        pool.bind(lambda proxy: httpx.MockTransport(lambda r: httpx.Response(200)))
+
+        pool.quarantine("a:1", 5)
+        assert pool.healthy == ["http://b:2"]
+        fake_clock.now = 5.0
+        assert pool.healthy == ["http://a:1", "http://b:2"]
+
+    @pytest.mark.asyncio
+    async def test_background_probes(self, proxy_servers, api_client):
+        """Test the pool probes proxies in the background once in use."""
+        check = HealthCheck("http://api.test.com/health", interval=0.01)
+        pool = ProxyPool([server.url for server in proxy_servers], health_check=check)
+        client = api_client(proxy_pool=pool)
+
+        await client._fetch("GET", "/items")
+        await asyncio.sleep(0.05)
+
+        for server in proxy_servers:
+            assert ("HEAD", "http://api.test.com/health") in server.requests
+        assert all(stats["probes"] > 0 for stats in pool.stats().values())
+        await client.close()
+        assert pool._health_task is None
+
+    def test_check_health_requires_config(self):
+        """Test check_health needs a health check configuration."""
+        with pytest.raises(ConfigurationError, match="health_check"):
+            asyncio.run(ProxyPool(["a:1"]).check_health())
+
+
+class TestBaseClientProxyPool:
+    """Tests for BaseClient with a proxy pool."""
+
+    @pytest.mark.asyncio
+    async def test_requests_rotate_over_warm_connections(
+        self, proxy_servers, api_client
+    ):
+        """Test rotation keeps one warm connection per proxy."""
+        pool = ProxyPool([server.url for server in proxy_servers])
+        client = api_client(proxy_pool=pool)
+
+        for i in range(6):
+            await client._fetch("GET", f"/{i}")
+
+        assert [len(server.requests) for server in proxy_servers] == [3, 3]
+        assert [server.connections for server in proxy_servers] == [1, 1]
+        assert last_response_info().proxy == proxy_servers[1].url
+        assert pool.stats()[proxy_servers[0].url]["connections_reused"] == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_remove_does_not_break_in_flight_request(
+        self, proxy_servers, api_client
+    ):
+        """Test removing a proxy lets its in-flight request complete."""
+        proxy_servers[0].delay = 0.05
+        pool = ProxyPool([server.url for server in proxy_servers])
+        client = api_client(proxy_pool=pool)
+
+        request = asyncio.create_task(client._fetch("GET", "/slow"))
+        await asyncio.sleep(0.01)
+        await pool.remove(proxy_servers[0].url)
+
+        assert await request == {"method": "GET", "path": "http://api.test.com/slow"}
+        assert pool.proxies == [proxy_servers[1].url]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_warmup_warms_every_proxy(self, proxy_servers, api_client):
+        """Test warmup opens connections through each proxy."""
+        pool = ProxyPool([server.url for server in proxy_servers])
+        client = api_client(proxy_pool=pool)
+
+        result = await client.warmup(connections=2)
+
+        assert result["requested"] == 4
+        assert result["succeeded"] == 4
+        assert result[f"succeeded[{proxy_servers[0].url}]"] == 2
+        assert [server.connections for server in proxy_servers] == [2, 2]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_warmup_skips_quarantined_proxy(self, proxy_servers, api_client):
+        """Test warmup only goes through proxies eligible for requests."""
+        pool = ProxyPool([server.url for server in proxy_servers])
+        client = api_client(proxy_pool=pool)
+        pool.quarantine(proxy_servers[0].url, seconds=60)
+
+        result = await asyncio.wait_for(client.warmup(connections=2), 1)
+
+        assert result["requested"] == 2
+        assert result["succeeded"] == 2
+        assert f"succeeded[{proxy_servers[0].url}]" not in result
+        assert [server.connections for server in proxy_servers] == [0, 2]
+        await client.close()
+
+    def test_proxy_pool_excludes_single_proxy(self, api_client):
+        """Test proxy and proxy_pool are mutually exclusive."""
+        with pytest.raises(ConfigurationError, match="proxy_pool"):
+            api_client(proxy="proxy.example.com:8080", proxy_pool=ProxyPool(["a:1"]))
@@ -0,0 +1,289 @@
+"""
+Unit tests for the client-side rate limiter.
+
+Tests cover:
+- Token bucket refill, burst and reservations
+- Pattern matching and default limits
+- Blocking and non-blocking acquisition
+- Adaptive rates and client-wide pauses
+- Integration with BaseClient._fetch
+"""
+
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from ravexclient import RateLimit, RateLimiter
+from ravexclient.exceptions import ConfigurationError, HTTPError, RateLimitError
+from ravexclient.ratelimit import TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_empty(self, fake_clock):
+        """Test bucket starts full and drains to empty."""
+        bucket = TokenBucket(rate=1, burst=3, clock=fake_clock)
+
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_refill_is_capped_by_burst(self, fake_clock):
+        """Test tokens refill over time up to the burst size."""
+        bucket = TokenBucket(rate=2, burst=4, clock=fake_clock)
+        for _ in range(4):
+            bucket.try_acquire()
+
+        fake_clock.now = 1.0
+        assert bucket.tokens == pytest.approx(2.0)
+
+        fake_clock.now = 100.0
+        assert bucket.tokens == pytest.approx(4.0)
+
+    def test_reservations_queue_in_order(self, fake_clock):
+        """Test successive reservations wait progressively longer."""
+        bucket = TokenBucket(rate=10, burst=1, clock=fake_clock)
+
+        waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits == [pytest.approx(0.0), pytest.approx(0.1), pytest.approx(0.2)]
+
+    def test_reserve_respects_max_wait(self, fake_clock):
+        """Test reservations beyond max_wait are refused without side effects."""
+        bucket = TokenBucket(rate=1, burst=1, clock=fake_clock)
+        bucket.reserve()
+
+        assert bucket.reserve(max_wait=0.5) is None
+        assert bucket.tokens == pytest.approx(0.0)
+
+    def test_invalid_configuration(self):
+        """Test invalid rates raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            TokenBucket(rate=0)
+        with pytest.raises(ConfigurationError):
+            TokenBucket(rate=5, burst=0.5)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_reservation(self):
+        """Test cancelling a waiting acquire returns its token."""
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.try_acquire()
+
+        task = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert bucket.tokens > -0.5
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter pattern matching and acquisition."""
+
+    def test_first_matching_pattern_wins(self):
+        """Test patterns are matched in order with default fallback."""
+        limiter = RateLimiter(
+            [RateLimit("/users/*", rate=50, burst=100), RateLimit("/users", rate=5)],
+            default=RateLimit("*", rate=1),
+        )
+
+        assert limiter.match("/users/1/posts").pattern == "/users/*"
+        assert limiter.match("/users").pattern == "/users"
+        assert limiter.match("/orders").pattern == "*"
+
+    def test_unmatched_endpoint_is_not_limited(self):
+        """Test endpoints without a matching limit always pass."""
+        limiter = RateLimiter([RateLimit("/users/*", rate=1)])
+
+        assert all(limiter.try_acquire("/orders") for _ in range(10))
+
+    def test_pattern_bucket_is_shared(self):
+        """Test all endpoints matching a pattern share one bucket."""
+        limiter = RateLimiter([RateLimit("/users/*", rate=1, burst=2)])
+
+        assert limiter.try_acquire("/users/1")
+        assert limiter.try_acquire("/users/2")
+        assert not limiter.try_acquire("/users/3")
+        assert limiter.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_non_blocking_acquire_raises(self):
+        """Test non-blocking acquire raises RateLimitError when empty."""
+        limiter = RateLimiter([RateLimit("*", rate=1, burst=1)], blocking=False)
+
+        await limiter.acquire("/a")
+        with pytest.raises(RateLimitError) as exc_info:
+            await limiter.acquire("/a")
+
+        assert exc_info.value.retry_after == pytest.approx(1.0, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_blocking_acquire_waits(self):
+        """Test blocking acquire paces requests at the configured rate."""
+        limiter = RateLimiter([RateLimit("*", rate=50, burst=1)])
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        for _ in range(3):
+            await limiter.acquire("/a")
+
+        assert loop.time() - started >= 0.035
+        assert limiter.stats()["waited"] > 0
+
+    @pytest.mark.asyncio
+    async def test_max_wait_exceeded(self):
+        """Test blocking acquire gives up past max_wait."""
+        limiter = RateLimiter([RateLimit("*", rate=1, burst=1)], max_wait=0.1)
+
+        await limiter.acquire("/a")
+        with pytest.raises(RateLimitError):
+            await limiter.acquire("/a")
+
+
+class TestBaseClientRateLimiting:
+    """Tests for rate limiting inside BaseClient._fetch."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_sheds_load_when_non_blocking(self, api_client):
+        """Test _fetch raises RateLimitError without sending the request."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={})
+
+        client = api_client(
+            transport=httpx.MockTransport(handler),
+            rate_limiter=RateLimiter([RateLimit("/users/*", rate=1, burst=1)]),
+        )
+
+        await client._fetch("GET", "/users/1")
+        with pytest.raises(RateLimitError):
+            await client._fetch("GET", "/users/2", rate_limit_blocking=False)
+        await client._fetch("GET", "/orders")
+
+        assert [request.url.path for request in calls] == ["/users/1", "/orders"]
+        await client.close()
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for adaptive rate limiting driven by server feedback."""
+
+    @staticmethod
+    def _limiter(clock: Callable[[], float], **kwargs) -> RateLimiter:
+        return RateLimiter(
+            [RateLimit("/users/*", rate=40, burst=40)],
+            adaptive=True,
+            clock=clock,
+            **kwargs,
+        )
+
+    def test_429_shrinks_rate_multiplicatively(self, fake_clock):
+        """Test throttled responses halve the bucket rate."""
+        limiter = self._limiter(fake_clock)
+
+        limiter.observe("/users/1", httpx.Response(429))
+
+        assert limiter.bucket_for("/users/1").rate == 20
+        assert limiter.stats()["decreases"] == 1
+
+    def test_remaining_zero_shrinks_rate(self, fake_clock):
+        """Test RateLimit-Remaining: 0 is treated as throttling."""
+        limiter = self._limiter(fake_clock)
+
+        limiter.observe(
+            "/users/1", httpx.Response(200, headers={"RateLimit-Remaining": "0"})
+        )
+
+        assert limiter.bucket_for("/users/1").rate == 20
+
+    def test_decrease_cooldown_coalesces_bursts(self, fake_clock):
+        """Test concurrent 429s only shrink the rate once per cooldown."""
+        limiter = self._limiter(fake_clock, decrease_cooldown=1.0)
+
+        for _ in range(5):
+            limiter.observe("/users/1", httpx.Response(429))
+        assert limiter.bucket_for("/users/1").rate == 20
+
+        fake_clock.now = 2.0
+        limiter.observe("/users/1", httpx.Response(429))
+        assert limiter.bucket_for("/users/1").rate == 10
+
+    def test_rate_floor(self, fake_clock):
+        """Test rate never drops below min_rate."""
+        limiter = self._limiter(fake_clock, min_rate=5, decrease_cooldown=0)
+
+        for _ in range(10):
+            limiter.observe("/users/1", httpx.Response(429))
+
+        assert limiter.bucket_for("/users/1").rate == 5
+
+    def test_healthy_responses_grow_rate_to_ceiling(self, fake_clock):
+        """Test successes increase the rate additively up to the limit."""
+        limiter = self._limiter(fake_clock, increase_step=5)
+        limiter.observe("/users/1", httpx.Response(429))
+
+        limiter.observe("/users/1", httpx.Response(200))
+        assert limiter.bucket_for("/users/1").rate == 25
+
+        for _ in range(10):
+            limiter.observe("/users/1", httpx.Response(200))
+        assert limiter.bucket_for("/users/1").rate == 40
+
+    def test_non_adaptive_ignores_feedback(self):
+        """Test static limiters do not change on 429."""
+        limiter = RateLimiter([RateLimit("*", rate=10)])
+
+        limiter.observe("/a", httpx.Response(429, headers={"Retry-After": "5"}))
+
+        assert limiter.bucket_for("/a").rate == 10
+        assert limiter.paused_for == 0
+
+    def test_retry_after_pauses_all_endpoints(self, fake_clock):
+        """Test a Retry-After pauses the limiter for every endpoint."""
+        limiter = self._limiter(fake_clock)
+
+        limiter.observe("/users/1", httpx.Response(429, headers={"Retry-After": "3"}))
+
+        assert limiter.paused_for == 3
+        assert not limiter.try_acquire("/orders")
+        fake_clock.now = 3.5
+        assert limiter.try_acquire("/orders")
+
+    def test_pause_is_capped(self, fake_clock):
+        """Test server pauses longer than max_pause are truncated."""
+        limiter = self._limiter(fake_clock, max_pause=10)
+
+        limiter.observe("/users/1", httpx.Response(503, headers={"Retry-After": "600"}))
+
+        assert limiter.paused_for == 10
+
+    @pytest.mark.asyncio
+    async def test_waiters_resume_together_after_pause(self):
+        """Test concurrent acquires wait out a shared pause."""
+        limiter = RateLimiter(adaptive=True)
+        limiter.pause(0.05)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        await asyncio.gather(*(limiter.acquire("/a") for _ in range(20)))
+
+        assert loop.time() - started >= 0.04
+        assert limiter.stats()["acquired"] == 20
+
+    @pytest.mark.asyncio
+    async def test_fetch_feeds_responses_back(self, api_client):
+        """Test _fetch reports responses to the adaptive limiter."""
+        limiter = RateLimiter([RateLimit("/users/*", rate=40)], adaptive=True)
+        client = api_client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(429)),
+            rate_limiter=limiter,
+        )
+
+        with pytest.raises(HTTPError):
+            await client._fetch("GET", "/users/1")
+
+        assert limiter.bucket_for("/users/1").rate == 20
+        await client.close()
@@ -0,0 +1,233 @@
+"""
+Unit tests for refresh-ahead of hot cache keys.
+
+Tests cover:
+- Access frequency tracking with decay and the top-N selection
+- Scheduling refreshes near expiry within the worker and rate budgets
+- Refreshed keys and misses avoided
+- Reading candidates without changing the backend's eviction order
+- Integration with BaseClient._fetch
+"""
+
+import asyncio
+
+import pytest
+
+from ravexclient import MemoryCache, RefreshAhead, ResponseCache
+from ravexclient.cache import CacheEntry
+from ravexclient.exceptions import ConfigurationError
+
+
+async def _store(cache, key, clock, lifetime=10.0):
+    entry = CacheEntry(
+        url="http://api.test.com/x",
+        status_code=200,
+        http_version="HTTP/1.1",
+        headers={},
+        body=b"{}",
+        stored_at=clock(),
+        expires_at=clock() + lifetime,
+    )
+    await cache.backend.set(key, entry)
+    return entry
+
+
+def _scheduler(clock, cache, **kwargs):
+    kwargs.setdefault("max_rate", 100)
+    ahead = RefreshAhead(clock=clock, **kwargs)
+    ahead.bind(cache)
+    # Scheduling rounds are driven by the tests.
+    ahead._start = lambda: None
+    return ahead
+
+
+class TestRefreshAhead:
+    """Tests for the RefreshAhead scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_hottest_keys_by_decayed_frequency(self, fake_clock):
+        """Test recent reads outweigh old ones."""
+        ahead = _scheduler(
+            fake_clock, ResponseCache(clock=fake_clock), top_n=2, half_life=1
+        )
+        noop = lambda entry: asyncio.sleep(0)
+        for _ in range(8):
+            ahead.record("old", noop)
+        fake_clock.now += 5
+        for key, reads in (("a", 3), ("b", 2), ("c", 1)):
+            for _ in range(reads):
+                ahead.record(key, noop)
+
+        assert ahead.hottest() == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_refreshes_hot_keys_near_expiry(self, fake_clock):
+        """Test only entries within lead_ratio of expiry are refreshed."""
+        cache = ResponseCache(clock=fake_clock)
+        ahead = _scheduler(fake_clock, cache, lead_ratio=0.2)
+        refreshed = []
+
+        async def refresh(entry):
+            refreshed.append(entry)
+
+        await _store(cache, "near", fake_clock, lifetime=10)
+        await _store(cache, "far", fake_clock, lifetime=100)
+        ahead.record("near", refresh)
+        ahead.record("far", refresh)
+        ahead.record("missing", refresh)
+        fake_clock.now += 9
+
+        assert await ahead.refresh_due() == ["near"]
+        await asyncio.sleep(0)
+        assert len(refreshed) == 1
+        assert ahead.refreshed_keys() == {"near": 1}
+        assert ahead.stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_workers_and_budget_bound_refreshes(self, fake_clock):
+        """Test concurrent refreshes and refresh rate are capped."""
+        cache = ResponseCache(clock=fake_clock)
+        release = asyncio.Event()
+
+        async def refresh(entry):
+            await release.wait()
+
+        ahead = _scheduler(fake_clock, cache, workers=2)
+        for key in "abcd":
+            await _store(cache, key, fake_clock, lifetime=1)
+            ahead.record(key, refresh)
+        fake_clock.now += 1
+
+        assert len(await ahead.refresh_due()) == 2
+        assert await ahead.refresh_due() == []
+        release.set()
+        await asyncio.sleep(0)
+
+        limited = _scheduler(fake_clock, cache, max_rate=1, workers=4)
+        for key in "abcd":
+            limited.record(key, refresh)
+        assert len(await limited.refresh_due()) == 1
+        assert limited.stats()["denied"] == 1
+        await ahead.aclose()
+        await limited.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_counted(self, fake_clock):
+        """Test a failing refresh is logged and counted."""
+        cache = ResponseCache(clock=fake_clock)
+        ahead = _scheduler(fake_clock, cache)
+
+        async def refresh(entry):
+            raise ValueError("boom")
+
+        await _store(cache, "k", fake_clock, lifetime=1)
+        ahead.record("k", refresh)
+        fake_clock.now += 1
+        await ahead.refresh_due()
+        await asyncio.sleep(0.01)
+
+        assert ahead.stats()["failures"] == 1
+        assert ahead.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_scheduling_keeps_eviction_order(self, fake_clock):
+        """Test a scheduling round doesn't count as a use of its candidates."""
+        cache = ResponseCache(MemoryCache(max_entries=2), clock=fake_clock)
+        ahead = _scheduler(fake_clock, cache)
+        await _store(cache, "hot", fake_clock, lifetime=100)
+        await _store(cache, "cold", fake_clock, lifetime=100)
+        ahead.record("hot", lambda entry: asyncio.sleep(0))
+
+        assert await ahead.refresh_due() == []
+        await _store(cache, "new", fake_clock)
+
+        assert await cache.backend.peek("hot") is None
+        assert await cache.backend.peek("cold") is not None
+
+    @pytest.mark.asyncio
+    async def test_unchanged_entry_is_not_a_miss_avoided(self, fake_clock):
+        """Test a refresh that stored nothing doesn't count misses avoided."""
+        cache = ResponseCache(clock=fake_clock)
+        ahead = _scheduler(fake_clock, cache)
+        noop = lambda entry: asyncio.sleep(0)
+
+        async def refresh(entry):
+            await _store(cache, "k", fake_clock)
+
+        await _store(cache, "k", fake_clock, lifetime=1)
+        await _store(cache, "same", fake_clock, lifetime=1)
+        ahead.record("k", refresh)
+        ahead.record("same", noop)
+        fake_clock.now += 1
+        await ahead.refresh_due()
+        await asyncio.sleep(0.01)
+        ahead.record("k", refresh)
+        ahead.record("same", noop)
+
+        assert ahead.refreshed_keys() == {"k": 1, "same": 1}
+        assert ahead.stats()["misses_avoided"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tracked_keys_are_bounded(self, fake_clock):
+        """Test the coldest keys are dropped beyond max_tracked."""
+        ahead = _scheduler(fake_clock, ResponseCache(clock=fake_clock), max_tracked=2)
+        noop = lambda entry: asyncio.sleep(0)
+        for key, reads in (("a", 3), ("b", 2), ("c", 1)):
+            for _ in range(reads):
+                ahead.record(key, noop)
+
+        await ahead.refresh_due()
+
+        assert ahead.stats()["tracked"] == 2
+        assert ahead.hottest() == ["a", "b"]
+
+    def test_invalid_configuration(self):
+        """Test invalid settings raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            RefreshAhead(lead_ratio=1)
+        with pytest.raises(ConfigurationError):
+            RefreshAhead(workers=0)
+
+
+class TestBaseClientRefreshAhead:
+    """Tests for refresh-ahead in BaseClient."""
+
+    @pytest.mark.asyncio
+    async def test_hot_key_never_misses(self, api_client, mock_api, fake_clock):
+        """Test a refreshed entry answers reads after the old expiry."""
+        transport = mock_api(headers={"Cache-Control": "max-age=10"})
+        cache = ResponseCache(clock=fake_clock, early_refresh_beta=0)
+        ahead = RefreshAhead(clock=fake_clock, interval=0.01)
+        client = api_client(transport=transport, cache=cache, refresh_ahead=ahead)
+
+        assert await client._get("/hot") == {"n": 1}
+        fake_clock.now += 9
+        await asyncio.sleep(0.05)
+        fake_clock.now += 2
+
+        assert await client._get("/hot") == {"n": 2}
+        assert len(transport.requests) == 2
+        assert cache.stats()["misses"] == 1
+        assert ahead.refreshed_keys() == {"GET http://api.test.com/hot": 1}
+        assert ahead.stats()["misses_avoided"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_scheduler(self, api_client, mock_api):
+        """Test closing the client stops the scheduler."""
+        ahead = RefreshAhead()
+        client = api_client(
+            transport=mock_api(headers={"Cache-Control": "max-age=10"}),
+            cache=ResponseCache(),
+            refresh_ahead=ahead,
+        )
+        await client._get("/hot")
+        assert ahead._task is not None
+
+        await client.close()
+        assert ahead._task is None
+
+    def test_requires_cache(self, api_client):
+        """Test refresh_ahead without a cache raises ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            api_client(refresh_ahead=RefreshAhead())
@@ -0,0 +1,309 @@
+"""
+Unit tests for the DNS resolver layer.
+
+Tests cover:
+- Positive and negative caching with TTLs
+- Coalesced lookups and background refresh
+- System resolver lookups
+- Integration with BaseClient connections
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from ravexclient import (
+    CachingResolver,
+    DNSResult,
+    Resolver,
+    SystemResolver,
+    last_response_info,
+)
+from ravexclient.exceptions import ConfigurationError, HTTPError
+from ravexclient.transport import InstrumentedTransport
+
+
+class _FakeResolver(Resolver):
+    """Resolver answering from a dict and counting upstream lookups."""
+
+    def __init__(self, hosts=None, ttl=None, delay=0.0):
+        self.hosts = hosts if hosts is not None else {"api.local": ("127.0.0.1",)}
+        self.ttl = ttl
+        self.delay = delay
+        self.calls = 0
+
+    async def resolve(self, host, port):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if host not in self.hosts:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return DNSResult(self.hosts[host], self.ttl)
+
+
+class TestCachingResolver:
+    """Tests for CachingResolver."""
+
+    @pytest.mark.asyncio
+    async def test_answers_are_cached(self):
+        """Test repeated lookups hit the cache."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(upstream)
+
+        first = await resolver.resolve("api.local", 443)
+        second = await resolver.resolve("API.local", 443)
+
+        assert first.addresses == second.addresses == ("127.0.0.1",)
+        assert upstream.calls == 1
+        assert resolver.stats()["hits"] == 1
+        assert resolver.stats()["misses"] == 1
+        assert resolver.stats()["hit_ratio"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_default_ttl_expires(self, fake_clock):
+        """Test answers are looked up again after the default TTL."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(upstream, ttl=10, clock=fake_clock)
+
+        await resolver.resolve("api.local", 443)
+        fake_clock.now = 10.0
+        await resolver.resolve("api.local", 443)
+
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_upstream_ttl_is_honored_and_capped(self, fake_clock):
+        """Test record TTLs override the default up to max_ttl."""
+        upstream = _FakeResolver(ttl=500)
+        resolver = CachingResolver(
+            upstream, ttl=10, max_ttl=100, refresh_ratio=1, clock=fake_clock
+        )
+
+        await resolver.resolve("api.local", 443)
+        fake_clock.now = 99.0
+        await resolver.resolve("api.local", 443)
+        assert upstream.calls == 1
+
+        fake_clock.now = 100.0
+        await resolver.resolve("api.local", 443)
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_cached(self, fake_clock):
+        """Test failed lookups are cached for negative_ttl."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(upstream, negative_ttl=5, clock=fake_clock)
+
+        for _ in range(3):
+            with pytest.raises(socket.gaierror):
+                await resolver.resolve("missing.local", 443)
+        assert upstream.calls == 1
+        assert resolver.stats()["negative_hits"] == 2
+        assert resolver.stats()["errors"] == 1
+
+        fake_clock.now = 5.0
+        with pytest.raises(socket.gaierror):
+            await resolver.resolve("missing.local", 443)
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_lookup(self):
+        """Test simultaneous misses for one name query upstream once."""
+        upstream = _FakeResolver(delay=0.01)
+        resolver = CachingResolver(upstream)
+
+        results = await asyncio.gather(
+            *(resolver.resolve("api.local", 443) for _ in range(5))
+        )
+
+        assert upstream.calls == 1
+        assert {result.addresses for result in results} == {("127.0.0.1",)}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_lookup(self):
+        """Test cancelling one waiter leaves the shared lookup running."""
+        upstream = _FakeResolver(delay=0.02)
+        resolver = CachingResolver(upstream)
+
+        cancelled = asyncio.create_task(resolver.resolve("api.local", 443))
+        waiting = asyncio.create_task(resolver.resolve("api.local", 443))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert (await waiting).addresses == ("127.0.0.1",)
+        assert cancelled.cancelled()
+        assert upstream.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_in_background(self, fake_clock):
+        """Test entries past refresh_ratio are served and refreshed."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(
+            upstream, ttl=10, refresh_ratio=0.5, clock=fake_clock
+        )
+
+        await resolver.resolve("api.local", 443)
+        fake_clock.now = 6.0
+        upstream.hosts["api.local"] = ("127.0.0.2",)
+
+        stale = await resolver.resolve("api.local", 443)
+        assert stale.addresses == ("127.0.0.1",)
+        await asyncio.sleep(0)
+
+        fresh = await resolver.resolve("api.local", 443)
+        assert fresh.addresses == ("127.0.0.2",)
+        assert upstream.calls == 2
+        assert resolver.stats()["refreshes"] == 1
+        assert resolver.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_answer(self, fake_clock):
+        """Test a failed background refresh doesn't evict a valid answer."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(
+            upstream, ttl=10, negative_ttl=2, refresh_ratio=0.5, clock=fake_clock
+        )
+
+        await resolver.resolve("api.local", 443)
+        fake_clock.now = 6.0
+        del upstream.hosts["api.local"]
+        await resolver.resolve("api.local", 443)
+        await asyncio.sleep(0)
+
+        result = await resolver.resolve("api.local", 443)
+        assert result.addresses == ("127.0.0.1",)
+        # The retry waits for negative_ttl instead of firing on every hit.
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_max_entries_evicts_oldest(self):
+        """Test the cache is bounded by max_entries."""
+        upstream = _FakeResolver({"a.local": ("10.0.0.1",), "b.local": ("10.0.0.2",)})
+        resolver = CachingResolver(upstream, max_entries=1)
+
+        await resolver.resolve("a.local", 443)
+        await resolver.resolve("b.local", 443)
+        await resolver.resolve("a.local", 443)
+
+        assert len(resolver) == 1
+        assert upstream.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        """Test invalidate forgets cached names."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(upstream)
+
+        await resolver.resolve("api.local", 443)
+        resolver.invalidate("api.local")
+        await resolver.resolve("api.local", 443)
+
+        assert upstream.calls == 2
+
+    def test_invalid_refresh_ratio(self):
+        """Test refresh_ratio must be a fraction of the TTL."""
+        with pytest.raises(ConfigurationError):
+            CachingResolver(refresh_ratio=0)
+
+
+class TestSystemResolver:
+    """Tests for SystemResolver."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_localhost(self):
+        """Test localhost resolves to a loopback address."""
+        result = await SystemResolver().resolve("localhost", 80)
+
+        assert set(result.addresses) & {"127.0.0.1", "::1"}
+        assert result.ttl is None
+
+
+class TestBaseClientResolver:
+    """Tests for resolvers plugged into BaseClient."""
+
+    def test_resolver_is_installed_on_pool(self, api_client):
+        """Test the resolver reaches the transport."""
+        resolver = CachingResolver(_FakeResolver())
+        client = api_client(resolver=resolver)
+
+        assert isinstance(client.transport, InstrumentedTransport)
+        assert client.transport.resolver is resolver
+
+    @pytest.mark.asyncio
+    async def test_connections_use_resolver(self, local_server, api_client):
+        """Test host names are resolved through the configured resolver."""
+        upstream = _FakeResolver()
+        client = api_client(
+            base_url=f"http://api.local:{local_server.port}",
+            resolver=CachingResolver(upstream),
+        )
+
+        data = await client._fetch("GET", "/items")
+
+        assert data == {"method": "GET", "path": "/items"}
+        assert last_response_info().url.startswith("http://api.local:")
+        assert upstream.calls == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_resolver_is_shared_between_clients(self, local_server, api_client):
+        """Test clients sharing a CachingResolver share its answers."""
+        upstream = _FakeResolver()
+        resolver = CachingResolver(upstream)
+        clients = [
+            api_client(
+                base_url=f"http://api.local:{local_server.port}", resolver=resolver
+            )
+            for _ in range(3)
+        ]
+
+        for client in clients:
+            await client._fetch("GET", "/items")
+
+        assert local_server.connections == 3
+        assert upstream.calls == 1
+        assert resolver.stats()["hits"] == 2
+        for client in clients:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_proxy_host_is_resolved(self, local_server, api_client):
+        """Test the proxy's host name goes through the resolver too."""
+        upstream = _FakeResolver({"proxy.local": ("127.0.0.1",)})
+        client = api_client(
+            base_url="http://api.test.com",
+            proxy=f"http://proxy.local:{local_server.port}",
+            resolver=CachingResolver(upstream),
+        )
+
+        data = await client._fetch("GET", "/items")
+
+        assert data == {"method": "GET", "path": "http://api.test.com/items"}
+        assert upstream.calls == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_next_address(self, local_server, api_client):
+        """Test an unreachable address is skipped."""
+        upstream = _FakeResolver({"api.local": ("127.0.0.2", "127.0.0.1")})
+        client = api_client(
+            base_url=f"http://api.local:{local_server.port}",
+            resolver=CachingResolver(upstream),
+        )
+
+        await client._fetch("GET", "/items")
+
+        assert local_server.requests == [("GET", "/items")]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_host_raises_http_error(self, api_client):
+        """Test resolution failures surface as HTTPError."""
+        client = api_client(
+            base_url="http://missing.local", resolver=CachingResolver(_FakeResolver())
+        )
+
+        with pytest.raises(HTTPError, match="Request failed"):
+            await client._fetch("GET", "/items")
+        await client.close()
@@ -0,0 +1,331 @@
+"""
+Unit tests for RetryPolicy, RetryBudget and the retry loop in BaseClient._fetch.
+
+Tests cover:
+- Retry-After / RateLimit-Reset parsing
+- Backoff strategies and jitter bounds
+- Status, exception and method classification
+- Retries performed by _fetch
+- Client-wide retry budget accounting
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from ravexclient import BaseClient, RetryBudget, RetryPolicy
+from ravexclient.exceptions import ConfigurationError, HTTPError
+from ravexclient.retry import parse_retry_after
+
+
+def _status_error(
+    status_code: int, headers: dict | None = None
+) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.test.com")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestParseRetryAfter:
+    """Tests for server-provided delay parsing."""
+
+    def test_retry_after_seconds(self):
+        """Test Retry-After given in seconds."""
+        assert parse_retry_after(httpx.Headers({"Retry-After": "7"})) == 7.0
+
+    def test_retry_after_http_date(self):
+        """Test Retry-After given as an HTTP date."""
+        now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        value = format_datetime(now + timedelta(seconds=30), usegmt=True)
+
+        delay = parse_retry_after(
+            httpx.Headers({"Retry-After": value}), now=now.timestamp()
+        )
+
+        assert delay == pytest.approx(30.0)
+
+    def test_ratelimit_reset_delta_and_epoch(self):
+        """Test RateLimit-Reset as delta and as epoch timestamp."""
+        now = 1_700_000_000.0
+
+        assert parse_retry_after(httpx.Headers({"RateLimit-Reset": "5"}), now) == 5.0
+        assert parse_retry_after(
+            httpx.Headers({"X-RateLimit-Reset": str(int(now) + 12)}), now
+        ) == pytest.approx(12.0)
+
+    def test_missing_or_invalid_headers(self):
+        """Test that unusable headers yield None."""
+        assert parse_retry_after(httpx.Headers({})) is None
+        assert parse_retry_after(httpx.Headers({"RateLimit-Reset": "soon"})) is None
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy classification and backoff."""
+
+    def test_invalid_configuration(self):
+        """Test invalid settings raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            RetryPolicy(max_retries=-1)
+        with pytest.raises(ConfigurationError):
+            RetryPolicy(jitter="random")
+
+    def test_status_classification(self):
+        """Test retryable and non-retryable status codes."""
+        policy = RetryPolicy()
+
+        assert policy.is_retryable("GET", 0, _status_error(503))
+        assert not policy.is_retryable("GET", 0, _status_error(404))
+
+    def test_exception_classification(self):
+        """Test retryable and non-retryable exception types."""
+        policy = RetryPolicy()
+
+        assert policy.is_retryable("GET", 0, httpx.ConnectTimeout("slow"))
+        assert not policy.is_retryable("GET", 0, ValueError("bad json"))
+
+    def test_non_idempotent_methods_require_force(self):
+        """Test POST is only retried when forced."""
+        policy = RetryPolicy()
+        error = _status_error(503)
+
+        assert not policy.is_retryable("POST", 0, error)
+        assert policy.is_retryable("POST", 0, error, force=True)
+
+    def test_max_retries_exhausted(self):
+        """Test no retry once max_retries is reached."""
+        policy = RetryPolicy(max_retries=2)
+
+        assert not policy.is_retryable("GET", 2, _status_error(503))
+
+    def test_backoff_without_jitter(self):
+        """Test plain exponential backoff is capped by max_delay."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter="none")
+
+        assert [policy.backoff(i) for i in range(4)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_decorrelated_jitter_bounds(self):
+        """Test decorrelated jitter stays within its bounds."""
+        policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+
+        previous = None
+        for attempt in range(20):
+            delay = policy.backoff(attempt, previous)
+            upper = max(0.5, (previous or 0.5) * 3)
+            assert 0.5 <= delay <= min(4.0, upper)
+            previous = delay
+
+    def test_next_delay_honors_retry_after(self):
+        """Test server delay overrides a shorter backoff."""
+        policy = RetryPolicy(base_delay=0.1, jitter="none")
+
+        delay = policy.next_delay(0, _status_error(429, {"Retry-After": "3"}))
+
+        assert delay == 3.0
+
+    def test_next_delay_gives_up_on_long_retry_after(self):
+        """Test Retry-After above max_retry_after stops retrying."""
+        policy = RetryPolicy(max_retry_after=10.0)
+
+        assert policy.next_delay(0, _status_error(503, {"Retry-After": "60"})) is None
+
+
+class TestBaseClientRetries:
+    """Tests for retries performed by BaseClient._fetch."""
+
+    @pytest.fixture
+    def status_client(self, api_client):
+        """Build a client answered with ``statuses`` in turn, and its requests."""
+
+        def build(statuses: list[int], **kwargs) -> tuple[BaseClient, list]:
+            calls = []
+
+            def handler(request: httpx.Request) -> httpx.Response:
+                calls.append(request)
+                status = statuses[min(len(calls) - 1, len(statuses) - 1)]
+                return httpx.Response(status, json={"attempt": len(calls)})
+
+            client = api_client(transport=httpx.MockTransport(handler), **kwargs)
+            return client, calls
+
+        return build
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self, status_client):
+        """Test transient failures are retried."""
+        client, calls = status_client(
+            [503, 502, 200], retry_policy=RetryPolicy(max_retries=3)
+        )
+
+        with patch("ravexclient.base.asyncio.sleep", new_callable=AsyncMock):
+            result = await client._fetch("GET", "/data")
+
+        assert result == {"attempt": 3}
+        assert len(calls) == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, status_client):
+        """Test HTTPError is raised once retries are exhausted."""
+        client, calls = status_client([500], retry_policy=RetryPolicy(max_retries=2))
+
+        with (
+            patch("ravexclient.base.asyncio.sleep", new_callable=AsyncMock),
+            pytest.raises(HTTPError) as exc_info,
+        ):
+            await client._fetch("GET", "/data")
+
+        assert exc_info.value.status_code == 500
+        assert len(calls) == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_no_retry_without_policy(self, status_client):
+        """Test default client performs a single attempt."""
+        client, calls = status_client([503])
+
+        with pytest.raises(HTTPError):
+            await client._fetch("GET", "/data")
+
+        assert len(calls) == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_unless_requested(self, status_client):
+        """Test non-idempotent requests need retry=True."""
+        client, calls = status_client([503, 503, 200], retry_policy=RetryPolicy())
+
+        with patch("ravexclient.base.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(HTTPError):
+                await client._fetch("POST", "/data", payload={"a": 1})
+            assert len(calls) == 1
+
+            result = await client._fetch("POST", "/data", payload={"a": 1}, retry=True)
+
+        assert result == {"attempt": 3}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_false_disables_retries(self, status_client):
+        """Test per-call retry=False skips the policy."""
+        client, calls = status_client([503, 200], retry_policy=RetryPolicy())
+
+        with pytest.raises(HTTPError):
+            await client._fetch("GET", "/data", retry=False)
+
+        assert len(calls) == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_sleeps_for_retry_after(self, api_client):
+        """Test the retry loop waits for the Retry-After delay."""
+        responses = iter(
+            [
+                httpx.Response(429, headers={"Retry-After": "2"}),
+                httpx.Response(200, json={"ok": True}),
+            ]
+        )
+        client = api_client(
+            transport=httpx.MockTransport(lambda request: next(responses)),
+            retry_policy=RetryPolicy(base_delay=0.01),
+        )
+
+        with patch(
+            "ravexclient.base.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            result = await client._fetch("GET", "/data")
+
+        assert result == {"ok": True}
+        mock_sleep.assert_awaited_once_with(2.0)
+        await client.close()
+
+
+class TestRetryBudget:
+    """Tests for the client-wide retry budget."""
+
+    def test_ratio_limits_retries(self, fake_clock):
+        """Test retries are capped at ratio * requests."""
+        budget = RetryBudget(ratio=0.1, min_retries_per_second=0, clock=fake_clock)
+        for _ in range(20):
+            budget.record_request()
+
+        granted = [budget.try_acquire() for _ in range(5)]
+
+        assert granted == [True, True, False, False, False]
+        assert budget.allowed == 2
+        assert budget.denied == 3
+
+    def test_reserve_allows_low_traffic_retries(self, fake_clock):
+        """Test the per-second reserve permits retries without traffic."""
+        budget = RetryBudget(
+            ratio=0.0, min_retries_per_second=0.2, window=10.0, clock=fake_clock
+        )
+
+        assert budget.try_acquire()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+    def test_window_slides(self, fake_clock):
+        """Test old requests and retries leave the window."""
+        budget = RetryBudget(
+            ratio=0.5, min_retries_per_second=0, window=10.0, clock=fake_clock
+        )
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+        fake_clock.now = 11.0
+
+        assert budget.stats()["requests_in_window"] == 0
+        assert not budget.try_acquire()
+        budget.record_request()
+        budget.record_request()
+        assert budget.try_acquire()
+
+    def test_expired_retries_free_budget(self, fake_clock):
+        """Test retries older than the window no longer count."""
+        budget = RetryBudget(
+            ratio=0.0, min_retries_per_second=0.1, window=10.0, clock=fake_clock
+        )
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+
+        fake_clock.now = 11.0
+
+        assert budget.try_acquire()
+        assert budget.stats()["retries_in_window"] == 1
+
+    def test_invalid_configuration(self):
+        """Test invalid settings raise ConfigurationError."""
+        with pytest.raises(ConfigurationError):
+            RetryBudget(ratio=-0.1)
+        with pytest.raises(ConfigurationError):
+            RetryBudget(window=0)
+
+    @pytest.mark.asyncio
+    async def test_fetch_fails_fast_when_budget_exhausted(self, api_client):
+        """Test _fetch raises HTTPError instead of retrying without budget."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(503, json={"error": "unavailable"})
+
+        budget = RetryBudget(ratio=0.0, min_retries_per_second=0)
+        client = api_client(
+            transport=httpx.MockTransport(handler),
+            retry_policy=RetryPolicy(max_retries=3),
+            retry_budget=budget,
+        )
+
+        with pytest.raises(HTTPError) as exc_info:
+            await client._fetch("GET", "/data")
+
+        assert len(calls) == 1
+        assert exc_info.value.status_code == 503
+        assert "Retry budget exhausted" in exc_info.value.message
+        assert budget.stats()["denied"] == 1
+        await client.close()
@@ -0,0 +1,210 @@
+"""
+Unit tests for single-flight request coalescing.
+
+Tests cover:
+- Coalescing keys (method, URL, params, vary headers)
+- Shared results, copies and shared errors
+- Independent cancellation of waiters
+- Integration with BaseClient._fetch
+"""
+
+import asyncio
+
+import pytest
+
+from ravexclient import SingleFlight, last_response_info
+from ravexclient.exceptions import HTTPError
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight group."""
+
+    def test_key_normalizes_params_and_headers(self):
+        """Test identical calls share a key and vary headers split it."""
+        flight = SingleFlight()
+        base = flight.key("get", "http://a.test/x", {"page": 1}, {"X-Trace": "1"})
+
+        assert base == flight.key("GET", "http://a.test/x?page=1", None, None)
+        assert base != flight.key("GET", "http://a.test/x", {"page": 2})
+        assert base != flight.key(
+            "GET", "http://a.test/x", {"page": 1}, {"authorization": "Bearer b"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """Test concurrent calls run the function once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"items": [1]}
+
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert results == [{"items": [1]}] * 5
+        assert len({id(result) for result in results}) == 5
+        assert flight.stats()["followers"] == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_results_are_not_cached(self):
+        """Test a call after completion starts a new request."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("k", fetch) == 1
+        assert await flight.do("k", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """Test a failure is raised to all callers."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise HTTPError("Request failed", status_code=503)
+
+        results = await asyncio.gather(
+            *(flight.do("k", fetch) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, HTTPError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_request(self):
+        """Test a cancelled waiter doesn't cancel the shared request."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        cancelled = asyncio.create_task(flight.do("k", fetch))
+        waiting = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await waiting == "done"
+        assert cancelled.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_request_cancelled_when_nobody_waits(self):
+        """Test the shared request stops once every waiter is cancelled."""
+        flight = SingleFlight()
+        stopped = asyncio.Event()
+
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        waiters = [asyncio.create_task(flight.do("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+
+        await asyncio.wait_for(stopped.wait(), 1)
+        await asyncio.sleep(0)
+        assert len(flight) == 0
+
+
+class TestBaseClientSingleFlight:
+    """Tests for request coalescing in BaseClient."""
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_share_one_request(self, api_client, mock_api):
+        """Test concurrent identical GETs send one request."""
+        transport = mock_api(json={"items": [1, 2]}, delay=0.02)
+        client = api_client(transport=transport, single_flight=SingleFlight())
+
+        results = await asyncio.gather(
+            *(client._get("/items", params={"page": 1}) for _ in range(10))
+        )
+
+        assert [str(r.url) for r in transport.requests] == [
+            "http://api.test.com/items?page=1"
+        ]
+        assert all(result["items"] == [1, 2] for result in results)
+        results[0]["items"].append(3)
+        assert results[1]["items"] == [1, 2]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_coalesced(self, api_client, mock_api):
+        """Test different params and methods get their own requests."""
+        transport = mock_api(json={"items": [1, 2]}, delay=0.02)
+        client = api_client(transport=transport, single_flight=SingleFlight())
+
+        await asyncio.gather(
+            client._get("/items", params={"page": 1}),
+            client._get("/items", params={"page": 2}),
+            client._post("/items", payload={"name": "x"}),
+            client._post("/items", payload={"name": "x"}),
+            client._get("/items", params={"page": 1}, coalesce=False),
+        )
+
+        assert len(transport.requests) == 5
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_credentials_are_not_shared(self, api_client, mock_api):
+        """Test clients with different credentials don't share a request."""
+        transport = mock_api(json={"items": [1, 2]}, delay=0.02)
+        flight = SingleFlight()
+        alice = api_client(transport=transport, single_flight=flight)
+        alice.client.headers["Authorization"] = "Bearer alice"
+        bob = api_client(transport=transport, single_flight=flight)
+        bob.client.headers["Authorization"] = "Bearer bob"
+        carol = api_client(
+            transport=transport, single_flight=flight, cf_clearance="carol"
+        )
+
+        await asyncio.gather(
+            alice._get("/items"), bob._get("/items"), carol._get("/items")
+        )
+
+        assert len(transport.requests) == 3
+        assert flight.stats()["followers"] == 0
+        await alice.close()
+        await bob.close()
+        await carol.close()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self, api_client, mock_api):
+        """Test a failed shared request raises HTTPError for every caller."""
+        transport = mock_api(status_code=500, delay=0.02)
+        client = api_client(transport=transport, single_flight=SingleFlight())
+
+        results = await asyncio.gather(
+            *(client._get("/items") for _ in range(3)), return_exceptions=True
+        )
+
+        assert len(transport.requests) == 1
+        assert all(result.status_code == 500 for result in results)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_response_info_reaches_followers(self, api_client, mock_api):
+        """Test every caller sees the shared response's metadata."""
+        transport = mock_api(json={"items": [1, 2]}, delay=0.02)
+        client = api_client(transport=transport, single_flight=SingleFlight())
+
+        async def fetch():
+            await client._get("/items")
+            return last_response_info()
+
+        infos = await asyncio.gather(fetch(), fetch())
+
+        assert [info.status_code for info in infos] == [200, 200]
+        await client.close()
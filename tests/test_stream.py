@@ -0,0 +1,287 @@
+"""
+Unit tests for streamed responses.
+
+Tests cover:
+- Bytes, text and line iteration
+- Body size limits (declared and read)
+- Error mapping for status codes and transport errors
+- Connection release when the consumer stops early
+- Incremental JSON array parsing, at the top level or at a path
+"""
+
+import json
+
+import httpx
+import pytest
+
+from ravexclient import JSONArrayParser, ResponseStream, last_response_info
+from ravexclient.exceptions import HTTPError, ResponseTooLargeError
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    """Response body sent in chunks, recording how far it was read."""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.sent = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+        if self.error is not None:
+            raise self.error
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def chunked_client(api_client):
+    """Build a client answered with a body sent in ``chunks``, and the body."""
+
+    def build(chunks, status_code=200, headers=None, error=None):
+        body = _ChunkStream(chunks, error)
+
+        def respond(request):
+            return httpx.Response(status_code, headers=headers, stream=body)
+
+        return api_client(transport=httpx.MockTransport(respond)), body
+
+    return build
+
+
+def _stream(chunks):
+    return ResponseStream(httpx.Response(200, stream=_ChunkStream(chunks)))
+
+
+class TestResponseStream:
+    """Tests for ResponseStream iteration."""
+
+    @pytest.mark.asyncio
+    async def test_iter_text_decodes_split_characters(self):
+        """Test multi-byte characters split between chunks decode whole."""
+        encoded = "añ€".encode()
+        stream = _stream([encoded[:2], encoded[2:5], encoded[5:]])
+
+        assert "".join([text async for text in stream.iter_text()]) == "añ€"
+        assert stream.bytes_read == len(encoded)
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_handles_all_line_endings(self):
+        """Test \\n, \\r\\n and \\r split across chunks."""
+        stream = _stream([b"one\r", b"\ntwo\nthr", b"ee\rfour\r", b"\n\nlast"])
+
+        lines = [line async for line in stream.iter_lines()]
+
+        assert lines == ["one", "two", "three", "four", "", "last"]
+
+    @pytest.mark.asyncio
+    async def test_iter_bytes_enforces_limit_while_reading(self):
+        """Test a body without Content-Length is cut at max_bytes."""
+        response = httpx.Response(200, stream=_ChunkStream([b"x" * 6] * 3))
+        stream = ResponseStream(response, max_bytes=10)
+        received = []
+
+        with pytest.raises(ResponseTooLargeError) as raised:
+            async for chunk in stream.iter_bytes():
+                received.append(chunk)
+
+        assert received == [b"x" * 6]
+        assert raised.value.max_bytes == 10
+        assert response.is_closed
+
+
+class TestBaseClientStream:
+    """Tests for BaseClient._stream."""
+
+    @pytest.mark.asyncio
+    async def test_streams_chunks_and_records_info(self, chunked_client):
+        """Test chunks are yielded as received and metadata is recorded."""
+        client, body = chunked_client([b"a", b"b", b"c"])
+
+        async with client._stream("GET", "/export") as stream:
+            assert stream.status_code == 200
+            assert body.sent == 0
+            chunks = [chunk async for chunk in stream.iter_bytes()]
+
+        assert chunks == [b"a", b"b", b"c"]
+        assert last_response_info().status_code == 200
+        assert body.closed
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_early_exit_releases_connection(self, chunked_client):
+        """Test leaving the block after one line closes the response."""
+        client, body = chunked_client([b"1\n", b"2\n", b"3\n"])
+
+        async with client._stream("GET", "/export") as stream:
+            async for line in stream.iter_lines():
+                break
+
+        assert line == "1"
+        assert body.sent == 1
+        assert body.closed
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_declared_size_over_limit(self, chunked_client):
+        """Test a Content-Length over max_bytes fails before reading."""
+        client, body = chunked_client([b"x" * 100], headers={"Content-Length": "100"})
+
+        with pytest.raises(ResponseTooLargeError):
+            async with client._stream("GET", "/export", max_bytes=50):
+                pass
+
+        assert body.sent == 0
+        assert body.closed
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_error_status_mapped(self, chunked_client):
+        """Test error statuses raise HTTPError with the parsed body."""
+        client, _ = chunked_client(
+            [b'{"error": "missing"}'],
+            status_code=404,
+            headers={"Content-Length": "20"},
+        )
+
+        with pytest.raises(HTTPError) as raised:
+            async with client._stream("GET", "/missing", max_bytes=1000):
+                pass
+
+        assert raised.value.status_code == 404
+        assert raised.value.response_body == {"error": "missing"}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_large_error_body_not_read(self, chunked_client):
+        """Test an error body over max_bytes is left unread."""
+        client, body = chunked_client([b"x" * 100], status_code=500)
+
+        with pytest.raises(HTTPError) as raised:
+            async with client._stream("GET", "/fail", max_bytes=10):
+                pass
+
+        assert raised.value.status_code == 500
+        assert raised.value.response_body is None
+        assert body.sent == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_transport_errors_mapped(self, api_client, chunked_client):
+        """Test connection failures before and while reading raise HTTPError."""
+        client, _ = chunked_client([b"a"], error=httpx.ReadError("connection reset"))
+
+        with pytest.raises(HTTPError, match="connection reset"):
+            async with client._stream("GET", "/export") as stream:
+                async for _ in stream.iter_bytes():
+                    pass
+        await client.close()
+
+        def refuse(request):
+            raise httpx.ConnectError("refused")
+
+        client = api_client(transport=httpx.MockTransport(refuse))
+        with pytest.raises(HTTPError, match="refused"):
+            async with client._stream("GET", "/export"):
+                pass
+        await client.close()
+
+
+def _parse(document, path=None, chunk_size=3):
+    parser = JSONArrayParser(path)
+    items = []
+    for start in range(0, len(document), chunk_size):
+        items.extend(parser.feed(document[start : start + chunk_size]))
+    items.extend(parser.close())
+    return items
+
+
+class TestJSONArrayParser:
+    """Tests for incremental JSON array parsing."""
+
+    def test_items_split_across_chunks(self):
+        """Test every JSON type is parsed whatever the chunk size."""
+        items = [1, 22, -3.5e2, "a,]", None, True, {"a": [1, {"b": 2}]}, [], 0]
+        document = json.dumps(items)
+
+        for chunk_size in (1, 2, 5, len(document)):
+            assert _parse(document, chunk_size=chunk_size) == items
+
+    def test_items_yielded_as_they_complete(self):
+        """Test an item is yielded by the chunk that completes it."""
+        parser = JSONArrayParser()
+
+        assert list(parser.feed('[{"id": 1}, {"id"')) == [{"id": 1}]
+        assert list(parser.feed(": 2}, 1")) == [{"id": 2}]
+        assert list(parser.feed("5]")) == [15]
+        assert parser.done
+        assert parser.items == 3
+
+    def test_array_at_path(self):
+        """Test the array is found under object members and array indexes."""
+        document = json.dumps(
+            {"meta": {"items": [0]}, "data": {"pages": [[1], [2, 3]]}, "z": 1}
+        )
+
+        assert _parse(document, "data.pages.1") == [2, 3]
+        assert _parse(document, ["meta", "items"]) == [0]
+        assert _parse("[]") == []
+
+    def test_invalid_input(self):
+        """Test malformed JSON, missing paths and truncated arrays raise."""
+        for document, path in [
+            ("[1 2]", None),
+            ('{"a": 1}', None),
+            ('{"a": []}', "b"),
+            ("[[1]]", "1"),
+            ("[1, 2", None),
+            ("[1.]", None),
+        ]:
+            with pytest.raises(ValueError):
+                _parse(document, path)
+
+
+class TestBaseClientIterJSON:
+    """Tests for BaseClient._iter_json."""
+
+    @pytest.mark.asyncio
+    async def test_yields_items_while_streaming(self, chunked_client):
+        """Test items are yielded before the rest of the body is received."""
+        chunks = [b'{"data": [{"id": 1}, ', b'{"id": 2}', b"]}", b"ignored"]
+        client, body = chunked_client(chunks)
+        items = []
+
+        async for item in client._iter_json("GET", "/items", path="data"):
+            items.append((item, body.sent))
+
+        assert items == [({"id": 1}, 1), ({"id": 2}, 2)]
+        assert body.sent == 3
+        assert body.closed
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_raises_http_error(self, chunked_client):
+        """Test a body without an array raises HTTPError."""
+        client, _ = chunked_client([b'{"data": {}}'])
+
+        with pytest.raises(HTTPError):
+            async for _ in client._iter_json("GET", "/items", path="data"):
+                pass
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_max_bytes_applies(self, chunked_client):
+        """Test max_bytes is passed on to the stream."""
+        client, _ = chunked_client([b"[1, 2, ", b"3, 4]"])
+        items = []
+
+        with pytest.raises(ResponseTooLargeError):
+            async for item in client._iter_json("GET", "/items", max_bytes=8):
+                items.append(item)
+
+        assert items == [1, 2]
+        await client.close()
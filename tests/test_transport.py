@@ -0,0 +1,495 @@
+"""
+Unit tests for the instrumented transport and connection pool settings.
+
+Tests cover:
+- Pool limits and timeouts configured through BaseClient
+- Connection open/reuse counters and pool wait telemetry
+- PoolTimeoutError mapping
+- Reference-counted transport sharing
+- SSL context caching
+- HTTP/2 negotiation, fallback and per-origin stream limits
+- Connection pre-warming
+"""
+
+import asyncio
+import ssl
+import sys
+from unittest.mock import AsyncMock, patch
+
+import httpcore
+import httpx
+import pytest
+
+from ravexclient import (
+    CachingResolver,
+    InstrumentedTransport,
+    TransportRegistry,
+    last_response_info,
+)
+from ravexclient.exceptions import ConfigurationError, HTTPError, PoolTimeoutError
+from ravexclient.transport import clear_ssl_context_cache, get_ssl_context
+
+
+class TestPoolConfiguration:
+    """Tests for pool settings on the BaseClient constructor."""
+
+    def test_default_transport_is_instrumented(self, api_client):
+        """Test BaseClient builds an InstrumentedTransport by default."""
+        client = api_client()
+
+        assert isinstance(client.transport, InstrumentedTransport)
+        assert client.pool_stats()["connections"] == 0
+
+    def test_pool_limits_are_applied(self, api_client):
+        """Test pool arguments reach the connection pool."""
+        client = api_client(
+            max_connections=7, max_keepalive_connections=3, keepalive_expiry=1.5
+        )
+
+        pool = client.transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 1.5
+
+    def test_pool_timeout_is_applied(self, api_client):
+        """Test pool_timeout only changes the pool component."""
+        client = api_client(timeout=10.0, pool_timeout=0.5)
+
+        assert client.client.timeout.pool == 0.5
+        assert client.client.timeout.read == 10.0
+
+    def test_custom_transport_disables_telemetry(self, api_client):
+        """Test a caller-supplied transport is used as-is."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        client = api_client(transport=transport)
+
+        assert client.transport is transport
+        assert client.pool_stats() == {}
+
+    def test_proxy_is_configured_on_transport(self, api_client):
+        """Test the proxy is handled by the built transport."""
+        client = api_client(proxy="proxy.example.com:8080")
+
+        assert isinstance(client.transport._pool, httpcore.AsyncHTTPProxy)
+
+    def test_environment_proxies_are_mounted(self, monkeypatch, api_client):
+        """Test HTTPS_PROXY and NO_PROXY are honored with trust_env."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://env-proxy.example.com:3128")
+        monkeypatch.setenv("NO_PROXY", "internal.test.com")
+
+        client = api_client()
+
+        mounts = {
+            pattern.pattern: transport
+            for pattern, transport in client.client._mounts.items()
+        }
+        assert isinstance(mounts["https://"], InstrumentedTransport)
+        assert isinstance(mounts["https://"]._pool, httpcore.AsyncHTTPProxy)
+        assert mounts["all://*internal.test.com"] is None
+        url = httpx.URL("https://api.test.com/x")
+        assert client.client._transport_for_url(url) is mounts["https://"]
+
+    def test_environment_no_proxy_for_base_url(self, monkeypatch, api_client):
+        """Test a NO_PROXY rule covering the base URL's host bypasses the proxy."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://env-proxy.example.com:3128")
+        monkeypatch.setenv("NO_PROXY", ".test.com")
+
+        client = api_client()
+
+        url = httpx.URL("https://api.test.com/x")
+        assert client.client._transport_for_url(url) is client.transport
+        monkeypatch.setenv("NO_PROXY", "*")
+        assert api_client().client._mounts == {}
+
+    def test_environment_proxies_ignored(self, monkeypatch, api_client):
+        """Test env proxies are skipped without trust_env or with a proxy."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://env-proxy.example.com:3128")
+
+        assert api_client(trust_env=False).client._mounts == {}
+        assert api_client(proxy="proxy.example.com:8080").client._mounts == {}
+
+    def test_custom_transport_rejects_transport_options(self, api_client):
+        """Test options applied by the built transport need that transport."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+        for options in (
+            {"resolver": CachingResolver()},
+            {"http2": True, "max_concurrent_streams": 10},
+            {"share_transport": True},
+        ):
+            with pytest.raises(ConfigurationError):
+                api_client(transport=transport, **options)
+
+
+class TestPoolTelemetry:
+    """Tests for pool statistics collected against a local server."""
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, local_server, api_client):
+        """Test sequential requests reuse one keep-alive connection."""
+        client = api_client(base_url=local_server.url)
+
+        for _ in range(3):
+            await client._fetch("GET", "/data")
+
+        stats = client.pool_stats()
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+        assert stats["idle_connections"] == 1
+        assert stats["active_connections"] == 0
+        assert local_server.connections == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_measured(self, local_server, api_client):
+        """Test requests queued behind a full pool record wait time."""
+        local_server.delay = 0.05
+        client = api_client(base_url=local_server.url, max_connections=1)
+
+        await asyncio.gather(*(client._fetch("GET", "/data") for _ in range(3)))
+
+        stats = client.pool_stats()
+        assert stats["max_waiting"] == 3
+        assert stats["waiting"] == 0
+        assert stats["connections_opened"] == 1
+        assert stats["pool_wait_max"] >= 0.08
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_timeout_raises_dedicated_error(self, local_server, api_client):
+        """Test exhausting the pool raises PoolTimeoutError."""
+        local_server.delay = 0.3
+        client = api_client(
+            base_url=local_server.url, max_connections=1, pool_timeout=0.05
+        )
+
+        results = await asyncio.gather(
+            client._fetch("GET", "/slow"),
+            client._fetch("GET", "/slow"),
+            return_exceptions=True,
+        )
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        assert len(errors) == 1
+        assert isinstance(errors[0], PoolTimeoutError)
+        assert isinstance(errors[0], HTTPError)
+        assert client.pool_stats()["pool_timeouts"] == 1
+        await client.close()
+
+
+class TestTransportRegistry:
+    """Tests for sharing transports between BaseClient instances."""
+
+    def test_same_settings_share_one_transport(self, api_client):
+        """Test clients with identical settings share a transport."""
+        registry = TransportRegistry()
+
+        first = api_client(share_transport=registry)
+        second = api_client(share_transport=registry, headers={"X-Account": "2"})
+
+        assert first.transport.transport is second.transport.transport
+        assert len(registry) == 1
+        assert registry.references(first.transport.key) == 2
+
+    def test_different_settings_get_separate_transports(self, api_client):
+        """Test host, proxy and TLS differences produce distinct keys."""
+        registry = TransportRegistry()
+
+        clients = [
+            api_client(share_transport=registry),
+            api_client(base_url="https://other.test.com", share_transport=registry),
+            api_client(proxy="proxy.example.com:8080", share_transport=registry),
+            api_client(verify=False, share_transport=registry),
+            api_client(max_connections=5, share_transport=registry),
+        ]
+
+        assert len({id(client.transport.transport) for client in clients}) == 5
+        assert len(registry) == 5
+
+    @pytest.mark.asyncio
+    async def test_close_releases_until_last_user(self, api_client):
+        """Test the shared transport closes only with its last client."""
+        registry = TransportRegistry()
+        first = api_client(share_transport=registry)
+        second = api_client(share_transport=registry)
+        shared = first.transport.transport
+
+        with patch.object(shared, "aclose", new_callable=AsyncMock) as mock_aclose:
+            await first.close()
+            mock_aclose.assert_not_called()
+            assert len(registry) == 1
+
+            await second.close()
+            mock_aclose.assert_awaited_once()
+
+        assert len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_pool_keeps_per_client_headers(self, local_server, api_client):
+        """Test clients share connections but send their own headers."""
+        registry = TransportRegistry()
+        seen = []
+
+        async def capture(request: httpx.Request) -> None:
+            seen.append(request.headers["X-Account"])
+
+        clients = [
+            api_client(
+                base_url=local_server.url,
+                share_transport=registry,
+                headers={"X-Account": str(account)},
+                event_hooks={"request": [capture]},
+            )
+            for account in range(3)
+        ]
+
+        for client in clients:
+            await client._fetch("GET", "/me")
+
+        assert seen == ["0", "1", "2"]
+        assert local_server.connections == 1
+        assert clients[0].pool_stats()["connections_reused"] == 2
+        for client in clients:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_released_handle_rejects_requests(self, api_client):
+        """Test a closed client cannot reuse the shared transport."""
+        registry = TransportRegistry()
+        client = api_client(share_transport=registry)
+        handle = client.transport
+
+        await client.close()
+
+        with pytest.raises(RuntimeError):
+            await handle.handle_async_request(httpx.Request("GET", "https://x.test"))
+
+
+class TestSSLContextCache:
+    """Tests for the shared SSL context cache."""
+
+    def setup_method(self):
+        clear_ssl_context_cache()
+
+    def test_same_settings_reuse_context(self):
+        """Test identical verify settings return the same context."""
+        assert get_ssl_context(True) is get_ssl_context(True)
+        assert get_ssl_context(False) is get_ssl_context(False)
+        assert get_ssl_context(True) is not get_ssl_context(False)
+
+    def test_http2_gets_its_own_context(self):
+        """Test HTTP/2 transports don't share ALPN state with HTTP/1.1."""
+        assert get_ssl_context(True, http2=True) is not get_ssl_context(True)
+
+    def test_caller_context_is_passed_through(self):
+        """Test a caller-supplied SSLContext is returned unchanged."""
+        context = ssl.create_default_context()
+
+        assert get_ssl_context(context) is context
+
+    def test_clients_share_context(self, api_client):
+        """Test separate clients reuse one SSL context."""
+        with patch(
+            "ravexclient.transport.httpx.create_ssl_context",
+            wraps=httpx.create_ssl_context,
+        ) as mock_create:
+            first = api_client()
+            second = api_client(base_url="https://other.test.com")
+
+        assert mock_create.call_count == 1
+        assert first.transport._pool._ssl_context is second.transport._pool._ssl_context
+
+    def test_verify_disabled_is_respected(self, api_client):
+        """Test verify=False still produces a non-verifying context."""
+        client = api_client(verify=False)
+
+        context = client.transport._pool._ssl_context
+        assert context.verify_mode == ssl.CERT_NONE
+        assert context.check_hostname is False
+
+
+class TestHTTP2:
+    """Tests for HTTP/2 mode."""
+
+    def test_http2_is_enabled_on_pool(self, api_client):
+        """Test http2=True reaches the connection pool."""
+        pytest.importorskip("h2")
+        client = api_client(http2=True)
+
+        assert client.transport._pool._http2 is True
+        assert client.transport._pool._http1 is True
+
+    def test_missing_h2_raises_configuration_error(self, api_client):
+        """Test a clear error when the optional dependency is missing."""
+        with (
+            patch.dict(sys.modules, {"h2": None}),
+            pytest.raises(ConfigurationError, match="ravexclient\\[http2\\]"),
+        ):
+            api_client(http2=True)
+
+    def test_stream_limit_requires_http2(self, api_client):
+        """Test max_concurrent_streams is rejected without HTTP/2."""
+        with pytest.raises(ConfigurationError, match="http2=True"):
+            api_client(max_concurrent_streams=10)
+
+    def test_stream_limit_must_be_positive(self, api_client):
+        """Test max_concurrent_streams must allow at least one stream."""
+        pytest.importorskip("h2")
+        with pytest.raises(ConfigurationError, match=">= 1"):
+            api_client(http2=True, max_concurrent_streams=0)
+
+    @pytest.mark.asyncio
+    async def test_requests_are_multiplexed(self, local_h2_server, api_client):
+        """Test concurrent requests share one HTTP/2 connection."""
+        local_h2_server.delay = 0.05
+        client = api_client(base_url=local_h2_server.url, http2=True, http1=False)
+
+        await asyncio.gather(*(client._fetch("GET", f"/{i}") for i in range(10)))
+
+        assert local_h2_server.connections == 1
+        assert local_h2_server.max_open_streams == 10
+        assert client.pool_stats()["responses[HTTP/2]"] == 10
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_negotiated_protocol_is_reported(self, local_h2_server, api_client):
+        """Test the negotiated protocol is recorded per response."""
+        client = api_client(base_url=local_h2_server.url, http2=True, http1=False)
+
+        await client._fetch("GET", "/items")
+
+        info = last_response_info()
+        assert info.http_version == "HTTP/2"
+        assert info.status_code == 200
+        assert info.url == f"{local_h2_server.url}/items"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_response_info_is_per_task(self, local_h2_server, api_client):
+        """Test requests in other tasks don't overwrite the caller's info."""
+        client = api_client(base_url=local_h2_server.url, http2=True, http1=False)
+
+        await client._fetch("GET", "/mine")
+        await asyncio.gather(client._fetch("GET", "/other"))
+
+        assert last_response_info().url.endswith("/mine")
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_limit_caps_open_streams(self, local_h2_server, api_client):
+        """Test max_concurrent_streams bounds streams on the connection."""
+        local_h2_server.delay = 0.05
+        client = api_client(
+            base_url=local_h2_server.url,
+            http2=True,
+            http1=False,
+            max_concurrent_streams=3,
+        )
+
+        results = await asyncio.gather(
+            *(client._fetch("GET", f"/{i}") for i in range(9))
+        )
+
+        assert len(results) == 9
+        assert local_h2_server.connections == 1
+        assert local_h2_server.max_open_streams == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_http1(self, local_server, api_client):
+        """Test origins without h2 are served over HTTP/1.1."""
+        pytest.importorskip("h2")
+        client = api_client(base_url=local_server.url, http2=True)
+
+        await client._fetch("GET", "/items")
+
+        assert last_response_info().http_version == "HTTP/1.1"
+        assert client.pool_stats()["responses[HTTP/1.1]"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_slot_is_released_on_error(self, local_server, api_client):
+        """Test a failed request does not leak its stream slot."""
+        pytest.importorskip("h2")
+        local_server.status = 500
+        client = api_client(
+            base_url=local_server.url, http2=True, max_concurrent_streams=1
+        )
+
+        for _ in range(3):
+            with pytest.raises(HTTPError):
+                await client._fetch("GET", "/items")
+
+        assert local_server.requests == [("GET", "/items")] * 3
+        await client.close()
+
+
+class TestWarmup:
+    """Tests for BaseClient.warmup."""
+
+    @pytest.mark.asyncio
+    async def test_opens_idle_connections(self, local_server, api_client):
+        """Test warmup leaves the requested number of idle connections."""
+        client = api_client(base_url=local_server.url)
+
+        result = await client.warmup(connections=4)
+
+        assert result["requested"] == 4
+        assert result["succeeded"] == 4
+        assert result["failed"] == 0
+        assert result["elapsed"] > 0
+        assert local_server.connections == 4
+        assert local_server.requests == [("HEAD", "/")] * 4
+        assert client.pool_stats()["idle_connections"] == 4
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_burst_reuses_warm_connections(self, local_server, api_client):
+        """Test traffic after warmup opens no new connections."""
+        local_server.delay = 0.02
+        client = api_client(base_url=local_server.url)
+        await client.warmup(connections=4, endpoint="/health")
+
+        await asyncio.gather(*(client._fetch("GET", f"/{i}") for i in range(4)))
+
+        assert local_server.connections == 4
+        assert client.pool_stats()["connections_opened"] == 4
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_capped_at_keepalive_limit(self, local_server, api_client):
+        """Test warmup doesn't open connections the pool would discard."""
+        client = api_client(base_url=local_server.url, max_keepalive_connections=2)
+
+        result = await client.warmup(connections=5)
+
+        assert result["requested"] == 2
+        assert local_server.connections == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self, local_server, api_client):
+        """Test unreachable hosts are reported as failed connections."""
+        url = local_server.url
+        await local_server.stop()
+        client = api_client(base_url=url)
+
+        result = await client.warmup(connections=3)
+
+        assert result["succeeded"] == 0
+        assert result["failed"] == 3
+        await client.close()
+        await local_server.start()
+
+    @pytest.mark.asyncio
+    async def test_warms_connections_through_proxy(self, local_server, api_client):
+        """Test warmup connects through the configured proxy."""
+        client = api_client(base_url="http://api.test.com", proxy=local_server.url)
+
+        result = await client.warmup(connections=2)
+
+        assert result["succeeded"] == 2
+        assert local_server.connections == 2
+        assert local_server.requests == [("HEAD", "http://api.test.com/")] * 2
+        await client.close()